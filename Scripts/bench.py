@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Benchmarks for the mandelbrot engines and renderers.
+
+Run from the project root, e.g.:
+
+  python3 Scripts/bench.py bulbs
+  python3 Scripts/bench.py engines --steps 200 --max-iter 1000
+  python3 Scripts/bench.py text --steps 1000
+"""
+import argparse
+import contextlib
+import io
+import os
+import os.path
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mandelbrot import imaginary  # noqa: E402
+from mandelbrot._geometry import Area, Grid  # noqa: E402
+from mandelbrot._mandelbrot import (  # noqa: E402
+        MAX_DEPTH, in_main_bulbs, iter_mandelbrot)
+from mandelbrot import _subdivide, _boundary  # noqa: E402
+
+
+FULL = Area.from_radius(2.1, (0, 0))
+VIEWS = {
+        'full': FULL,
+        'default': Area.from_radius(1.5, (-0.75, 0)),
+        'seahorse': Area.from_radius(0.01, (-0.745, 0.1)),
+        'cardioid': Area.from_radius(0.3, (-0.3, 0)),
+        'minibrot': Area.from_radius(0.05, (-1.75, 0)),
+        }
+
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _count_iterations(values, maxiter, skipped=()):
+    total = 0
+    for c, i in values:
+        if c in skipped:
+            continue
+        total += maxiter if i is None else i + 1
+    return total
+
+
+def bench_bulbs(steps=400, maxiter=MAX_DEPTH):
+    """Compare iter_mandelbrot() with and without the bulbs check."""
+    grid = Grid(steps)
+    candidates = list(imaginary.iter_raster(FULL, grid))
+    skipped = {c for c in candidates if in_main_bulbs(c)}
+
+    plain, plain_secs = _timed(list, iter_mandelbrot(candidates, maxiter))
+    bulbs, bulbs_secs = _timed(list, iter_mandelbrot(candidates, maxiter,
+                                                     bulbs=True))
+    assert plain == bulbs
+
+    plain_iters = _count_iterations(plain, maxiter)
+    bulbs_iters = _count_iterations(bulbs, maxiter, skipped)
+    print('--full view, {} points, max-iter {}'.format(len(grid), maxiter))
+    print('  in the main bulbs: {} ({:.1%})'.format(
+          len(skipped), len(skipped) / len(grid)))
+    print('  iterations: {} -> {} ({:.1%} saved)'.format(
+          plain_iters, bulbs_iters, 1 - bulbs_iters / plain_iters))
+    print('  scalar:     {:.3f}s -> {:.3f}s'.format(plain_secs, bulbs_secs))
+
+    try:
+        from mandelbrot import _numpy
+    except ImportError:
+        return
+    plane = _numpy.complex_plane(FULL, grid)
+    _, plain_secs = _timed(_numpy.escape_counts, plane, maxiter)
+    _, bulbs_secs = _timed(_numpy.escape_counts, plane, maxiter, bulbs=True)
+    print('  numpy:      {:.3f}s -> {:.3f}s'.format(plain_secs, bulbs_secs))
+
+
+def bench_engines(steps=400, maxiter=MAX_DEPTH):
+    """Compare the pixels iterated by each engine on a few views."""
+    grid = Grid(steps)
+    print('{} points, max-iter {}'.format(len(grid), maxiter))
+    print('  {:10} {:>10} {:>10} {:>10}'.format(
+          'view', 'brute', 'subdivide', 'boundary'))
+    for name, area in VIEWS.items():
+        results = [len(grid)]
+        for engine in (_subdivide, _boundary):
+            stats = {}
+            for _ in engine.iter_raster(area, grid, maxiter, stats=stats):
+                pass
+            results.append(stats['computed'])
+        print('  {:10} {:>10} {:>10} {:>10}'.format(name, *results))
+
+
+def _print_per_pixel(values, grid, spec):
+    # This is how the text UI used to write out its output.
+    chars, matched, default = spec
+    step = 0
+    for _, i in values:
+        if i is None:
+            print(matched, end='')
+        else:
+            print(chars.get(i, default), end='')
+
+        if step == grid.width:
+            print()
+            step = 0
+        else:
+            step += 1
+
+
+def bench_text(steps=400, maxiter=MAX_DEPTH):
+    """Measure the cost of just the text output, per pixel."""
+    from mandelbrot.ui import _text
+    grid = Grid(steps)
+    spec = _text.Spec.from_raw(None)
+    candidates = imaginary.iter_raster(FULL, grid)
+    values = list(iter_mandelbrot(candidates, maxiter))
+
+    def iter_raster(area, grid, scale):
+        return values
+
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            _, old_secs = _timed(_print_per_pixel, values, grid, spec)
+        _, new_secs = _timed(_text._text, iter_raster, FULL, grid, maxiter,
+                             spec, devnull.buffer)
+    _, mem_secs = _timed(_text._text, iter_raster, FULL, grid, maxiter,
+                         spec, io.BytesIO())
+    print('text output, {} points'.format(len(grid)))
+    for label, secs in [('print() per pixel', old_secs),
+                        ('bulk, to /dev/null', new_secs),
+                        ('bulk, to BytesIO', mem_secs),
+                        ]:
+        print('  {:20} {:8.1f}ns/pixel'.format(
+              label, secs / len(grid) * 1e9))
+
+
+BENCHMARKS = {
+        'bulbs': bench_bulbs,
+        'engines': bench_engines,
+        'text': bench_text,
+        }
+
+
+def parse_args(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--steps', type=int, default=400)
+    parser.add_argument('--max-iter', dest='maxiter', type=int,
+                        default=MAX_DEPTH)
+    args = parser.parse_args(argv)
+    return args
+
+
+def main(benchmark, **kwargs):
+    BENCHMARKS[benchmark](**kwargs)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(**vars(args))
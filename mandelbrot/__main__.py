@@ -1,24 +1,63 @@
 
 import argparse
+from fractions import Fraction
+import sys
 
-from . import imaginary
+from ._animate import DEFAULT_FPS, FORMATS
+from ._engines import (
+        ENGINES, PRECISE_ENGINES, resolve_engine, resolve_point_engine,
+        symmetric_for)
 from ._geometry import Point2D, Area, Grid
-from ._mandelbrot import iter_mandelbrot
 from .ui import start
 
 
-def parse_args():
+def _add_engine_args(parser):
+    parser.add_argument('--max-iter', dest='scale',
+                        type=(lambda v: v if v == 'auto' else int(v)),
+                        help='a number, or "auto" to fit the view')
+    parser.add_argument('--engine', choices=ENGINES, default='brute')
+    parser.add_argument('--numpy', action='store_true')
+    parser.add_argument('--bulbs', action='store_true')
+    parser.add_argument('--periodicity', action='store_true')
+    parser.add_argument('--smooth', action='store_true')
+    parser.add_argument('--no-symmetry', dest='symmetry',
+                        action='store_false')
+
+
+def _check_engine_args(parser, args):
+    if args.scale and args.scale != 'auto' and args.scale < 0:
+        parser.error('got negative --max-iter')
+    if args.smooth:
+        if args.engine != 'brute':
+            parser.error('--smooth is only supported by --engine brute')
+        if args.periodicity:
+            parser.error('--smooth does not support --periodicity')
+    if args.engine == 'distance' and args.periodicity:
+        parser.error('--periodicity is not supported by --engine distance')
+    if args.engine in PRECISE_ENGINES:
+        for opt in ('bulbs', 'periodicity'):
+            if getattr(args, opt):
+                parser.error('--{} is not supported by --engine {}'
+                             .format(opt, args.engine))
+
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser()
     parser.add_argument('--full', action='store_true')
+    # The values are kept exact, in case the engine can use them.
     parser.add_argument('--center',
-                        type=(lambda v: Point2D.from_raw(v)),
+                        type=(lambda v: Point2D.parse(v, Fraction)),
                         default=(-.75, 0))
-    parser.add_argument('--radius', type=float, default=1.5)
+    parser.add_argument('--radius', type=Fraction, default=1.5)
     parser.add_argument('--steps', type=int)
-    parser.add_argument('--max-iter', dest='scale', type=int)
-    parser.add_argument('--numpy', action='store_true')
+    _add_engine_args(parser)
+    parser.add_argument('--workers', type=int, nargs='?', const=0)
+    parser.add_argument('--chunk-size', dest='chunksize', type=int)
+    parser.add_argument('--cache', dest='cachedir')
+    parser.add_argument('--cache-size', dest='cachesize', type=int,
+                        help='in MiB')
     parser.add_argument('--ui', dest='uiname', default='text')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if vars(args).pop('full'):
         args.center = (0, 0)
@@ -32,14 +71,72 @@ def parse_args():
             raise
             parser.error('bad center {!r}'.format(args.center))
 
-    if args.scale and args.scale < 0:
-        parser.error('got negative --max-iter')
+    if args.workers and args.workers < 0:
+        parser.error('got negative --workers')
+    if args.workers is not None and args.engine != 'brute':
+        parser.error('--workers is not supported by --engine {}'
+                     .format(args.engine))
+    if args.chunksize is not None and args.chunksize <= 0:
+        parser.error('got non-positive --chunk-size')
+    if args.chunksize is not None and args.engine != 'brute':
+        parser.error('--chunk-size is not supported by --engine {}'
+                     .format(args.engine))
+    if args.cachesize is not None and args.cachesize < 0:
+        parser.error('got negative --cache-size')
+    parallel = (args.workers, args.chunksize) != (None, None)
+    if args.smooth and parallel:
+        parser.error('--smooth is not supported with --workers'
+                     ' or --chunk-size')
+    _check_engine_args(parser, args)
+
+    return args
+
+
+def parse_animate_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mandelbrot animate')
+    parser.add_argument('--start-center',
+                        type=(lambda v: Point2D.parse(v, Fraction)))
+    parser.add_argument('--start-radius', type=Fraction, default=1.5)
+    parser.add_argument('--end-center', required=True,
+                        type=(lambda v: Point2D.parse(v, Fraction)))
+    parser.add_argument('--end-radius', required=True, type=Fraction)
+    parser.add_argument('--frames', type=int, required=True)
+    parser.add_argument('--steps', type=int, default=400)
+    _add_engine_args(parser)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--expmap', action='store_true',
+                        help='zoom straight in on --end-center, with'
+                             ' the frames read off one log-polar strip')
+    parser.add_argument('--format', dest='fmt', choices=FORMATS,
+                        default='y4m')
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS)
+    parser.add_argument('--out', dest='filename', default='-')
+    args = parser.parse_args(argv)
+
+    if args.frames < 1:
+        parser.error('got non-positive --frames')
+    if args.steps < 1:
+        parser.error('got non-positive --steps')
+    if args.fps < 1:
+        parser.error('got non-positive --fps')
+    if args.workers is not None and args.workers < 1:
+        parser.error('got non-positive --workers')
+    if args.expmap:
+        if args.start_center is not None:
+            parser.error('--start-center is not supported with --expmap')
+        if args.engine != 'brute' or args.smooth:
+            parser.error('--expmap is only supported by --engine brute,'
+                         ' without --smooth')
+    _check_engine_args(parser, args)
 
     return args
 
 
 def main(radius=1.5, center=Point2D(-0.75, 0), steps=None, *,
-         numpy=False, scale=None,
+         engine='brute', numpy=False, scale=None,
+         bulbs=False, periodicity=False, smooth=False, symmetry=True,
+         workers=None, chunksize=None,
+         cachedir=None, cachesize=None,
          uiname='text'):
     """The program!"""
     if uiname:
@@ -55,21 +152,89 @@ def main(radius=1.5, center=Point2D(-0.75, 0), steps=None, *,
         else:
             steps = 400
     grid = Grid(steps, steps)
-    area = Area.from_radius(radius, center)
+    valuetype = Fraction if engine in PRECISE_ENGINES else float
+    area = Area.from_radius(radius, center, valuetype)
     #scale = Scale.from_raw(scale)
 
-    if numpy:
-        raise NotImplementedError
-    else:
-        def iter_raster(area, grid, scale):
-            candidates = imaginary.iter_raster(area, grid)
-            return iter_mandelbrot(candidates, scale)
+    engineopts = {}
+    if bulbs:
+        engineopts['bulbs'] = True
+    if periodicity:
+        engineopts['periodicity'] = True
+    if smooth:
+        engineopts['smooth'] = True
+    iter_raster = resolve_engine(engine, numpy, workers, chunksize,
+                                 **engineopts)
+    if scale == 'auto':
+        from ._deepen import auto_maxiter
+        if engine in PRECISE_ENGINES:
+            # Floats can't resolve the samples, so the engine does it.
+            scale = auto_maxiter(area, grid, iter_raster)
+        else:
+            scale = auto_maxiter(area, grid, numpy=numpy)
+    # Samples (e.g. to anti-alias) skip the cache, so they don't crowd it.
+    sampler = iter_raster
+    if symmetry:
+        # Rows mirrored across the real axis are only computed once.
+        iter_raster = symmetric_for(engine, iter_raster)
+    if cachedir:
+        from ._cache import TileCache, cached
+        if cachesize is not None:
+            cachesize *= 1024 * 1024
+        cache = TileCache(cachedir, cachesize)
+        # numpy and workers don't change the counts, so they are left out.
+        iter_raster = cached(iter_raster, cache,
+                             (engine, sorted(engineopts.items())))
 
-    ui = start(uiname, opts, area, grid, scale, iter_raster)
+    # Some UIs can iterate any points, not just a grid, which helps.
+    iter_points = resolve_point_engine(engine, numpy, **engineopts)
+    ui = start(uiname, opts, area, grid, scale, iter_raster, iter_points,
+               sampler, numpy)
     if ui is not None:
         ui.wait()
 
 
+def animate(start_radius=1.5, start_center=None, *,
+            end_radius, end_center, frames, steps=400, scale=None,
+            engine='brute', numpy=False,
+            bulbs=False, periodicity=False, smooth=False, symmetry=True,
+            workers=None, expmap=False, fmt='y4m', fps=DEFAULT_FPS,
+            filename='-'):
+    """Render a zoom from one view to another, as a video stream.
+
+    With "expmap", the zoom is straight in on the end's center.
+    """
+    from ._animate import render
+    if start_center is None:
+        start_center = end_center if expmap else Point2D(-0.75, 0)
+    grid = Grid(steps, steps)
+    valuetype = Fraction if engine in PRECISE_ENGINES else float
+    start = Area.from_radius(start_radius, start_center, valuetype)
+    end = Area.from_radius(end_radius, end_center, valuetype)
+
+    engineopts = {}
+    if bulbs:
+        engineopts['bulbs'] = True
+    if periodicity:
+        engineopts['periodicity'] = True
+    if smooth:
+        engineopts['smooth'] = True
+    kwargs = dict(engine=engine, numpy=numpy, symmetry=symmetry,
+                  workers=workers, expmap=expmap, fmt=fmt, fps=fps,
+                  **engineopts)
+    if filename and filename != '-':
+        with open(filename, 'wb') as outfile:
+            render(start, end, frames, grid, scale, outfile, **kwargs)
+    else:
+        sys.stdout.flush()
+        render(start, end, frames, grid, scale, sys.stdout.buffer, **kwargs)
+        sys.stdout.buffer.flush()
+
+
 if __name__ == '__main__':
-    args = parse_args()
-    main(**vars(args))
+    if sys.argv[1:2] == ['animate']:
+        args = parse_animate_args(sys.argv[2:])
+        animate(**vars(args))
+    else:
+        args = parse_args()
+        main(**vars(args))
@@ -0,0 +1,188 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import math
+import os
+
+from ._geometry import Area, Point2D
+from ._raster import IterationRaster
+
+
+FORMATS = ('y4m', 'ppm')
+DEFAULT_FPS = 30
+# How many frames may wait to be written, beyond the one being written.
+WRITE_AHEAD = 4
+
+
+def _interpolate(start, end, t):
+    """Return (low, high) along one axis, "t" of the way through the zoom.
+
+    The size changes geometrically, so the zoom looks steady, and the
+    middle moves in step with the size, so the whole zoom is a scaling
+    about a single point, which stays put on the screen throughout.
+    """
+    (low0, high0), (low1, high1) = start, end
+    size0 = high0 - low0
+    size1 = high1 - low1
+    if size0 <= 0 or size1 <= 0:
+        raise ValueError('got empty area')
+    # The values keep their type (e.g. Fraction), for deep zooms.
+    valuetype = type(size0)
+    ratio = float(size1 / size0)
+    size = size0 * valuetype(ratio ** t)
+    if ratio == 1:
+        progress = valuetype(t)
+    else:
+        progress = (size0 - size) / (size0 - size1)
+    middle0 = (low0 + high0) / 2
+    middle = middle0 + ((low1 + high1) / 2 - middle0) * progress
+    return middle - size / 2, middle + size / 2
+
+
+def iter_areas(start, end, frames):
+    """Yield the Area for each frame of the zoom from start to end.
+
+    The first and last frames are exactly the start and end.
+    """
+    if frames < 1:
+        raise ValueError('got non-positive frames')
+    for k in range(frames):
+        if k == 0:
+            yield start
+            continue
+        if k == frames - 1:
+            yield end
+            continue
+        t = k / (frames - 1)
+        left, right = _interpolate((start.min.x, start.max.x),
+                                   (end.min.x, end.max.x), t)
+        bottom, top = _interpolate((start.min.y, start.max.y),
+                                   (end.min.y, end.max.y), t)
+        yield Area(Point2D(left, bottom, None), Point2D(right, top, None))
+
+
+# Each worker process sets up the engine just once.
+_worker = None
+
+
+def _init_worker(engine, numpy, symmetry, engineopts):
+    global _worker
+    from ._engines import PRECISE_ENGINES, resolve_engine, symmetric_for
+    iter_raster = resolve_engine(engine, numpy, **engineopts)
+    wrapped = symmetric_for(engine, iter_raster) if symmetry else iter_raster
+    # Floats can't resolve the samples for "auto", so the engine does it.
+    sampler = iter_raster if engine in PRECISE_ENGINES else None
+    _worker = (wrapped, sampler, numpy)
+
+
+def _render_frame(area, grid, scale):
+    iter_raster, sampler, numpy = _worker
+    if scale == 'auto':
+        from ._deepen import auto_maxiter
+        scale = auto_maxiter(area, grid, sampler, numpy=numpy)
+    values = iter_raster(area, grid, scale)
+    return IterationRaster.from_values(area, grid, values, scale)
+
+
+def iter_frames(areas, grid, scale, *, workers=None,
+                engine='brute', numpy=False, symmetry=True, **engineopts):
+    """Yield the IterationRaster for each of the areas, in order.
+
+    The frames are rendered in parallel by a pool of worker processes.
+    Only a couple of frames per worker are in flight at once, so memory
+    stays bounded however many frames there are.  If "scale" is "auto"
+    then each frame gets its own (see _deepen.auto_maxiter()).
+    """
+    workers = workers or os.cpu_count() or 1
+    initargs = (engine, numpy, symmetry, engineopts)
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=initargs) as executor:
+        pending = deque()
+        for area in areas:
+            pending.append(executor.submit(_render_frame, area, grid, scale))
+            if len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_expmap_frames(start, end, frames, grid, scale, *,
+                       engine='brute', numpy=False, symmetry=True,
+                       workers=None, **engineopts):
+    """Yield the IterationRaster for each frame, read off one ExpMap.
+
+    Rather than render every frame, this renders one log-polar strip
+    (see _expmap) around the zoom's center, from the corners of the
+    widest frame in to a pixel of the deepest, and remaps it to each
+    frame.  So the whole zoom costs about as much as a couple of frames.
+    The zoom may go in or out, but the start and end must share a
+    center, and only the brute engine is supported (its options are
+    passed through).  "symmetry" and "workers" don't apply.  If "scale"
+    is "auto" then the deepest frame picks it.
+    """
+    from ._distance import pixel_size
+    from . import _expmap
+    if engine != 'brute':
+        raise ValueError('unsupported engine {!r}'.format(engine))
+    # The zoom may go either way, so the strip covers both views.
+    deepest, widest = sorted((end, start),
+                             key=lambda area: pixel_size(area, grid))
+    outer = math.hypot(widest.delta.x, widest.delta.y) / 2
+    inner = pixel_size(deepest, grid) / 2
+    # The deepest view's center is the most precise.
+    center = complex((deepest.min.x + deepest.max.x) / 2,
+                     (deepest.min.y + deepest.max.y) / 2)
+    for area in (start, end):
+        middle = complex((area.min.x + area.max.x) / 2,
+                         (area.min.y + area.max.y) / 2)
+        if abs(middle - center) > inner:
+            raise ValueError('the start and end must share a center')
+    if scale == 'auto':
+        from ._deepen import auto_maxiter
+        scale = auto_maxiter(deepest, grid, numpy=numpy)
+    expmap = _expmap.render(center, outer, min(inner, outer),
+                            _expmap.width_for(grid), scale,
+                            numpy=numpy, **engineopts)
+    for area in iter_areas(start, end, frames):
+        yield _expmap.remap(expmap, area, grid, numpy=numpy)
+
+
+def render(start, end, frames, grid, scale, out, *,
+           fmt='y4m', fps=DEFAULT_FPS, expmap=False, **kwargs):
+    """Write the zoom from start to end to the binary file.
+
+    "fmt" is one of FORMATS: a YUV4MPEG2 stream (at "fps" frames per
+    second) or a sequence of PPM images.  Either can be piped straight
+    into a video encoder (e.g. ffmpeg).  The frames are encoded and
+    written on a thread of their own, while the next ones are computed.
+    If "expmap" is true then the frames come from iter_expmap_frames(),
+    otherwise iter_frames().  Any extra keyword arguments are passed
+    through to it.
+    """
+    if fmt == 'y4m':
+        from .ui import _y4m
+        out.write(_y4m.header(grid, fps))
+        encode = _y4m.encode_frame
+    elif fmt == 'ppm':
+        from .ui import _ppm
+        encode = _ppm.encode
+    else:
+        raise ValueError('unsupported format {!r}'.format(fmt))
+
+    def write(raster):
+        out.write(encode(raster, grid))
+
+    if expmap:
+        rasters = iter_expmap_frames(start, end, frames, grid, scale,
+                                     **kwargs)
+    else:
+        areas = iter_areas(start, end, frames)
+        rasters = iter_frames(areas, grid, scale, **kwargs)
+    with ThreadPoolExecutor(1) as writer:
+        # The one thread writes the frames in the order they come.
+        pending = deque()
+        for raster in rasters:
+            pending.append(writer.submit(write, raster))
+            if len(pending) > WRITE_AHEAD:
+                pending.popleft().result()
+        for future in pending:
+            future.result()
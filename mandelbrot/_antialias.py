@@ -0,0 +1,215 @@
+from collections.abc import Mapping
+import itertools
+import operator
+
+from ._geometry import Area, Grid, Point2D
+from ._symmetry import mirrored_rows
+
+
+# Runs of corners closer than this are computed together, gap and all,
+# since each call to iter_raster() has some overhead.
+MERGE_GAP = 4
+# The most rows of corners computed together.
+BAND_ROWS = 1
+
+
+def find_edges(values, grid, differ=None):
+    """Return the indices of the pixels that differ from a neighbor.
+
+    "values" has one value per pixel (e.g. a count or a color), in
+    raster order.  Only the 4 neighbors that share a side are checked.
+    Unequal neighbors only count if differ(a, b) is true, if provided.
+    These pixels are the ones worth supersampling.
+    """
+    width = len(grid.width)
+    edges = set()
+    above = None
+    for start in range(0, len(values), width):
+        row = values[start:start + width]
+        # Most neighbors are equal, so only the unequal ones are visited.
+        unequal = map(operator.ne, row, row[1:])
+        for i in itertools.compress(itertools.count(start), unequal):
+            if differ is None or differ(values[i], values[i + 1]):
+                edges.add(i)
+                edges.add(i + 1)
+        if above is not None:
+            unequal = map(operator.ne, row, above)
+            for i in itertools.compress(itertools.count(start), unequal):
+                if differ is None or differ(values[i], values[i - width]):
+                    edges.add(i)
+                    edges.add(i - width)
+        above = row
+    return sorted(edges)
+
+
+def corner_lattice(area, grid):
+    """Return the (area, grid) of the corners of the grid's pixels.
+
+    Each pixel is centered on its point, so the corners are offset from
+    the points by half a pixel, with one more on each side.
+    """
+    halfx = area.delta.x / grid.width / 2
+    halfy = area.delta.y / grid.height / 2
+    pmin = Point2D(area.min.x - halfx, area.min.y - halfy, None)
+    pmax = Point2D(area.max.x + halfx, area.max.y + halfy, None)
+    return Area(pmin, pmax), Grid(len(grid.width), len(grid.height))
+
+
+def _iter_runs(indices):
+    """Yield a range for each run of the sorted indices."""
+    start = end = None
+    for index in indices:
+        if start is not None and index - end <= MERGE_GAP:
+            end = index
+            continue
+        if start is not None:
+            yield range(start, end + 1)
+        start = end = index
+    if start is not None:
+        yield range(start, end + 1)
+
+
+def _iter_bands(rows):
+    """Yield a range for each band of up to BAND_ROWS sorted rows."""
+    band = []
+    for j in rows:
+        if band and (j != band[-1] + 1 or len(band) == BAND_ROWS):
+            yield range(band[0], band[-1] + 1)
+            band = []
+        band.append(j)
+    if band:
+        yield range(band[0], band[-1] + 1)
+
+
+class Supersamples(Mapping):
+    """{index: 4 corner counts} for the edge pixels, kept in numpy arrays.
+
+    "indices" is the sorted pixel indices and "counts" has a row of the
+    4 corner counts for each of them, with -1 for points in the set.
+    It reads like the dict that supersample() otherwise returns, but the
+    arrays can be used directly (e.g. by _ppm.encode()).
+    """
+
+    __slots__ = ('indices', 'counts')
+
+    def __init__(self, indices, counts):
+        self.indices = indices
+        self.counts = counts
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        return iter(self.indices.tolist())
+
+    def __getitem__(self, index):
+        pos = int(self.indices.searchsorted(index))
+        if pos == len(self.indices) or self.indices[pos] != index:
+            raise KeyError(index)
+        return _samples(self.counts[pos].tolist())
+
+    def items(self):
+        return zip(self.indices.tolist(),
+                   map(_samples, self.counts.tolist()))
+
+
+def _samples(counts):
+    return tuple(None if i < 0 else i for i in counts)
+
+
+def _supersample_numpy(iter_points, area, grid, scale, edges):
+    import numpy
+    width = len(grid.width)
+    cornerarea, cornergrid = corner_lattice(area, grid)
+    cwidth = width + 1
+    # Each row of corners maps to the row that is actually computed.
+    rowmap = numpy.arange(len(cornergrid.height))
+    for cj, mirror in mirrored_rows(cornerarea, cornergrid).items():
+        rowmap[cj] = mirror
+    edges = numpy.asarray(edges, dtype=numpy.intp)
+    j, i = numpy.divmod(edges, width)
+    top = rowmap[j] * cwidth + i
+    bottom = rowmap[j + 1] * cwidth + i
+    corners = numpy.stack([top, top + 1, bottom, bottom + 1], axis=1)
+    # Each needed corner is computed once, in order (without sorting).
+    isneeded = numpy.zeros(cwidth * len(cornergrid.height), dtype=bool)
+    isneeded[corners] = True
+    needed = numpy.flatnonzero(isneeded)
+    where = numpy.cumsum(isneeded) - 1
+    xs, ys = cornergrid.axes(cornerarea.min.x, cornerarea.max.x,
+                             cornerarea.max.y, cornerarea.min.y)
+    xs = numpy.array(xs)
+    ys = numpy.array(ys)
+    candidates = xs[needed % cwidth] + ys[needed // cwidth] * 1j
+    # None (in the set) becomes NaN.
+    counts = numpy.array(list(map(operator.itemgetter(1),
+                                  iter_points(candidates, scale))),
+                         dtype=float)
+    counts = numpy.where(numpy.isnan(counts), -1, counts)
+    return Supersamples(edges, counts.astype(numpy.intp)[where[corners]])
+
+
+def supersample(iter_raster, area, grid, scale, edges, *, iter_points=None,
+                numpy=False):
+    """Return {index: 4 corner counts} for each of the edge pixels.
+
+    The corners of neighboring pixels are shared, so each is computed
+    just once, with iter_raster(), a run of a row at a time.  If
+    "iter_points" is provided (see _engines.resolve_point_engine())
+    then all the corners are iterated with it in one go instead, which
+    is much faster for numpy.  Rows of corners mirrored across the real
+    axis are only computed once too.  Along with the count at its
+    center, each pixel then has 5 samples to average (e.g. by color).
+    Grids that are a single row or column aren't supersampled.  With
+    "numpy" (and "iter_points") the bookkeeping is vectorized too, and
+    a Supersamples is returned instead of a dict.
+    """
+    if not edges or not grid.width or not grid.height:
+        return {}
+    if numpy and iter_points is not None:
+        return _supersample_numpy(iter_points, area, grid, scale, edges)
+    width = len(grid.width)
+    cornerarea, cornergrid = corner_lattice(area, grid)
+    mirrors = mirrored_rows(cornerarea, cornergrid)
+
+    # {pixel row: its edge columns}
+    rows = {}
+    for j, indices in itertools.groupby(edges, lambda index: index // width):
+        rows[j] = [index - j * width for index in indices]
+    # {corner row: the corner columns it needs}
+    needed = {}
+    for j, columns in rows.items():
+        corners = set(columns)
+        corners.update(i + 1 for i in columns)
+        for cj in (j, j + 1):
+            needed.setdefault(mirrors.get(cj, cj), set()).update(corners)
+
+    counts = {cj: {} for cj in needed}
+    if iter_points is not None:
+        xs, ys = cornergrid.axes(cornerarea.min.x, cornerarea.max.x,
+                                 cornerarea.max.y, cornerarea.min.y)
+        corners = [(cj, ci) for cj in sorted(needed)
+                   for ci in sorted(needed[cj])]
+        candidates = [xs[ci] + ys[cj] * 1j for cj, ci in corners]
+        values = iter_points(candidates, scale)
+        for (cj, ci), (_, i) in zip(corners, values):
+            counts[cj][ci] = i
+    else:
+        for band in _iter_bands(sorted(needed)):
+            columns = set()
+            for cj in band:
+                columns.update(needed[cj])
+            for run in _iter_runs(sorted(columns)):
+                subarea, subgrid = cornergrid.subarea(cornerarea, run, band)
+                values = iter(iter_raster(subarea, subgrid, scale))
+                for cj in band:
+                    counts[cj].update(zip(run, (i for _, i in values)))
+
+    samples = {}
+    for j, columns in rows.items():
+        top = counts[mirrors.get(j, j)]
+        bottom = counts[mirrors.get(j + 1, j + 1)]
+        for i in columns:
+            samples[j * width + i] = (top[i], top[i + 1],
+                                      bottom[i], bottom[i + 1])
+    return samples
@@ -0,0 +1,219 @@
+from array import array
+import hashlib
+import mmap
+import os
+import os.path
+import struct
+
+from ._mandelbrot import MAX_DEPTH
+from ._raster import (
+        IterationRaster, SMOOTH_TYPECODE, TYPECODES,
+        sentinel_for, typecode_for)
+
+
+MAX_BYTES = 256 * 1024 * 1024
+
+# The file header is the magic number, the typecode, and the count.
+MAGIC = b'MBTILE1\0'
+HEADER = struct.Struct('<8s4xcxxxQ')
+SUFFIX = '.tile'
+
+# The counts are stored like IterationRaster.counts (see TYPECODES).
+
+
+class TileCache:
+    """A directory of iteration-count rasters, keyed by what made them.
+
+    Each entry is a file with a short header and then the raw counts.
+    Files are memory-mapped when loaded.  Once the directory grows past
+    "maxbytes", the least recently used entries are deleted.
+    """
+
+    @classmethod
+    def key(cls, area, grid, maxiter, engine):
+        """Return the cache key for a raster."""
+        raw = repr((tuple(area.min), tuple(area.max),
+                    int(grid.width), int(grid.height),
+                    maxiter or MAX_DEPTH,
+                    engine,
+                    ))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def __init__(self, dirname, maxbytes=None):
+        if maxbytes is not None and maxbytes < 0:
+            raise ValueError('got negative maxbytes')
+        self._dirname = dirname
+        self._maxbytes = maxbytes if maxbytes is not None else MAX_BYTES
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(type(self).__name__,
+                                       self._dirname, self._maxbytes)
+
+    @property
+    def dirname(self):
+        return self._dirname
+
+    @property
+    def maxbytes(self):
+        return self._maxbytes
+
+    def _filename(self, key):
+        return os.path.join(self._dirname, key + SUFFIX)
+
+    def get(self, key):
+        """Return the counts for the key, or None if not cached.
+
+        The counts are a list-like view of the memory-mapped file, with
+        None for points in the set.
+        """
+        filename = self._filename(key)
+        try:
+            file = open(filename, 'rb')
+        except FileNotFoundError:
+            return None
+        with file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return None
+        if len(data) < HEADER.size:
+            # It was cut short (e.g. by a crash), so it is useless.
+            self._discard(filename)
+            return None
+        magic, typecode, size = HEADER.unpack_from(data)
+        typecode = typecode.decode('ascii', 'replace')
+        if magic != MAGIC or typecode not in TYPECODES + (SMOOTH_TYPECODE,):
+            return None
+        if len(data) - HEADER.size != size * array(typecode).itemsize:
+            self._discard(filename)
+            return None
+        view = memoryview(data)[HEADER.size:].cast(typecode)
+        # Mark it as recently used.
+        os.utime(filename)
+        return _Counts(view, sentinel_for(typecode))
+
+    def _discard(self, filename):
+        try:
+            os.unlink(filename)
+        except FileNotFoundError:
+            pass
+
+    def set(self, key, counts, maxiter=None):
+        """Store the counts (None means "in set") for the key.
+
+        "counts" may also be an IterationRaster, which is written out
+        as-is.
+        """
+        if isinstance(counts, IterationRaster):
+            values = memoryview(counts.counts)
+            typecode = values.format
+        else:
+            typecode = typecode_for(maxiter)
+            sentinel = sentinel_for(typecode)
+            values = array(typecode, (sentinel if i is None else i
+                                      for i in counts))
+
+        os.makedirs(self._dirname, exist_ok=True)
+        filename = self._filename(key)
+        tmpname = '{}.{}.tmp'.format(filename, os.getpid())
+        with open(tmpname, 'wb') as outfile:
+            outfile.write(HEADER.pack(MAGIC, typecode.encode('ascii'),
+                                      len(values)))
+            outfile.write(values)
+        os.replace(tmpname, filename)
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used entries until under the limit."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self._dirname):
+            if not entry.name.endswith(SUFFIX):
+                continue
+            st = entry.stat()
+            entries.append((st.st_mtime, entry.path, st.st_size))
+            total += st.st_size
+        entries.sort()
+        for _, filename, size in entries:
+            if total <= self._maxbytes:
+                break
+            self._discard(filename)
+            total -= size
+
+
+class _Counts:
+
+    __slots__ = ('_view', '_sentinel')
+
+    def __init__(self, view, sentinel):
+        self._view = view
+        self._sentinel = sentinel
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, index):
+        i = self._view[index]
+        return None if i == self._sentinel else i
+
+    def __iter__(self):
+        sentinel = self._sentinel
+        for i in self._view:
+            yield None if i == sentinel else i
+
+
+def cached(iter_raster, cache, engine):
+    """Return a wrapper around iter_raster() that uses the cache.
+
+    "engine" identifies the engine in the cache key.  It must cover
+    anything that changes the counts.
+    """
+    return CachedEngine(iter_raster, cache, engine)
+
+
+class CachedEngine:
+    """An iter_raster() function wrapped to use a TileCache.
+
+    Besides calling it like the wrapped function, the cached rasters
+    can be looked up and stored directly, for counts that were computed
+    some other way (e.g. point by point).
+    """
+
+    def __init__(self, iter_raster, cache, engine):
+        self._iter_raster = iter_raster
+        self._cache = cache
+        self._engine = engine
+
+    def __call__(self, area, grid, maxiter):
+        raster = self.get(area, grid, maxiter)
+        if raster is not None:
+            return raster
+
+        values = self._iter_raster(area, grid, maxiter)
+        if isinstance(values, IterationRaster):
+            self.set(area, grid, maxiter, values)
+            return values
+        key = self._cache.key(area, grid, maxiter, self._engine)
+        return _iter_stored(values, self._cache, key, maxiter)
+
+    def get(self, area, grid, maxiter):
+        """Return the cached IterationRaster, or None if not cached."""
+        key = self._cache.key(area, grid, maxiter, self._engine)
+        counts = self._cache.get(key)
+        if counts is None:
+            return None
+        return IterationRaster(area, grid, counts._view)
+
+    def set(self, area, grid, maxiter, counts):
+        """Store the counts for the raster (see TileCache.set())."""
+        key = self._cache.key(area, grid, maxiter, self._engine)
+        self._cache.set(key, counts, maxiter)
+
+
+def _iter_stored(values, cache, key, maxiter):
+    # The counts are stored once the whole raster has been yielded.
+    counts = []
+    for c, i in values:
+        counts.append(i)
+        yield c, i
+    cache.set(key, counts, maxiter)
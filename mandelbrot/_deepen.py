@@ -0,0 +1,158 @@
+from ._geometry import Grid
+from ._mandelbrot import in_main_bulbs, iter_orbits
+from ._raster import IterationRaster
+
+
+# The iteration limits auto_maxiter() starts from and won't go past.
+MIN_AUTO_ITER = 32
+MAX_AUTO_ITER = 2 ** 16 - 2
+# The most sample points across each side of the view.
+AUTO_SAMPLES = 64
+# The share of samples left unresolved that is good enough.
+UNRESOLVED = 0.001
+
+
+class OrbitState:
+    """The counts for a view, along with the orbits still in the set.
+
+    Each call to deepen() raises the iteration limit and continues only
+    the orbits that haven't escaped yet, from where they stopped, rather
+    than starting over from 0.  That makes it cheap to keep raising
+    max-iter until the boundary stops changing.
+    """
+
+    def __init__(self, area, grid, *, numpy=False, bulbs=False):
+        self._area = area
+        self._grid = grid
+        self._numpy = numpy
+        self.maxiter = 0
+        # how many candidates escaped in the last call to deepen()
+        self.escaped = 0
+
+        xs, ys = grid.axes(area.min.x, area.max.x, area.max.y, area.min.y)
+        candidates = [a + b * 1j for b in ys for a in xs]
+        if numpy:
+            import numpy
+            candidates = numpy.array(candidates, dtype=complex)
+            self._counts = numpy.full(len(candidates), -1, dtype=numpy.intp)
+            if bulbs:
+                from ._numpy import in_main_bulbs as in_bulbs
+                self._index = numpy.flatnonzero(~in_bulbs(candidates))
+            else:
+                self._index = numpy.arange(len(candidates))
+            self._c = candidates[self._index]
+            self._z = numpy.zeros_like(self._c)
+        else:
+            self._counts = [None] * len(candidates)
+            self._index = [p for p, c in enumerate(candidates)
+                           if not bulbs or not in_main_bulbs(c)]
+            self._c = [candidates[p] for p in self._index]
+            self._z = [0j] * len(self._index)
+
+    def __len__(self):
+        """Return how many orbits are still live."""
+        return len(self._index)
+
+    @property
+    def area(self):
+        return self._area
+
+    @property
+    def grid(self):
+        return self._grid
+
+    def deepen(self, maxiter):
+        """Iterate the live orbits up to maxiter and return the raster.
+
+        The raster is an IterationRaster with the counts so far.
+        """
+        if maxiter < self.maxiter:
+            raise ValueError('maxiter went down ({} < {})'
+                             .format(maxiter, self.maxiter))
+        if self._numpy:
+            self._deepen_numpy(maxiter)
+        else:
+            self._deepen(maxiter)
+        self.maxiter = maxiter
+        return self.raster()
+
+    def _deepen(self, maxiter):
+        results = iter_orbits(zip(self._c, self._z), maxiter,
+                              start=self.maxiter)
+        index, live, zs = [], [], []
+        for p, (c, i, z) in zip(self._index, results):
+            if i is None:
+                index.append(p)
+                live.append(c)
+                zs.append(z)
+            else:
+                self._counts[p] = i
+        self.escaped = len(self._index) - len(index)
+        self._index, self._c, self._z = index, live, zs
+
+    def _deepen_numpy(self, maxiter):
+        from ._numpy import escape_counts
+        counts = escape_counts(self._c, maxiter,
+                               orbits=self._z, start=self.maxiter)
+        escaped = counts >= 0
+        self._counts[self._index[escaped]] = counts[escaped]
+        live = ~escaped
+        self.escaped = len(self._index) - int(live.sum())
+        self._index = self._index[live]
+        self._c = self._c[live]
+        self._z = self._z[live]
+
+    def raster(self):
+        """Return the IterationRaster for the counts so far."""
+        if self._numpy:
+            from ._numpy import to_raster
+            return to_raster(self._area, self._grid, self._counts,
+                             self.maxiter)
+        return IterationRaster.from_counts(self._area, self._grid,
+                                           self._counts, self.maxiter)
+
+
+def _sample_grid(grid, samples):
+    return Grid(min(int(grid.width), samples - 1),
+                min(int(grid.height), samples - 1))
+
+
+def auto_maxiter(area, grid, iter_raster=None, *,
+                 threshold=UNRESOLVED, samples=AUTO_SAMPLES, numpy=False):
+    """Return the iteration limit the view needs.
+
+    The view is sampled on a coarse grid (at most "samples" points on a
+    side) and the limit is doubled, starting at MIN_AUTO_ITER, until
+    the share of samples that only escape after the next doubling falls
+    below "threshold".  Those are the boundary points the lower limit
+    would wrongly leave in the set.  The limit keeps going up while no
+    sample has escaped at all.
+
+    By default the samples are resumed with an OrbitState, rather than
+    starting over each time.  If the area needs more precision than
+    floats (e.g. a deep zoom) then pass the engine's iter_raster()
+    instead.
+    """
+    sample = _sample_grid(grid, samples)
+    maxiter = MIN_AUTO_ITER
+    if iter_raster is None:
+        state = OrbitState(area, sample, numpy=numpy, bulbs=True)
+        state.deepen(maxiter)
+        total = state.escaped
+    while maxiter * 2 <= MAX_AUTO_ITER:
+        if iter_raster is None:
+            state.deepen(maxiter * 2)
+            escaped = state.escaped
+            total += escaped
+        else:
+            counts = [i for _, i in iter_raster(area, sample, maxiter * 2)]
+            escaped = sum(1 for i in counts if i is not None and i >= maxiter)
+            total = len(counts) - counts.count(None)
+        # Until something escapes, the boundary hasn't even shown up.
+        if total and escaped < threshold * len(sample):
+            break
+        if iter_raster is None and not len(state):
+            # Every sample is resolved.
+            break
+        maxiter *= 2
+    return maxiter
@@ -0,0 +1,39 @@
+from . import imaginary
+from ._mandelbrot import iter_distances
+from ._raster import IterationRaster
+
+
+# How close to the set (in pixels) a point must be to be drawn as in it.
+THICKNESS = 0.5
+
+
+def pixel_size(area, grid):
+    """Return the distance between neighboring points of the grid."""
+    sizes = [float(delta / steps)
+             for delta, steps in zip(area.delta, (grid.width, grid.height))
+             if steps]
+    return min(sizes) if sizes else 0.0
+
+
+def iter_raster(area, grid, maxiter=None, *,
+                numpy=False, thickness=THICKNESS, **kwargs):
+    """Return the IterationRaster for the grid, with the boundary drawn in.
+
+    Each point's distance from the set is estimated (see
+    _mandelbrot.iter_distances()).  Points closer than "thickness"
+    pixels count as in the set, so filaments thinner than a pixel still
+    show up, even at a low resolution and max-iter.  Any extra keyword
+    arguments are passed through to the engine.
+    """
+    limit = thickness * pixel_size(area, grid)
+    if numpy:
+        from ._numpy import complex_plane, distance_estimates, to_raster
+        candidates = complex_plane(area, grid)
+        counts, distances = distance_estimates(candidates, maxiter, **kwargs)
+        counts[distances < limit] = -1
+        return to_raster(area, grid, counts, maxiter)
+
+    candidates = imaginary.iter_raster(area, grid)
+    values = iter_distances(candidates, maxiter, **kwargs)
+    counts = [None if distance < limit else i for _, i, distance in values]
+    return IterationRaster.from_counts(area, grid, counts, maxiter)
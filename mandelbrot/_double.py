@@ -0,0 +1,149 @@
+from fractions import Fraction
+
+import numpy
+
+from ._numpy import _resolve_maxiter, to_raster
+
+
+# Dekker's constant, for splitting a float into two 26-bit halves.
+_SPLITTER = 2.0 ** 27 + 1
+
+
+def split(value):
+    """Return (hi, lo), the double-double closest to the value.
+
+    "hi" is the float closest to the value and "lo" is the float
+    closest to what is left over.  Together they carry about 32
+    significant digits, so the value should be exact (e.g. Fraction).
+    """
+    hi = float(value)
+    lo = float(Fraction(value) - Fraction(hi))
+    return hi, lo
+
+
+# The error-free transformations work the same for floats and arrays.
+
+def two_sum(a, b):
+    """Return (s, e), where s is the float sum and s + e == a + b."""
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _quick_two_sum(a, b):
+    # Like two_sum(), but only if |a| >= |b|.
+    s = a + b
+    return s, b - (s - a)
+
+
+def _halves(a):
+    t = _SPLITTER * a
+    hi = t - (t - a)
+    return hi, a - hi
+
+
+def two_prod(a, b):
+    """Return (p, e), where p is the float product and p + e == a * b."""
+    p = a * b
+    ahi, alo = _halves(a)
+    bhi, blo = _halves(b)
+    return p, ((ahi * bhi - p) + ahi * blo + alo * bhi) + alo * blo
+
+
+def add(ahi, alo, bhi, blo):
+    """Return the double-double sum of the two double-doubles.
+
+    This is the quick ("sloppy") sum.  When the two nearly cancel out,
+    the result is only good to about 1e-32 of the bigger one, rather
+    than of the result.  That is plenty for orbits, which stay small.
+    """
+    s, e = two_sum(ahi, bhi)
+    return _quick_two_sum(s, e + (alo + blo))
+
+
+def mul(ahi, alo, bhi, blo):
+    """Return the double-double product of the two double-doubles."""
+    p, e = two_prod(ahi, bhi)
+    return _quick_two_sum(p, e + (ahi * blo + alo * bhi))
+
+
+def sqr(hi, lo):
+    """Return the double-double square of the double-double."""
+    p = hi * hi
+    high, low = _halves(hi)
+    e = ((high * high - p) + 2 * high * low) + low * low
+    return _quick_two_sum(p, e + 2 * hi * lo)
+
+
+def _axis(steps, start, end):
+    # This matches Steps.iter_floats(), but exactly.
+    values = steps.iter_floats(Fraction(start), Fraction(end))
+    hi, lo = zip(*map(split, values))
+    return numpy.array(hi), numpy.array(lo)
+
+
+def complex_plane(area, grid):
+    """Return (xhi, xlo, yhi, ylo), the 2D arrays of the candidates.
+
+    The arrays are in raster order, like _numpy.complex_plane().
+    """
+    xhi, xlo = _axis(grid.width, area.min.x, area.max.x)
+    yhi, ylo = _axis(grid.height, area.max.y, area.min.y)
+    shape = (len(yhi), len(xhi))
+    return (numpy.broadcast_to(xhi, shape).copy(),
+            numpy.broadcast_to(xlo, shape).copy(),
+            numpy.broadcast_to(yhi[:, numpy.newaxis], shape).copy(),
+            numpy.broadcast_to(ylo[:, numpy.newaxis], shape).copy())
+
+
+def escape_counts(area, grid, maxiter=None):
+    """Return the 2D array of iteration counts for the grid.
+
+    Every candidate and orbit is a double-double: a pair of floats
+    (hi, lo) whose sum has about 32 significant digits.  That covers
+    zooms far past where floats give out (a radius of about 1e-13), down
+    to about 1e-28, with every pixel still iterated directly, rather
+    than relative to a reference orbit (see _perturb).
+
+    Like _numpy.escape_counts(), candidates in the set get -1.
+    """
+    maxiter = _resolve_maxiter(maxiter)
+    planes = complex_plane(area, grid)
+    counts = numpy.full(planes[0].shape, -1, dtype=numpy.intp)
+    found = counts.reshape(-1)
+    cxhi, cxlo, cyhi, cylo = (plane.reshape(-1) for plane in planes)
+    index = numpy.arange(cxhi.size)
+    xhi = numpy.zeros_like(cxhi)
+    xlo = numpy.zeros_like(cxhi)
+    yhi = numpy.zeros_like(cxhi)
+    ylo = numpy.zeros_like(cxhi)
+    for i in range(maxiter):
+        # z = z*z + c, i.e. (x*x - y*y + cx, 2*x*y + cy)
+        xxhi, xxlo = sqr(xhi, xlo)
+        yyhi, yylo = sqr(yhi, ylo)
+        xyhi, xylo = mul(xhi, xlo, yhi, ylo)
+        xhi, xlo = add(*add(xxhi, xxlo, -yyhi, -yylo), cxhi, cxlo)
+        yhi, ylo = add(2 * xyhi, 2 * xylo, cyhi, cylo)
+        # The low parts can't push |z| across 2 by any amount that matters.
+        escaped = xhi * xhi + yhi * yhi > 4
+        if not escaped.any():
+            continue
+        found[index[escaped]] = i
+        live = ~escaped
+        index = index[live]
+        if not index.size:
+            break
+        cxhi, cxlo, cyhi, cylo = cxhi[live], cxlo[live], cyhi[live], cylo[live]
+        xhi, xlo, yhi, ylo = xhi[live], xlo[live], yhi[live], ylo[live]
+    return counts
+
+
+def iter_raster(area, grid, maxiter=None):
+    """Return the IterationRaster for the grid.
+
+    The area's values should be exact (e.g. Fraction) for zooms past
+    what floats can resolve.  The candidates it yields are only as
+    precise as a complex.
+    """
+    counts = escape_counts(area, grid, maxiter)
+    return to_raster(area, grid, counts, maxiter)
@@ -0,0 +1,133 @@
+import itertools
+
+from . import imaginary
+from ._mandelbrot import iter_mandelbrot
+
+
+ENGINES = ('brute', 'subdivide', 'boundary', 'perturb', 'distance',
+           'double', 'fixed')
+# These engines need the area at full precision.
+PRECISE_ENGINES = ('perturb', 'double', 'fixed')
+# These engines iterate one reference orbit, from the center of the area.
+REFERENCE_ENGINES = ('perturb',)
+
+
+def resolve_engine(engine='brute', numpy=False, workers=None, chunksize=None,
+                   smooth=False, **engineopts):
+    """Return the iter_raster() function for the engine.
+
+    If "smooth" is true then the engine produces fractional counts, in
+    a float32 IterationRaster.  Any extra keyword arguments are passed
+    through to the engine.
+    """
+    if engine == 'subdivide':
+        from ._subdivide import iter_raster as iter_subdivide
+
+        def iter_raster(area, grid, scale):
+            return iter_subdivide(area, grid, scale,
+                                  numpy=numpy, **engineopts)
+    elif engine == 'boundary':
+        from ._boundary import iter_raster as iter_boundary
+
+        def iter_raster(area, grid, scale):
+            return iter_boundary(area, grid, scale,
+                                 numpy=numpy, **engineopts)
+    elif engine == 'perturb':
+        from ._perturb import iter_raster as iter_perturb
+
+        def iter_raster(area, grid, scale):
+            return iter_perturb(area, grid, scale, **engineopts)
+    elif engine == 'double':
+        from ._double import iter_raster as iter_double
+
+        def iter_raster(area, grid, scale):
+            return iter_double(area, grid, scale, **engineopts)
+    elif engine == 'fixed':
+        from ._fixed import iter_raster as iter_fixed
+
+        def iter_raster(area, grid, scale):
+            return iter_fixed(area, grid, scale, **engineopts)
+    elif engine == 'distance':
+        from ._distance import iter_raster as iter_distance
+
+        def iter_raster(area, grid, scale):
+            return iter_distance(area, grid, scale,
+                                 numpy=numpy, **engineopts)
+    elif engine != 'brute':
+        raise ValueError('unsupported engine {!r}'.format(engine))
+    elif smooth:
+        if numpy:
+            from ._numpy import iter_smooth_raster
+
+            def iter_raster(area, grid, scale):
+                return iter_smooth_raster(area, grid, scale, **engineopts)
+        else:
+            from ._mandelbrot import iter_smooth
+            from ._raster import IterationRaster, SMOOTH_TYPECODE
+
+            def iter_raster(area, grid, scale):
+                candidates = imaginary.iter_raster(area, grid)
+                values = iter_smooth(candidates, scale, **engineopts)
+                return IterationRaster.from_values(
+                        area, grid, values, typecode=SMOOTH_TYPECODE)
+    elif workers is not None:
+        from ._parallel import iter_raster as iter_parallel
+
+        def iter_raster(area, grid, scale):
+            return iter_parallel(area, grid, scale,
+                                 workers=workers or None, rows=chunksize,
+                                 numpy=numpy, **engineopts)
+    elif chunksize:
+        # The candidates are streamed a batch of rows at a time.
+        if numpy:
+            from ._numpy import iter_mandelbrot_batches
+        else:
+            from ._mandelbrot import iter_mandelbrot_batches
+
+        def iter_raster(area, grid, scale):
+            batches = imaginary.iter_batches(area, grid, chunksize)
+            results = iter_mandelbrot_batches(batches, scale, **engineopts)
+            return itertools.chain.from_iterable(results)
+    elif numpy:
+        from ._numpy import iter_raster as iter_numpy
+
+        def iter_raster(area, grid, scale):
+            return iter_numpy(area, grid, scale, **engineopts)
+    else:
+        def iter_raster(area, grid, scale):
+            candidates = imaginary.iter_raster(area, grid)
+            return iter_mandelbrot(candidates, scale, **engineopts)
+    return iter_raster
+
+
+def symmetric_for(engine, iter_raster):
+    """Return iter_raster() wrapped to compute mirrored rows only once.
+
+    See _symmetry.symmetric().  The reference engines are returned
+    as-is, since each band would take its own reference orbit, off
+    the view's center (and a lone row can't give it one at all).
+    """
+    if engine in REFERENCE_ENGINES:
+        return iter_raster
+    from ._symmetry import symmetric
+    return symmetric(iter_raster)
+
+
+def resolve_point_engine(engine='brute', numpy=False, smooth=False,
+                         **engineopts):
+    """Return an iter_mandelbrot() function for the engine, or None.
+
+    It takes (candidates, maxiter), so any points can be iterated, not
+    just a grid over an area.  Only the brute engine works point by
+    point, so the others get None.
+    """
+    if engine != 'brute' or smooth:
+        return None
+    if numpy:
+        from ._numpy import iter_mandelbrot as iter_engine
+    else:
+        iter_engine = iter_mandelbrot
+
+    def iter_points(candidates, scale):
+        return iter_engine(candidates, scale, **engineopts)
+    return iter_points
@@ -0,0 +1,204 @@
+from array import array
+import itertools
+import math
+
+from ._mandelbrot import iter_mandelbrot
+from ._raster import IterationRaster, sentinel_for, typecode_for
+
+
+# The most points numpy computes together, which bounds the memory used.
+BAND_SIZE = 2 ** 16
+
+
+def width_for(grid):
+    """Return the strip width (points around) that covers the grid.
+
+    At every radius out to the grid's corners, neighboring points of
+    the strip are no farther apart than neighboring pixels, in a view
+    centered on the strip's center.
+    """
+    return max(1, math.ceil(math.pi * math.sqrt(2) * max(len(grid.width),
+                                                         len(grid.height))))
+
+
+def rows_for(outer, inner, width):
+    """Return the number of rows from the outer radius in to the inner."""
+    if not 0 < inner <= outer:
+        raise ValueError('expected 0 < inner <= outer')
+    return math.ceil(math.log(outer / inner) * width / (2 * math.pi)) + 1
+
+
+class ExpMap:
+    """The iteration counts over an exponential map around a center.
+
+    Row j is a circle of radius outer * exp(-2 * pi * j / width) around
+    the center, and column i is the angle 2 * pi * i / width.  So each
+    row is a slightly smaller scale than the one above it, with the
+    points spaced evenly (and square) in log-polar terms.  The view at
+    any scale between "outer" and "inner" can be read off the strip
+    (see remap()), rather than iterated again.
+
+    The counts are kept like an IterationRaster's, in one contiguous
+    buffer, with "sentinel" for points in the set.
+    """
+
+    __slots__ = ('_center', '_outer', '_width', '_counts', '_sentinel')
+
+    def __init__(self, center, outer, width, counts):
+        view = memoryview(counts)
+        if len(view) % width:
+            raise ValueError('expected whole rows of {} counts, got {}'
+                             .format(width, len(view)))
+        self._center = complex(center)
+        self._outer = float(outer)
+        self._width = width
+        self._counts = counts
+        self._sentinel = sentinel_for(view.format)
+
+    def __repr__(self):
+        return '{}({!r}, {!r}, {!r}, <{} rows>)'.format(
+                type(self).__name__, self._center, self._outer, self._width,
+                self.rows)
+
+    @property
+    def center(self):
+        return self._center
+
+    @property
+    def outer(self):
+        return self._outer
+
+    @property
+    def inner(self):
+        return self.radius(self.rows - 1)
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def rows(self):
+        return len(self._counts) // self._width
+
+    @property
+    def counts(self):
+        """The raw counts, with "sentinel" for points in the set."""
+        return self._counts
+
+    @property
+    def sentinel(self):
+        return self._sentinel
+
+    def radius(self, j):
+        """Return the radius of row j (0 is the outermost)."""
+        return self._outer * math.exp(-2 * math.pi * j / self._width)
+
+    def row(self, j):
+        """Return a memoryview of the raw counts in row j."""
+        if not 0 <= j < self.rows:
+            raise IndexError(j)
+        width = self._width
+        return memoryview(self._counts)[j * width:(j + 1) * width]
+
+
+def iter_candidates(center, outer, width, rows):
+    """Yield each point of the strip, in raster order (see ExpMap)."""
+    center = complex(center)
+    turns = [complex(math.cos(a), math.sin(a))
+             for a in (2 * math.pi * i / width for i in range(width))]
+    for j in range(rows):
+        radius = outer * math.exp(-2 * math.pi * j / width)
+        for turn in turns:
+            yield center + radius * turn
+
+
+def _iter_counts_numpy(candidates, maxiter, **kwargs):
+    import numpy
+    from ._numpy import escape_counts
+    while True:
+        batch = numpy.fromiter(itertools.islice(candidates, BAND_SIZE),
+                               dtype=complex)
+        if not batch.size:
+            break
+        counts = escape_counts(batch, maxiter, **kwargs)
+        yield from (None if i < 0 else i for i in counts.tolist())
+
+
+def render(center, outer, inner, width, maxiter=None, *, numpy=False,
+           **kwargs):
+    """Return the ExpMap from the outer radius in to the inner one.
+
+    "width" is the number of points around each circle (see
+    width_for()).  Each ring is the same number of points, so the cost
+    only grows with the log of the zoom, outer / inner.  The points are
+    floats, so this only goes as deep as the float engines.  Any extra
+    keyword arguments (e.g. "bulbs") are passed through to the engine.
+    """
+    rows = rows_for(outer, inner, width)
+    candidates = iter_candidates(center, outer, width, rows)
+    if numpy:
+        counts = _iter_counts_numpy(candidates, maxiter, **kwargs)
+    else:
+        counts = (i for _, i in iter_mandelbrot(candidates, maxiter,
+                                                **kwargs))
+    typecode = typecode_for(maxiter)
+    sentinel = sentinel_for(typecode)
+    buffer = array(typecode, (sentinel if i is None else i for i in counts))
+    return ExpMap(center, outer, width, buffer)
+
+
+def _strip_index(expmap, dx, dy):
+    # This is the point of the strip nearest to the offset from the center.
+    width = expmap.width
+    last = expmap.rows - 1
+    radius = math.hypot(dx, dy)
+    if radius:
+        j = round(math.log(expmap.outer / radius) * width / (2 * math.pi))
+        j = min(max(j, 0), last)
+    else:
+        j = last
+    i = round(math.atan2(dy, dx) * width / (2 * math.pi)) % width
+    return j * width + i
+
+
+def _remap_numpy(expmap, xs, ys):
+    import numpy
+    width = expmap.width
+    cx, cy = expmap.center.real, expmap.center.imag
+    dx = numpy.array(xs, dtype=float)[numpy.newaxis, :] - cx
+    dy = numpy.array(ys, dtype=float)[:, numpy.newaxis] - cy
+    with numpy.errstate(divide='ignore'):
+        j = numpy.log(expmap.outer / numpy.hypot(dx, dy))
+    # The center itself (j is inf) takes the innermost row.
+    j = numpy.nan_to_num(j, posinf=expmap.rows)
+    j = numpy.rint(j * width / (2 * numpy.pi))
+    j = numpy.clip(j, 0, expmap.rows - 1).astype(numpy.intp)
+    i = numpy.rint(numpy.arctan2(dy, dx) * width / (2 * numpy.pi))
+    i = i.astype(numpy.intp) % width
+    typecode = memoryview(expmap.counts).format
+    raw = numpy.frombuffer(expmap.counts, dtype=typecode)
+    buffer = array(typecode)
+    buffer.frombytes(raw[(j * width + i).reshape(-1)].tobytes())
+    return buffer
+
+
+def remap(expmap, area, grid, *, numpy=False):
+    """Return the IterationRaster for the grid, read off the strip.
+
+    Each pixel takes the count of the nearest point of the strip.
+    Pixels closer to the center than the strip's inner radius take
+    its innermost row, and pixels beyond the outer radius its outermost
+    row, so the view should fit between the two.
+    """
+    xs, ys = grid.axes(area.min.x, area.max.x, area.max.y, area.min.y)
+    xs = [float(x) for x in xs]
+    ys = [float(y) for y in ys]
+    if numpy:
+        buffer = _remap_numpy(expmap, xs, ys)
+    else:
+        cx, cy = expmap.center.real, expmap.center.imag
+        counts = expmap.counts
+        buffer = array(memoryview(counts).format,
+                       (counts[_strip_index(expmap, x - cx, y - cy)]
+                        for y in ys for x in xs))
+    return IterationRaster(area, grid, buffer)
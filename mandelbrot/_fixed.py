@@ -0,0 +1,106 @@
+from fractions import Fraction
+
+from ._mandelbrot import MAX_ITER
+from ._raster import IterationRaster
+
+
+# Extra bits of precision, beyond the pixel size.  Rounding errors grow
+# along the orbit, so deep boundary points need plenty.
+GUARD_BITS = 64
+# Never less precise than a float.
+MIN_BITS = 53
+
+
+def bits_for(area, grid):
+    """Return the number of fractional bits needed to tell the pixels apart.
+
+    This doesn't go through float, so it works for any zoom.
+    """
+    sizes = [Fraction(delta) / steps
+             for delta, steps in zip(area.delta, (grid.width, grid.height))
+             if steps]
+    pixel = min(sizes, default=0)
+    if pixel <= 0:
+        raise ValueError('got empty area')
+    # This is within a bit of -log2(pixel).
+    depth = pixel.denominator.bit_length() - pixel.numerator.bit_length()
+    return max(MIN_BITS, GUARD_BITS + depth)
+
+
+def to_fixed(value, bits):
+    """Return the value as an int scaled by 2**bits.
+
+    The value may be anything Fraction accepts (e.g. a Decimal or a
+    decimal string), so nothing is lost along the way.
+    """
+    return round(Fraction(value) * (1 << bits))
+
+
+def from_fixed(value, bits):
+    """Return the float closest to the scaled int."""
+    return value / (1 << bits)
+
+
+def iter_orbit(cx, cy, maxiter, bits):
+    """Yield each Z (as a pair of scaled ints) of the orbit of C.
+
+    C is also a pair of ints scaled by 2**bits (see to_fixed()).  The
+    orbit stops after "maxiter" iterations or once it escapes.
+    """
+    four = 4 << bits
+    x = y = xx = yy = 0
+    for _ in range(maxiter):
+        y = ((x * y) >> (bits - 1)) + cy
+        x = xx - yy + cx
+        yield x, y
+        xx = (x * x) >> bits
+        yy = (y * y) >> bits
+        if xx + yy > four:
+            break
+
+
+def iter_counts(candidates, maxiter=MAX_ITER, bits=MIN_BITS):
+    """Yield the number of iterations for each candidate, or None.
+
+    Each candidate is a pair of ints scaled by 2**bits (see to_fixed()).
+    The numbers stay ints the whole way, so the only error is from
+    truncating each product to "bits" fractional bits.  Otherwise this
+    is the same as _mandelbrot.iter_mandelbrot().
+    """
+    if not hasattr(maxiter, '__iter__'):
+        maxiter = range(maxiter) if maxiter else MAX_ITER
+    four = 4 << bits
+    shift = bits - 1
+    for cx, cy in candidates:
+        x = y = xx = yy = 0
+        for i in maxiter:
+            # z = z*z + c, with the squares left over from the last check
+            y = ((x * y) >> shift) + cy
+            x = xx - yy + cx
+            xx = (x * x) >> bits
+            yy = (y * y) >> bits
+            if xx + yy > four:
+                yield i
+                break
+        else:
+            # in the set!
+            yield None
+
+
+def iter_raster(area, grid, maxiter=None):
+    """Return the IterationRaster for the grid.
+
+    The precision is picked to fit the area (see bits_for()), so this
+    works at any zoom, as long as the area's values are exact (e.g.
+    Fraction).  Of the pure-Python engines that can go deep, this is
+    the fastest, since Python ints are quicker than Decimal or Fraction.
+    The candidates it yields are only as precise as a complex.
+    """
+    bits = bits_for(area, grid)
+    xs = [to_fixed(x, bits) for x in grid.width.iter_floats(
+            Fraction(area.min.x), Fraction(area.max.x))]
+    ys = [to_fixed(y, bits) for y in grid.height.iter_floats(
+            Fraction(area.max.y), Fraction(area.min.y))]
+    candidates = ((x, y) for y in ys for x in xs)
+    counts = iter_counts(candidates, maxiter, bits)
+    return IterationRaster.from_counts(area, grid, counts, maxiter)
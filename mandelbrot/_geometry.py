@@ -1,5 +1,8 @@
 
+from decimal import Decimal
+from fractions import Fraction
 import math
+import re
 
 from ._util import as_namedtuple, Steps
 
@@ -17,6 +20,9 @@ class Grid:
         self._height = height
         return self
 
+    def __getnewargs__(self):
+        return (self._width, self._height)
+
     def __len__(self):
         return len(self.width) * len(self.height)
 
@@ -56,6 +62,41 @@ class Grid:
             for i in self.width.iter_floats(xstart, xend):
                 yield (i, j)
 
+    def axes(self, xstart, xend, ystart, yend):
+        """Return (xs, ys), the coordinates of the columns and rows.
+
+        Each is an array('d'), so there is no object per pixel.
+        """
+        return (self.width.floats(xstart, xend),
+                self.height.floats(ystart, yend))
+
+    def iter_rows(self, xstart, xend, ystart, yend, rows=1):
+        """Yield (xs, ys) for each band of up to "rows" rows, in order.
+
+        "xs" is the same array every time and "ys" is a memoryview of
+        just the band's rows.
+        """
+        if rows < 1:
+            raise ValueError('got non-positive rows')
+        xs, ys = self.axes(xstart, xend, ystart, yend)
+        ys = memoryview(ys)
+        for start in range(0, len(ys), rows):
+            yield xs, ys[start:start + rows]
+
+    def subarea(self, area, columns, rows):
+        """Return the (area, grid) covering just the lattice of points.
+
+        "columns" and "rows" are evenly spaced ranges of indices into
+        the grid over the area.
+        """
+        left = self.width.float_at(area.min.x, area.max.x, columns[0])
+        right = self.width.float_at(area.min.x, area.max.x, columns[-1])
+        top = self.height.float_at(area.max.y, area.min.y, rows[0])
+        bottom = self.height.float_at(area.max.y, area.min.y, rows[-1])
+        pmin = Point2D(left, bottom, None)
+        pmax = Point2D(right, top, None)
+        return Area(pmin, pmax), Grid(len(columns) - 1, len(rows) - 1)
+
     def iter_points(self, start, end):
         start = Point2D.from_raw(start)
         end = Point2D.from_raw(end)
@@ -63,6 +104,12 @@ class Grid:
             yield Point2D(i, j)
 
 
+# e.g. "-0.75+0.1j", split into the real and imaginary parts
+_NUMBER = r'(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+_COMPLEX_RE = re.compile(r'^\s*([+-]?{0})\s*([+-])\s*({0})[ij]\s*$'
+                         .format(_NUMBER))
+
+
 @as_namedtuple('x y')
 class Point2D:
 
@@ -89,7 +136,7 @@ class Point2D:
         return cls(x, y)
 
     @classmethod
-    def parse(cls, ptstr):
+    def parse(cls, ptstr, valuetype=float):
         try:
             if not isinstance(ptstr, str):
                 raise ValueError('not a string')
@@ -117,12 +164,18 @@ class Point2D:
                 if not ptstr.endswith(('i', 'j')):
                     raise ValueError(
                             'expected 2 numbers, got {}'.format(len(values)))
-                c = complex(ptstr.replace('i', 'j'))
-                x, y = c.real, c.imag
+                m = _COMPLEX_RE.match(ptstr)
+                if m:
+                    # Keep the digits, in case valuetype can use them.
+                    x, sign, y = m.groups()
+                    y = sign + y
+                else:
+                    c = complex(ptstr.replace('i', 'j'))
+                    x, y = c.real, c.imag
 
             # Create a Point2D with those numbers.
             try:
-                self = cls(x, y)
+                self = cls(x, y, valuetype)
             except ValueError:
                 raise ValueError('must be floats')
         except ValueError as exc:
@@ -134,13 +187,17 @@ class Point2D:
         return self
 
     def __new__(cls, x=0.0, y=0.0, valuetype=float):
-        # XXX Fraction or Decimal instead of float?
+        # For more precision use Fraction (or Decimal) for valuetype.
         if valuetype is not None:
             x = valuetype(x) if x is not None else None
             y = valuetype(y) if y is not None else None
         self = super().__new__(cls, x, y)
         return self
 
+    def __getnewargs__(self):
+        # Keep the values as they are (e.g. Fraction) when pickled.
+        return (self.x, self.y, None)
+
     def __init__(self, *args, **kwargs):
         # no super call
 
@@ -153,6 +210,20 @@ class Point2D:
     def __str__(self):
         return '({}, {})'.format(*self)
 
+    def _replace(self, **kwargs):
+        # Unlike namedtuple._replace(), keep an exact value type (e.g.
+        # Fraction).  Anything else (e.g. int) becomes float, so the
+        # results aren't truncated.
+        x = kwargs.pop('x', self.x)
+        y = kwargs.pop('y', self.y)
+        if kwargs:
+            raise ValueError('got unexpected fields {!r}'.format(list(kwargs)))
+        if isinstance(self.x, (Fraction, Decimal)):
+            valuetype = type(self.x)
+        else:
+            valuetype = float
+        return type(self)(x, y, valuetype)
+
     def _resolve_other(self, other):
         try:
             other_x, other_y = other
@@ -229,14 +300,18 @@ class Area:
     __slots__ = []
 
     @classmethod
-    def from_radius(cls, radius=None, center=None):
-        radius = float(radius) if radius else 1
+    def from_radius(cls, radius=None, center=None, valuetype=float):
+        radius = valuetype(radius) if radius else valuetype(1)
         if radius <= 0:
             raise ValueError('got non-positive radius')
-        xcenter, ycenter = Point2D.from_raw(center) or Point2D()
-
-        min = Point2D(xcenter - radius, ycenter - radius)
-        max = Point2D(xcenter + radius, ycenter + radius)
+        if isinstance(center, str):
+            # Parse it with valuetype, so no digits are lost.
+            center = Point2D.parse(center, valuetype)
+        center = Point2D.from_raw(center) or Point2D()
+        xcenter, ycenter = Point2D(*center, valuetype)
+
+        min = Point2D(xcenter - radius, ycenter - radius, valuetype)
+        max = Point2D(xcenter + radius, ycenter + radius, valuetype)
         return cls(min, max)
 
     @classmethod
@@ -246,11 +321,16 @@ class Area:
     def __new__(cls, p1, p2):
         p1 = Point2D.from_raw(p1)
         p2 = Point2D.from_raw(p2)
-        pmin = Point2D(min(p1.x, p2.x), min(p1.y, p2.y))
-        pmax = Point2D(max(p1.x, p2.x), max(p1.y, p2.y))
+        # The values were already coerced, so keep their type.
+        pmin = Point2D(min(p1.x, p2.x), min(p1.y, p2.y), None)
+        pmax = Point2D(max(p1.x, p2.x), max(p1.y, p2.y), None)
         self = super().__new__(cls, pmin, pmax)
         return self
 
     @property
     def delta(self):
         return self.max - self.min
+
+    @property
+    def center(self):
+        return (self.min + self.max) / 2
@@ -1,16 +1,109 @@
 
+import math
+
+
 MAX_DEPTH = 100
 MAX_ITER = range(MAX_DEPTH)
 
+# How close an orbit must come back to a checkpoint to count as a cycle.
+PERIOD_TOLERANCE = 1e-12
+# How many iterations before the first periodicity checkpoint is moved.
+PERIOD_SPAN = 8
+# The escape radius for smooth counts.  A bigger one means less error.
+SMOOTH_BAILOUT = 256.0
+# The same, for distance estimates.
+DISTANCE_BAILOUT = 1000.0
+
+
+def main_bulb_period(c):
+    """Return the period of C's orbit if C is in one of the main bulbs.
+
+    That is 1 for the main cardioid and 2 for the period-2 bulb.  Both
+    have a closed form, so no iteration is necessary.  If C is in
+    neither then return None.
+    """
+    x = c.real
+    ysq = c.imag * c.imag
+    # the main cardioid
+    q = (x - 0.25) * (x - 0.25) + ysq
+    if q * (q + (x - 0.25)) <= 0.25 * ysq:
+        return 1
+    # the period-2 bulb
+    if (x + 1) * (x + 1) + ysq <= 0.0625:
+        return 2
+    return None
+
+
+def in_main_bulbs(c):
+    """Return True if C is in the main cardioid or the period-2 bulb.
+
+    Together those cover most of the Mandelbrot set's interior.
+    """
+    return main_bulb_period(c) is not None
+
+
+def iter_periods(candidates, maxiter=MAX_ITER, _abs=abs, *,
+                 bulbs=False, tolerance=PERIOD_TOLERANCE):
+    """Yield (C, num iterations, period) for each candidate.
+
+    This is like iter_mandelbrot() except the orbit is also checked for
+    a cycle, using Brent-style checkpoints.  Once the orbit comes back
+    to within "tolerance" of the last checkpoint, C is in the set and
+    there is no need to keep iterating.  "period" is the length of that
+    cycle (possibly a multiple of the actual period).  If C escapes or
+    no cycle was found before "maxiter" then "period" is None.
+    """
+    if not hasattr(maxiter, '__iter__'):
+        maxiter = range(maxiter) if maxiter else MAX_ITER
+    for c in candidates:
+        if bulbs:
+            period = main_bulb_period(c)
+            if period is not None:
+                yield c, None, period
+                continue
+        x = checkpoint = 0
+        steps = 0
+        span = PERIOD_SPAN
+        for i in maxiter:
+            x = x*x + c
+            if _abs(x) > 2:
+                yield c, i, None
+                break
+            steps += 1
+            if _abs(x - checkpoint) <= tolerance:
+                # in the set!
+                yield c, None, steps
+                break
+            if steps == span:
+                checkpoint = x
+                steps = 0
+                span *= 2
+        else:
+            # in the set (but no cycle found)!
+            yield c, None, None
+
 
-def iter_mandelbrot(candidates, maxiter=MAX_ITER, _abs=abs):
+def iter_mandelbrot(candidates, maxiter=MAX_ITER, _abs=abs, *,
+                    bulbs=False, periodicity=False):
     """Yield (C, num iterations) for each candidate complex number.
 
     If C is in the Mandelbrot set then "num iterations" will be None.
+    If "bulbs" is true then candidates in the main cardioid or the
+    period-2 bulb are identified without iterating.  If "periodicity"
+    is true then orbits that settle into a cycle stop early (see
+    iter_periods()).
     """
+    if periodicity:
+        for c, i, _ in iter_periods(candidates, maxiter, _abs, bulbs=bulbs):
+            yield c, i
+        return
+
     if not hasattr(maxiter, '__iter__'):
         maxiter = range(maxiter) if maxiter else MAX_ITER
     for c in candidates:
+        if bulbs and in_main_bulbs(c):
+            yield c, None
+            continue
         x = 0
         for i in maxiter:
             x = x*x + c
@@ -20,3 +113,115 @@ def iter_mandelbrot(candidates, maxiter=MAX_ITER, _abs=abs):
         else:
             # in the set!
             yield c, None
+
+
+def smooth_count(i, z, bailout=SMOOTH_BAILOUT):
+    """Return the fractional escape count for an orbit that escaped.
+
+    "i" is the iteration at which |Z| passed "bailout".  The result is
+    in [i, i + 1) and changes continuously with C, so colors based on
+    it have no bands.
+    """
+    return i + 1 - math.log2(math.log(abs(z)) / math.log(bailout))
+
+
+def iter_smooth(candidates, maxiter=MAX_ITER, _abs=abs, *,
+                bulbs=False, bailout=SMOOTH_BAILOUT):
+    """Yield (C, smooth count) for each candidate complex number.
+
+    This is like iter_mandelbrot() except that orbits run until |Z|
+    passes "bailout", rather than 2, and the count is fractional (see
+    smooth_count()).  That is all done in the one pass over the orbit.
+    Orbits that have not passed the bailout by "maxiter" get None.
+    """
+    if not hasattr(maxiter, '__iter__'):
+        maxiter = range(maxiter) if maxiter else MAX_ITER
+    for c in candidates:
+        if bulbs and in_main_bulbs(c):
+            yield c, None
+            continue
+        x = 0
+        for i in maxiter:
+            x = x*x + c
+            if _abs(x) > bailout:
+                yield c, smooth_count(i, x, bailout)
+                break
+        else:
+            # in the set!
+            yield c, None
+
+
+def iter_distances(candidates, maxiter=MAX_ITER, _abs=abs, *,
+                   bulbs=False, bailout=DISTANCE_BAILOUT):
+    """Yield (C, num iterations, distance) for each candidate.
+
+    The derivative dZ/dC is tracked next to Z, and once the orbit
+    escapes it is used to estimate how far C is from the set:
+
+      distance = |Z| * log|Z| / (2 * |dZ/dC|)
+
+    No point of the set is closer than that (give or take a little).
+    The count matches iter_mandelbrot().  After |Z| passes 2 the orbit
+    goes on to "bailout", to make the estimate more accurate.  The
+    distance of a candidate in the set is 0.
+    """
+    if not hasattr(maxiter, '__iter__'):
+        maxiter = range(maxiter) if maxiter else MAX_ITER
+    for c in candidates:
+        if bulbs and in_main_bulbs(c):
+            yield c, None, 0.0
+            continue
+        x = dx = 0
+        for i in maxiter:
+            dx = 2*x*dx + 1
+            x = x*x + c
+            if _abs(x) > 2:
+                break
+        else:
+            # in the set!
+            yield c, None, 0.0
+            continue
+        size = _abs(x)
+        while size <= bailout:
+            dx = 2*x*dx + 1
+            x = x*x + c
+            size = _abs(x)
+        distance = size * math.log(size) / (2 * _abs(dx))
+        if math.isnan(distance):
+            # dZ/dC overflowed, so C is right next to the set.
+            distance = 0.0
+        yield c, i, distance
+
+
+def iter_orbits(orbits, maxiter=MAX_ITER, _abs=abs, *, start=0):
+    """Yield (C, num iterations, Z) for each (C, Z) orbit, resumed.
+
+    Each orbit picks up from its Z as of iteration "start" and goes on
+    until it escapes or reaches "maxiter".  The yielded Z is where it
+    stopped, so orbits still in the set (None) can be resumed again
+    later with a higher "maxiter".  Starting from (C, 0) at 0 gives the
+    same counts as iter_mandelbrot().
+    """
+    if hasattr(maxiter, '__iter__'):
+        maxiter = len(maxiter)
+    elif not maxiter:
+        maxiter = MAX_DEPTH
+    for c, z in orbits:
+        for i in range(start, maxiter):
+            z = z*z + c
+            if _abs(z) > 2:
+                yield c, i, z
+                break
+        else:
+            # in the set (so far)!
+            yield c, None, z
+
+
+def iter_mandelbrot_batches(batches, maxiter=MAX_ITER, **kwargs):
+    """Yield the list of (C, num iterations) for each batch of candidates.
+
+    This is the batched equivalent of iter_mandelbrot(), e.g. for the
+    batches from imaginary.iter_batches().
+    """
+    for batch in batches:
+        yield list(iter_mandelbrot(batch, maxiter, **kwargs))
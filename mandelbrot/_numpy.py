@@ -0,0 +1,307 @@
+from array import array
+
+import numpy
+
+from ._mandelbrot import (
+        DISTANCE_BAILOUT, MAX_DEPTH, PERIOD_TOLERANCE, PERIOD_SPAN,
+        SMOOTH_BAILOUT)
+from ._raster import (
+        IterationRaster, SMOOTH_TYPECODE, sentinel_for, typecode_for)
+
+
+def _resolve_maxiter(maxiter):
+    if not hasattr(maxiter, '__iter__'):
+        maxiter = range(maxiter) if maxiter else range(MAX_DEPTH)
+    return len(maxiter)
+
+
+def _axis(steps, start, end):
+    # This matches Steps.iter_floats() exactly, float for float.
+    if not steps:
+        return numpy.array([start], dtype=float)
+    factor = (end - start) / steps
+    axis = start + factor * numpy.arange(len(steps), dtype=float)
+    axis[-1] = end
+    return axis
+
+
+def complex_plane(area, grid, rows=None):
+    """Return the 2D array of candidates for the area, in raster order.
+
+    Rows run top-down and columns left-to-right, like
+    imaginary.iter_raster().  If "rows" (a range of row indices) is
+    provided then only those rows are included.
+    """
+    xs = _axis(grid.width, area.min.x, area.max.x)
+    ys = _axis(grid.height, area.max.y, area.min.y)
+    if rows is not None:
+        ys = ys[rows.start:rows.stop]
+    plane = numpy.empty((len(ys), len(xs)), dtype=complex)
+    plane.real = xs
+    plane.imag = ys[:, numpy.newaxis]
+    return plane
+
+
+def main_bulb_periods(candidates):
+    """Return the period for each candidate in one of the main bulbs.
+
+    Candidates in neither bulb get 0.  See
+    _mandelbrot.main_bulb_period().
+    """
+    x = candidates.real
+    ysq = candidates.imag * candidates.imag
+    q = (x - 0.25) * (x - 0.25) + ysq
+    cardioid = q * (q + (x - 0.25)) <= 0.25 * ysq
+    bulb = (x + 1) * (x + 1) + ysq <= 0.0625
+    return numpy.where(cardioid, 1, numpy.where(bulb, 2, 0))
+
+
+def in_main_bulbs(candidates):
+    """Return a boolean array marking the candidates in the main bulbs.
+
+    See _mandelbrot.in_main_bulbs().
+    """
+    return main_bulb_periods(candidates) > 0
+
+
+def escape_counts(candidates, maxiter=None, *,
+                  bulbs=False, periodicity=False, periods=None,
+                  orbits=None, start=0):
+    """Return an array with the number of iterations for each candidate.
+
+    The result has the same shape as the candidates.  Candidates in the
+    Mandelbrot set get -1.  Otherwise the counts match the ones from
+    _mandelbrot.iter_mandelbrot(), which also describes "bulbs" and
+    "periodicity".  If an integer array is passed as "periods" then it
+    is filled in with the period found for each candidate, or 0.
+
+    If a complex array is passed as "orbits" then each orbit resumes
+    from it, as of iteration "start", like _mandelbrot.iter_orbits().
+    Afterward it holds the last Z of each candidate still in the set.
+    """
+    maxiter = _resolve_maxiter(maxiter)
+    if orbits is not None and periodicity:
+        raise ValueError('periodicity is not supported with orbits')
+    candidates = numpy.asarray(candidates, dtype=complex)
+    counts = numpy.full(candidates.shape, -1, dtype=numpy.intp)
+    found = counts.reshape(-1)
+    if periods is not None:
+        periods[...] = 0
+        periods = periods.reshape(-1)
+
+    # Only the live (not yet escaped) candidates are iterated.  Each
+    # time some escape, the live arrays are compacted.
+    c = candidates.reshape(-1)
+    if bulbs:
+        bulbperiods = main_bulb_periods(c)
+        if periods is not None:
+            periods[:] = bulbperiods
+        index = numpy.flatnonzero(bulbperiods == 0)
+        c = c[index]
+    else:
+        index = numpy.arange(c.size)
+    if orbits is not None:
+        zs = orbits.reshape(-1)
+        z = zs[index]
+    else:
+        z = numpy.zeros_like(c)
+    if periodicity:
+        # All live candidates share the same checkpoint schedule.
+        checkpoint = numpy.zeros_like(c)
+        steps = 0
+        span = PERIOD_SPAN
+    for i in range(start, maxiter):
+        numpy.multiply(z, z, out=z)
+        z += c
+        done = escaped = numpy.abs(z) > 2
+        if periodicity:
+            steps += 1
+            cycled = numpy.abs(z - checkpoint) <= PERIOD_TOLERANCE
+            cycled &= ~escaped
+            if cycled.any():
+                if periods is not None:
+                    periods[index[cycled]] = steps
+                done = escaped | cycled
+            if steps == span:
+                checkpoint = z.copy()
+                steps = 0
+                span *= 2
+        if not done.any():
+            continue
+        found[index[escaped]] = i
+        live = ~done
+        index = index[live]
+        if not index.size:
+            break
+        c = c[live]
+        z = z[live]
+        if periodicity:
+            checkpoint = checkpoint[live]
+    if orbits is not None and index.size:
+        zs[index] = z
+    return counts
+
+
+def smooth_counts(candidates, maxiter=None, *,
+                  bulbs=False, bailout=SMOOTH_BAILOUT):
+    """Return a float32 array with the smooth count for each candidate.
+
+    This is the vectorized equivalent of _mandelbrot.iter_smooth().
+    Candidates in the set get -1.
+    """
+    maxiter = _resolve_maxiter(maxiter)
+    candidates = numpy.asarray(candidates, dtype=complex)
+    counts = numpy.full(candidates.shape, -1, dtype=numpy.float32)
+    found = counts.reshape(-1)
+
+    c = candidates.reshape(-1)
+    if bulbs:
+        index = numpy.flatnonzero(main_bulb_periods(c) == 0)
+        c = c[index]
+    else:
+        index = numpy.arange(c.size)
+    z = numpy.zeros_like(c)
+    logbailout = numpy.log(bailout)
+    for i in range(maxiter):
+        numpy.multiply(z, z, out=z)
+        z += c
+        size = numpy.abs(z)
+        escaped = size > bailout
+        if not escaped.any():
+            continue
+        found[index[escaped]] = (
+                i + 1 - numpy.log2(numpy.log(size[escaped]) / logbailout))
+        live = ~escaped
+        index = index[live]
+        if not index.size:
+            break
+        c = c[live]
+        z = z[live]
+    return counts
+
+
+def distance_estimates(candidates, maxiter=None, *,
+                       bulbs=False, bailout=DISTANCE_BAILOUT):
+    """Return arrays of the count and distance for each candidate.
+
+    This is the vectorized equivalent of _mandelbrot.iter_distances().
+    Like escape_counts(), candidates in the set get a count of -1.
+    Their distance is 0.
+    """
+    maxiter = _resolve_maxiter(maxiter)
+    candidates = numpy.asarray(candidates, dtype=complex)
+    counts = numpy.full(candidates.shape, -1, dtype=numpy.intp)
+    distances = numpy.zeros(candidates.shape)
+    found = counts.reshape(-1)
+    estimated = distances.reshape(-1)
+
+    c = candidates.reshape(-1)
+    if bulbs:
+        index = numpy.flatnonzero(main_bulb_periods(c) == 0)
+        c = c[index]
+    else:
+        index = numpy.arange(c.size)
+    z = numpy.zeros_like(c)
+    dz = numpy.zeros_like(c)
+    # Escaped orbits keep going until the bailout.
+    escaped = numpy.zeros(c.size, dtype=bool)
+    i = 0
+    with numpy.errstate(over='ignore', invalid='ignore'):
+        while index.size:
+            if i == maxiter:
+                # The rest are in the set.
+                index = index[escaped]
+                c = c[escaped]
+                z = z[escaped]
+                dz = dz[escaped]
+                escaped = escaped[escaped]
+                if not index.size:
+                    break
+            dz = 2 * z * dz + 1
+            z = z * z + c
+            size = numpy.abs(z)
+            if i < maxiter:
+                new = (size > 2) & ~escaped
+                found[index[new]] = i
+                escaped |= new
+            i += 1
+            # NaN (after an overflow) counts as done.
+            done = ~(size <= bailout)
+            if not done.any():
+                continue
+            size = size[done]
+            distance = size * numpy.log(size) / (2 * numpy.abs(dz[done]))
+            # dZ/dC overflowed, so C is right next to the set.
+            distance[numpy.isnan(distance)] = 0
+            estimated[index[done]] = distance
+            live = ~done
+            index = index[live]
+            c = c[live]
+            z = z[live]
+            dz = dz[live]
+            escaped = escaped[live]
+    return counts, distances
+
+
+def _iter_pairs(candidates, counts):
+    counts = counts.reshape(-1)
+    values = counts.astype(object)
+    values[counts < 0] = None
+    return zip(candidates.reshape(-1).tolist(), values.tolist())
+
+
+def to_raster(area, grid, counts, maxiter=None):
+    """Return the IterationRaster for the counts from escape_counts()."""
+    typecode = typecode_for(_resolve_maxiter(maxiter))
+    raw = numpy.where(counts < 0, sentinel_for(typecode), counts)
+    buffer = array(typecode)
+    buffer.frombytes(raw.astype(numpy.dtype(typecode)).tobytes())
+    return IterationRaster(area, grid, buffer)
+
+
+def iter_mandelbrot(candidates, maxiter=None, **kwargs):
+    """Yield (C, num iterations) for each candidate complex number.
+
+    This is the vectorized equivalent of _mandelbrot.iter_mandelbrot().
+    The candidates may also be an array, which is used as-is.
+    """
+    if isinstance(candidates, numpy.ndarray):
+        candidates = candidates.astype(complex, copy=False)
+    else:
+        candidates = numpy.fromiter(candidates, dtype=complex)
+    counts = escape_counts(candidates, maxiter, **kwargs)
+    return _iter_pairs(candidates, counts)
+
+
+def to_smooth_raster(area, grid, counts):
+    """Return the IterationRaster for the counts from smooth_counts()."""
+    buffer = array(SMOOTH_TYPECODE)
+    buffer.frombytes(counts.astype(numpy.float32).tobytes())
+    return IterationRaster(area, grid, buffer)
+
+
+def iter_mandelbrot_batches(batches, maxiter=None, **kwargs):
+    """Yield the list of (C, num iterations) for each batch of candidates.
+
+    This is the vectorized equivalent of
+    _mandelbrot.iter_mandelbrot_batches().  Each batch is iterated as
+    one array.
+    """
+    for batch in batches:
+        candidates = numpy.asarray(batch, dtype=complex)
+        counts = escape_counts(candidates, maxiter, **kwargs)
+        yield list(_iter_pairs(candidates, counts))
+
+
+def iter_raster(area, grid, maxiter=None, **kwargs):
+    """Return the IterationRaster for the grid."""
+    candidates = complex_plane(area, grid)
+    counts = escape_counts(candidates, maxiter, **kwargs)
+    return to_raster(area, grid, counts, maxiter)
+
+
+def iter_smooth_raster(area, grid, maxiter=None, **kwargs):
+    """Return the float32 IterationRaster of smooth counts for the grid."""
+    candidates = complex_plane(area, grid)
+    counts = smooth_counts(candidates, maxiter, **kwargs)
+    return to_smooth_raster(area, grid, counts)
@@ -0,0 +1,52 @@
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import itertools
+
+from . import imaginary
+from ._mandelbrot import iter_mandelbrot
+
+
+ROWS_PER_CHUNK = 16
+
+
+def iter_bands(grid, rows=None):
+    """Yield the range of row indices for each band of the grid.
+
+    The bands are yielded top-down, which is the order of the raster.
+    """
+    rows = int(rows) if rows else ROWS_PER_CHUNK
+    if rows < 0:
+        raise ValueError('got negative rows per chunk')
+    total = len(grid.height)
+    for start in range(0, total, rows):
+        yield range(start, min(start + rows, total))
+
+
+def _render_band(area, grid, maxiter, rows, *, numpy=False, **kwargs):
+    if numpy:
+        from . import _numpy
+        plane = _numpy.complex_plane(area, grid, rows)
+        counts = _numpy.escape_counts(plane, maxiter, **kwargs)
+        return [i if i >= 0 else None for i in counts.reshape(-1).tolist()]
+
+    xs, ys = grid.axes(area.min.x, area.max.x, area.max.y, area.min.y)
+    ys = ys[rows.start:rows.stop]
+    candidates = (a + b * 1j for b in ys for a in xs)
+    return [i for _, i in iter_mandelbrot(candidates, maxiter, **kwargs)]
+
+
+def iter_raster(area, grid, maxiter=None, *,
+                workers=None, rows=None, numpy=False, **kwargs):
+    """Yield (C, num iterations) for each point of the grid, in order.
+
+    The grid is split into bands of rows, which are computed in
+    parallel by a pool of worker processes.  Any extra keyword arguments
+    are passed through to the engine.
+    """
+    bands = iter_bands(grid, rows)
+    render = functools.partial(_render_band, area, grid, maxiter,
+                               numpy=numpy, **kwargs)
+    with ProcessPoolExecutor(workers) as executor:
+        # The results come back in the order the bands were submitted.
+        counts = itertools.chain.from_iterable(executor.map(render, bands))
+        yield from zip(imaginary.iter_raster(area, grid), counts)
@@ -0,0 +1,109 @@
+import math
+
+import numpy
+
+from ._fixed import from_fixed, iter_orbit, to_fixed
+from ._numpy import _axis, _resolve_maxiter, to_raster
+
+
+# Extra digits of precision for the reference orbit, beyond the pixel size.
+GUARD_DIGITS = 10
+
+
+def precision_for(area, grid):
+    """Return the number of digits needed to tell the pixels apart."""
+    sizes = [float(delta / steps)
+             for delta, steps in zip(area.delta, (grid.width, grid.height))
+             if steps]
+    pixel = min(sizes, default=0)
+    if pixel <= 0:
+        raise ValueError('got empty area')
+    return max(17, GUARD_DIGITS - math.floor(math.log10(pixel)))
+
+
+def reference_orbit(center, maxiter, precision):
+    """Return the orbit of the center, as an array of complex numbers.
+
+    The orbit is computed in fixed point (see _fixed.iter_orbit()), to
+    "precision" digits, and then each value is rounded to a complex.  It
+    starts with 0 and stops after "maxiter" iterations or once it
+    escapes.
+    """
+    bits = math.ceil(precision * math.log2(10))
+    cx = to_fixed(center.x, bits)
+    cy = to_fixed(center.y, bits)
+    orbit = [0j]
+    for x, y in iter_orbit(cx, cy, maxiter, bits):
+        orbit.append(complex(from_fixed(x, bits), from_fixed(y, bits)))
+    return numpy.array(orbit)
+
+
+def escape_counts(area, grid, maxiter=None):
+    """Return the 2D array of iteration counts for the grid.
+
+    Only the orbit of the center of the area is computed at high
+    precision.  Every pixel then iterates just its (low precision)
+    offset from that reference orbit:
+
+      dz' = 2*Z*dz + dz*dz + dc
+
+    Whenever the pixel's orbit gets closer to 0 than its offset (where
+    precision would be lost, i.e. a glitch) or the reference orbit runs
+    out, the pixel is rebased onto the start of the reference orbit.
+
+    Like _numpy.escape_counts(), candidates in the set get -1.
+    """
+    maxiter = _resolve_maxiter(maxiter)
+    center = area.center
+    orbit = reference_orbit(center, maxiter, precision_for(area, grid))
+    last = len(orbit) - 1
+
+    # The offsets are small, so floats are fine for them.
+    dxs = _axis(grid.width, float(area.min.x - center.x),
+                float(area.max.x - center.x))
+    dys = _axis(grid.height, float(area.max.y - center.y),
+                float(area.min.y - center.y))
+    dc = numpy.empty((len(dys), len(dxs)), dtype=complex)
+    dc.real = dxs
+    dc.imag = dys[:, numpy.newaxis]
+
+    counts = numpy.full(dc.shape, -1, dtype=numpy.intp)
+    found = counts.reshape(-1)
+    index = numpy.arange(dc.size)
+    dc = dc.reshape(-1)
+    dz = numpy.zeros_like(dc)
+    ref = numpy.zeros(dc.size, dtype=numpy.intp)
+    for i in range(maxiter):
+        dz = (2 * orbit[ref] + dz) * dz + dc
+        ref += 1
+        z = orbit[ref] + dz
+        size = numpy.abs(z)
+        escaped = size > 2
+        if escaped.any():
+            found[index[escaped]] = i
+            live = ~escaped
+            index = index[live]
+            if not index.size:
+                break
+            dc = dc[live]
+            dz = dz[live]
+            ref = ref[live]
+            z = z[live]
+            size = size[live]
+
+        rebase = (size < numpy.abs(dz)) | (ref == last)
+        if rebase.any():
+            dz[rebase] = z[rebase]
+            ref[rebase] = 0
+    return counts
+
+
+def iter_raster(area, grid, maxiter=None):
+    """Return the IterationRaster for the grid.
+
+    This works for areas far smaller than floats can resolve, as long
+    as the area's values are precise enough (e.g. Fraction).  The
+    candidates it yields are only as precise as a complex.
+    """
+    counts = escape_counts(area, grid, maxiter)
+    return to_raster(area, grid, counts, maxiter)
@@ -0,0 +1,186 @@
+from array import array
+
+from . import imaginary
+from ._geometry import Area, Point2D
+from ._mandelbrot import MAX_DEPTH, iter_mandelbrot
+
+
+# The counts are stored as unsigned ints, with the max meaning "in set".
+TYPECODES = ('H', 'I', 'Q')
+# Smooth (fractional) counts are stored as float32, with -1 for "in set".
+SMOOTH_TYPECODE = 'f'
+
+_UNKNOWN = object()
+
+
+def typecode_for(maxiter=None):
+    """Return the smallest typecode that can hold counts up to maxiter."""
+    maxiter = maxiter or MAX_DEPTH
+    for typecode in TYPECODES:
+        if maxiter < sentinel_for(typecode):
+            return typecode
+    raise ValueError('maxiter too big ({})'.format(maxiter))
+
+
+def sentinel_for(typecode):
+    """Return the count that means "in set" for the typecode."""
+    if typecode == SMOOTH_TYPECODE:
+        return -1.0
+    return 2 ** (8 * array(typecode).itemsize) - 1
+
+
+class IterationRaster:
+    """The iteration counts for every point of a grid over an area.
+
+    The counts are kept in one contiguous buffer of unsigned ints (e.g.
+    array('H')), in raster order, with "sentinel" in place of None for
+    points in the set.  Smooth (fractional) counts are kept as float32
+    (SMOOTH_TYPECODE) instead.  The raw counts can be read without copying,
+    through "counts", row(), or memoryview(raster) (Python 3.12+).
+
+    Iterating over a raster yields (C, num iterations) for each point,
+    just like any other iter_raster() result, so engines may return one
+    as-is.
+    """
+
+    __slots__ = ('_area', '_grid', '_counts', '_sentinel')
+
+    @classmethod
+    def from_values(cls, area, grid, values, maxiter=None, typecode=None):
+        """Return a raster for the (C, num iterations) values."""
+        if isinstance(values, IterationRaster):
+            return values
+        return cls.from_counts(area, grid, (i for _, i in values), maxiter,
+                               typecode)
+
+    @classmethod
+    def from_counts(cls, area, grid, counts, maxiter=None, typecode=None):
+        """Return a raster for the counts (None means "in set").
+
+        By default the typecode is the smallest that fits "maxiter".
+        """
+        if typecode is None:
+            typecode = typecode_for(maxiter)
+        sentinel = sentinel_for(typecode)
+        counts = array(typecode, (sentinel if i is None else i
+                                  for i in counts))
+        return cls(area, grid, counts)
+
+    def __init__(self, area, grid, counts):
+        view = memoryview(counts)
+        if view.format not in TYPECODES + (SMOOTH_TYPECODE,):
+            raise ValueError('expected a buffer of unsigned ints or float32')
+        if not view.contiguous:
+            raise ValueError('expected a contiguous buffer')
+        if len(view) != len(grid):
+            raise ValueError('expected {} counts, got {}'
+                             .format(len(grid), len(view)))
+        self._area = area
+        self._grid = grid
+        self._counts = counts
+        self._sentinel = sentinel_for(view.format)
+
+    def __repr__(self):
+        return '{}({!r}, {!r}, <{} counts>)'.format(
+                type(self).__name__, self._area, self._grid, len(self))
+
+    def __len__(self):
+        return len(self._grid)
+
+    def __iter__(self):
+        # The candidates are only informational, so floats will do.
+        area = Area(Point2D(*self._area.min), Point2D(*self._area.max))
+        return zip(imaginary.iter_raster(area, self._grid), self.iter_counts())
+
+    def __buffer__(self, flags):
+        return memoryview(self._counts)
+
+    @property
+    def area(self):
+        return self._area
+
+    @property
+    def grid(self):
+        return self._grid
+
+    @property
+    def counts(self):
+        """The raw counts, with "sentinel" for points in the set."""
+        return self._counts
+
+    @property
+    def typecode(self):
+        return memoryview(self._counts).format
+
+    @property
+    def smooth(self):
+        return self.typecode == SMOOTH_TYPECODE
+
+    @property
+    def sentinel(self):
+        return self._sentinel
+
+    def row(self, j):
+        """Return a memoryview of the raw counts in row j (0 is the top)."""
+        if j not in self._grid.height:
+            raise IndexError(j)
+        width = len(self._grid.width)
+        return memoryview(self._counts)[j * width:(j + 1) * width]
+
+    def iter_rows(self):
+        for j in self._grid.height:
+            yield self.row(j)
+
+    def iter_counts(self):
+        """Yield the count for each point, or None if in the set."""
+        sentinel = self._sentinel
+        for i in self._counts:
+            yield None if i == sentinel else i
+
+
+class _PointEngine:
+    """The counts of a grid's points, for engines that only iterate some.
+
+    "counts" has the count of each point, in raster order, with _UNKNOWN
+    until the point is computed (see compute()) or filled in.  Points
+    are iterated with "numpy" or not, and any extra keyword arguments
+    are passed through to the engine.
+    """
+
+    def __init__(self, area, grid, maxiter=None, *, numpy=False, **kwargs):
+        if numpy:
+            from ._numpy import iter_mandelbrot as engine
+        else:
+            engine = iter_mandelbrot
+        self._area = area
+        self._grid = grid
+        self._maxiter = maxiter
+        self._engine = engine
+        self._kwargs = kwargs
+        self.xs, self.ys = grid.axes(area.min.x, area.max.x,
+                                     area.max.y, area.min.y)
+        self.counts = [_UNKNOWN] * len(grid)
+        self.computed = 0
+
+    def compute(self, pixels):
+        """Iterate each of the pixels (flat indices) that isn't known yet."""
+        counts = self.counts
+        xs, ys = self.xs, self.ys
+        width = len(xs)
+        pixels = [p for p in dict.fromkeys(pixels) if counts[p] is _UNKNOWN]
+        candidates = [xs[p % width] + ys[p // width] * 1j for p in pixels]
+        values = self._engine(candidates, self._maxiter, **self._kwargs)
+        for p, (_, i) in zip(pixels, values):
+            counts[p] = i
+        self.computed += len(pixels)
+
+    def to_raster(self, stats=None):
+        """Return the IterationRaster, once every count is known.
+
+        If a dict is passed as "stats" then the number of pixels that
+        were actually iterated is stored there under "computed".
+        """
+        if stats is not None:
+            stats['computed'] = self.computed
+        return IterationRaster.from_counts(self._area, self._grid,
+                                           self.counts, self._maxiter)
@@ -0,0 +1,64 @@
+from ._raster import IterationRaster
+from ._viewport import _match
+
+
+def mirrored_rows(area, grid):
+    """Return {row: mirror row} for the rows that need not be computed.
+
+    The Mandelbrot set is symmetric about the real axis, so the row at
+    -y has the same counts as the row at y.  Each row below the axis
+    whose mirror is also in the grid is mapped to that mirror.  Rows are
+    indexed top-down.
+    """
+    ys = grid.height.floats(area.max.y, area.min.y)
+    mirrors = _match([-y for y in ys], ys)
+    # A row on the axis (maybe a hair off it) is its own mirror, so it
+    # must still be computed.
+    return {j: k for j, k in enumerate(mirrors)
+            if k is not None and k != j and ys[j] < 0 < ys[k]}
+
+
+def _iter_bands(grid, skipped):
+    """Yield the range of each run of rows that are not skipped."""
+    start = None
+    for j in grid.height:
+        if j in skipped:
+            if start is not None:
+                yield range(start, j)
+                start = None
+        elif start is None:
+            start = j
+    if start is not None:
+        yield range(start, len(grid.height))
+
+
+def symmetric(iter_raster):
+    """Return a wrapper around iter_raster() that mirrors rows.
+
+    Only the rows without a mirror (see mirrored_rows()) are computed,
+    in a band above the real axis and maybe one at the bottom.  The
+    rest are copied into the returned IterationRaster.  Views that
+    don't cross the real axis are passed straight through.
+    """
+    def iter_symmetric(area, grid, maxiter):
+        mirrors = mirrored_rows(area, grid)
+        if not mirrors:
+            return iter_raster(area, grid, maxiter)
+
+        width = len(grid.width)
+        counts = [None] * len(grid)
+        typecode = None
+        for rows in _iter_bands(grid, mirrors):
+            subarea, subgrid = grid.subarea(area, range(width), rows)
+            values = iter_raster(subarea, subgrid, maxiter)
+            if isinstance(values, IterationRaster):
+                # Keep smooth counts smooth.
+                typecode = values.typecode
+            start = rows.start * width
+            counts[start:start + len(subgrid)] = [i for _, i in values]
+        for j, k in mirrors.items():
+            row = counts[k * width:(k + 1) * width]
+            counts[j * width:(j + 1) * width] = row
+        return IterationRaster.from_counts(area, grid, counts, maxiter,
+                                           typecode)
+    return iter_symmetric
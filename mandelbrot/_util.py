@@ -1,4 +1,5 @@
 
+from array import array
 from collections import namedtuple
 import functools
 
@@ -16,6 +17,8 @@ def as_namedtuple(cls, fields=None):
 
     nt = namedtuple(cls.__name__, fields)
     ns = {'__doc__': cls.__doc__,
+          '__module__': cls.__module__,
+          '__qualname__': cls.__qualname__,
           '__slots__': (),
           }
     if cls.__init__ is not object.__init__:
@@ -109,7 +112,26 @@ class Steps(int):
 
     def iter_floats(self, start, end):
         # XXX Adjust for float precision quirks?
+        if not self:
+            # There is only the one point.
+            yield start
+            return
         factor = (end - start) / self
         for i in range(self):
             yield start + factor * i
         yield end
+
+    def floats(self, start, end):
+        """Return the values from iter_floats() as an array('d').
+
+        Like linspace(), both endpoints are exact.
+        """
+        return array('d', map(float, self.iter_floats(start, end)))
+
+    def float_at(self, start, end, index):
+        """Return the value at the index, exactly as iter_floats() would."""
+        if not self:
+            return start
+        if index == self:
+            return end
+        return start + (end - start) / self * index
@@ -0,0 +1,113 @@
+from collections import deque
+
+from ._mandelbrot import iter_mandelbrot
+
+
+# The most views a ViewportStore keeps.
+MAX_VIEWS = 4
+# How close (in pixels) two coordinates must be to be the same sample.
+TOLERANCE = 1e-6
+
+_UNKNOWN = object()
+
+
+def _match(new, old):
+    """Return the index into "old" of each value in "new", or None.
+
+    Both are evenly spaced axes, as from Steps.iter_floats().  A value
+    matches if it is the same sample, up to float rounding.
+    """
+    if len(old) < 2:
+        return [None] * len(new)
+    start = old[0]
+    step = (old[-1] - start) / (len(old) - 1)
+    if not step:
+        return [None] * len(new)
+    indices = []
+    for value in new:
+        pos = (value - start) / step
+        index = round(pos)
+        if 0 <= index < len(old) and abs(pos - index) <= TOLERANCE:
+            indices.append(index)
+        else:
+            indices.append(None)
+    return indices
+
+
+class _View:
+
+    __slots__ = ('xs', 'ys', 'maxiter', 'counts')
+
+    def __init__(self, xs, ys, maxiter, counts):
+        self.xs = xs
+        self.ys = ys
+        self.maxiter = maxiter
+        self.counts = counts
+
+
+class ViewportStore:
+    """Keeps recent rasters so that overlapping views can reuse them.
+
+    When a new view is rendered, each of its points that is also a
+    sample of a kept view (e.g. after panning by a few pixels or zooming
+    by an integer factor) is copied across.  Only the rest is computed.
+    """
+
+    def __init__(self, maxviews=MAX_VIEWS, *, numpy=False, **kwargs):
+        if maxviews < 1:
+            raise ValueError('got non-positive maxviews')
+        if numpy:
+            from ._numpy import iter_mandelbrot as engine
+        else:
+            engine = iter_mandelbrot
+        self._engine = engine
+        self._kwargs = kwargs
+        self._views = deque(maxlen=maxviews)
+        self.reused = self.computed = 0
+
+    def __len__(self):
+        return len(self._views)
+
+    def clear(self):
+        self._views.clear()
+
+    def iter_raster(self, area, grid, maxiter=None):
+        """Yield (C, num iterations) for each point of the grid, in order.
+
+        Afterward, "reused" and "computed" hold how many points were
+        copied from earlier views and how many were iterated.
+        """
+        xs, ys = grid.axes(area.min.x, area.max.x, area.max.y, area.min.y)
+        width = len(xs)
+        counts = [_UNKNOWN] * (width * len(ys))
+
+        # The most recent views are checked first.
+        for view in reversed(self._views):
+            if view.maxiter != maxiter:
+                continue
+            columns = [(i, oldi)
+                       for i, oldi in enumerate(_match(xs, view.xs))
+                       if oldi is not None]
+            if not columns:
+                continue
+            oldwidth = len(view.xs)
+            for j, oldj in enumerate(_match(ys, view.ys)):
+                if oldj is None:
+                    continue
+                row = j * width
+                oldrow = oldj * oldwidth
+                for i, oldi in columns:
+                    if counts[row + i] is _UNKNOWN:
+                        counts[row + i] = view.counts[oldrow + oldi]
+
+        missing = [p for p, i in enumerate(counts) if i is _UNKNOWN]
+        candidates = [xs[p % width] + ys[p // width] * 1j for p in missing]
+        results = self._engine(candidates, maxiter, **self._kwargs)
+        for p, (_, i) in zip(missing, results):
+            counts[p] = i
+
+        self._views.append(_View(xs, ys, maxiter, counts))
+        self.computed = len(missing)
+        self.reused = len(counts) - len(missing)
+        candidates = (a + b * 1j for b in ys for a in xs)
+        return zip(candidates, counts)
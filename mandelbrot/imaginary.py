@@ -1,9 +1,26 @@
 
+# How many rows go in each batch of candidates, by default.
+ROWS_PER_BATCH = 16
+
 
 def iter_raster(area, grid):
-    coords = grid.iter_floats(area.min.x, area.max.x, area.max.y, area.min.y)
-    for a, b in coords:
-        yield a + b * 1j
+    xs, ys = grid.axes(area.min.x, area.max.x, area.max.y, area.min.y)
+    for b in ys:
+        for a in xs:
+            yield a + b * 1j
+
+
+def iter_batches(area, grid, rows=None):
+    """Yield the list of candidates for each band of rows, in order.
+
+    Together the batches hold the same candidates as iter_raster(), but
+    only one band's worth is in memory at a time.
+    """
+    rows = int(rows) if rows else ROWS_PER_BATCH
+    bands = grid.iter_rows(area.min.x, area.max.x, area.max.y, area.min.y,
+                           rows)
+    for xs, ys in bands:
+        yield [a + b * 1j for b in ys for a in xs]
 
 
 #def iter_area(min=MIN, max=MAX, scalea=SCALE, scaleb=None):
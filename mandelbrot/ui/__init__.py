@@ -1,6 +1,14 @@
 
 
-def start(kind, opts, area, grid, scale, iter_raster):
+def start(kind, opts, area, grid, scale, iter_raster, iter_points=None,
+          sampler=None, numpy=False):
+    """Run the UI for the view.
+
+    "iter_points" iterates any candidates (see
+    _engines.resolve_point_engine()) and "sampler" is iter_raster()
+    without any cache.  They, and "numpy", are optional and only used
+    where they help (e.g. to anti-alias).
+    """
     kwargs = {}
     if kind == 'text':
         if 'flat' in opts:
@@ -8,7 +16,24 @@ def start(kind, opts, area, grid, scale, iter_raster):
         from ._text import render as start
     elif kind == 'tk':
         kwargs['static'] = True
+        if 'progressive' in opts:
+            kwargs['progressive'] = True
+            kwargs['iter_points'] = iter_points
+        if 'antialias' in opts:
+            kwargs['antialias'] = True
+            kwargs['sampler'] = sampler
+            kwargs['iter_points'] = iter_points
+            kwargs['numpy'] = numpy
         from ._tk import ui as start
+    elif kind == 'ppm':
+        if opts and opts[0]:
+            kwargs['filename'] = opts[0]
+        if opts and 'antialias' in opts[1:]:
+            kwargs['antialias'] = True
+            kwargs['sampler'] = sampler
+            kwargs['iter_points'] = iter_points
+            kwargs['numpy'] = numpy
+        from ._ppm import render as start
     else:
         raise ValueError('unsupported UI {!r}'.format(kind))
     return start(iter_raster, area, grid, scale, **kwargs)
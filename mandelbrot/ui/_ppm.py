@@ -0,0 +1,228 @@
+import sys
+
+from mandelbrot._antialias import Supersamples, find_edges, supersample
+from mandelbrot._raster import IterationRaster
+
+
+# The palette has one color per count, up to the max, plus one for "in set".
+MAX_COUNT = 255
+IN_SET = b'\x00\x00\x00'
+# Neighboring colors closer than this (in every channel) don't need
+# anti-aliasing.
+CONTRAST = 16
+
+
+def _color(i):
+    if i < 5:
+        return bytes([max(1, 255 - i * 20), 0, 0])
+    elif i < 20:
+        return bytes([0, max(1, 255 - i * 20), 0])
+    else:
+        #return bytes([max(1, 255 - i * 4)] * 3)
+        return bytes([0, 0, max(1, 255 - i * 4)])
+
+
+PALETTE = [_color(i) for i in range(MAX_COUNT + 1)] + [IN_SET]
+
+
+def header(grid):
+    return b'P6 %d %d 255 ' % (len(grid.width), len(grid.height))
+
+
+class _Lookup(dict):
+    """The color for each count, by way of the palette.
+
+    Counts past the end of the palette get its last color.  Fractional
+    (smooth) counts blend the colors of the counts on either side.
+    """
+
+    def __init__(self, palette):
+        colors = palette[:-1]
+        super().__init__(enumerate(colors))
+        self._colors = colors
+
+    def __missing__(self, i):
+        colors = self._colors
+        if i >= len(colors) - 1:
+            return colors[-1]
+        n = int(i)
+        frac = i - n
+        return bytes([round(a + (b - a) * frac)
+                      for a, b in zip(colors[n], colors[n + 1])])
+
+
+def _blend(colors):
+    n = len(colors)
+    r = g = b = 0
+    for color in colors:
+        r += color[0]
+        g += color[1]
+        b += color[2]
+    return bytes([round(r / n), round(g / n), round(b / n)])
+
+
+def _palette_indices(counts, sentinel, palette):
+    # These match _Lookup, for whole counts in a numpy array.
+    import numpy
+    return numpy.where(counts == sentinel, len(palette) - 1,
+                       numpy.minimum(counts, len(palette) - 2))
+
+
+def _palette_array(palette):
+    import numpy
+    colors = numpy.frombuffer(b''.join(palette), dtype=numpy.uint8)
+    return colors.reshape(-1, 3)
+
+
+def _encode_numpy(raster, palette, supersamples):
+    import numpy
+    colors = _palette_array(palette)
+    counts = numpy.frombuffer(raster.counts, dtype=raster.typecode)
+    pixels = colors[_palette_indices(counts, raster.sentinel, palette)]
+    if supersamples:
+        edges = supersamples.indices
+        samples = _palette_indices(supersamples.counts, -1, palette)
+        # Adding up a column of samples at a time is much faster.
+        wide = colors.astype(numpy.intp)
+        total = pixels[edges].astype(numpy.intp)
+        for column in samples.T:
+            total += wide[column]
+        # This rounds (half to even) the same as _blend().
+        pixels[edges] = numpy.rint(total / (1 + len(samples.T)))
+    return pixels.tobytes()
+
+
+def encode(values, grid, palette=PALETTE, *, supersamples=None,
+           numpy=False):
+    """Return the PPM image for the (C, num iterations) values.
+
+    The values may also be an IterationRaster, including one of smooth
+    counts.
+
+    "palette" has a 3-byte color for each count from 0 up, and then one
+    for "in set" (None) at the end.  Higher counts get the last color
+    before that.
+
+    "supersamples" maps pixel indices to extra counts for those pixels
+    (see find_supersamples()).  Each of those pixels gets the average
+    color of all its counts.  If "numpy" is true then a raster of whole
+    counts, with a Supersamples (or none), is colored with numpy.
+    """
+    if numpy and _numpy_encodable(values, supersamples):
+        pixels = _encode_numpy(values, palette, supersamples)
+    else:
+        pixels = _encode(values, palette, supersamples)
+    if len(pixels) != len(grid) * 3:
+        raise ValueError('expected {} values, got {}'
+                         .format(len(grid), len(pixels) // 3))
+    image = bytearray(header(grid))
+    image += pixels
+    return image
+
+
+def _numpy_encodable(values, supersamples):
+    if not isinstance(values, IterationRaster) or values.smooth:
+        return False
+    return supersamples is None or isinstance(supersamples, Supersamples)
+
+
+def _encode(values, palette, supersamples):
+    lookup = _Lookup(palette)
+    lookup[None] = palette[-1]
+    if isinstance(values, IterationRaster):
+        # The raw counts are read straight from the buffer.
+        lookup[values.sentinel] = palette[-1]
+        counts = values.counts
+    else:
+        counts = (i for _, i in values)
+    colors = [lookup[i] for i in counts]
+    if supersamples:
+        # Edge pixels tend to repeat the same few blends.
+        blends = {}
+        for index, samples in supersamples.items():
+            key = (colors[index], samples)
+            try:
+                colors[index] = blends[key]
+            except KeyError:
+                colors[index] = blends[key] = _blend(
+                        [colors[index]] + [lookup[i] for i in samples])
+    return b''.join(colors)
+
+
+def _contrasting(a, b):
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]),
+               abs(a[2] - b[2])) > CONTRAST
+
+
+def _find_edges_numpy(raster, grid, palette):
+    # This matches find_edges() with _contrasting(), for whole counts.
+    import numpy
+    colors = _palette_array(palette).astype(numpy.int16)
+    # Whether each pair of palette colors is contrasting.
+    differ = numpy.abs(colors[:, numpy.newaxis] - colors[numpy.newaxis])
+    differ = (differ > CONTRAST).any(axis=2)
+    counts = numpy.frombuffer(raster.counts, dtype=raster.typecode)
+    indices = _palette_indices(counts, raster.sentinel, palette)
+    indices = indices.reshape(len(grid.height), len(grid.width))
+    edges = numpy.zeros(indices.shape, dtype=bool)
+    across = differ[indices[:, 1:], indices[:, :-1]]
+    edges[:, 1:] |= across
+    edges[:, :-1] |= across
+    down = differ[indices[1:], indices[:-1]]
+    edges[1:] |= down
+    edges[:-1] |= down
+    return numpy.flatnonzero(edges).tolist()
+
+
+def find_supersamples(iter_raster, area, grid, scale, values,
+                      palette=PALETTE, *, iter_points=None, numpy=False):
+    """Return (raster, supersamples) to anti-alias the values with.
+
+    Only the pixels with a clearly different color (see CONTRAST) than
+    one of their neighbors are supersampled (see
+    _antialias.supersample(), which takes "iter_points" and "numpy"),
+    so this costs far less than supersampling the whole image.  Pass
+    both to encode(), along with "numpy".
+    """
+    raster = IterationRaster.from_values(area, grid, values, scale)
+    if numpy and not raster.smooth:
+        edges = _find_edges_numpy(raster, grid, palette)
+    else:
+        lookup = _Lookup(palette)
+        lookup[raster.sentinel] = palette[-1]
+        colors = [lookup[i] for i in raster.counts]
+        edges = find_edges(colors, grid, _contrasting)
+    return raster, supersample(iter_raster, area, grid, scale, edges,
+                               iter_points=iter_points, numpy=numpy)
+
+
+def write(values, grid, file, palette=PALETTE, *, supersamples=None,
+          numpy=False):
+    """Write the PPM image for the values out to the binary file."""
+    file.write(encode(values, grid, palette, supersamples=supersamples,
+                      numpy=numpy))
+
+
+def render(iter_raster, area, grid, scale, *, filename=None,
+           antialias=False, sampler=None, iter_points=None, numpy=False):
+    """Write the image to a PPM file (or to stdout).
+
+    If "antialias" is true then the edges are supersampled with
+    "sampler" (an iter_raster() that skips any cache) or "iter_points",
+    if provided (see find_supersamples()).
+    """
+    values = iter_raster(area, grid, scale)
+    supersamples = None
+    if antialias:
+        values, supersamples = find_supersamples(
+                sampler or iter_raster, area, grid, scale, values,
+                iter_points=iter_points, numpy=numpy)
+    if filename and filename != '-':
+        with open(filename, 'wb') as outfile:
+            write(values, grid, outfile, supersamples=supersamples,
+                  numpy=numpy)
+    else:
+        sys.stdout.flush()
+        write(values, grid, sys.stdout.buffer, supersamples=supersamples,
+              numpy=numpy)
+        sys.stdout.buffer.flush()
@@ -1,8 +1,14 @@
 
+import itertools
+import sys
+
+from mandelbrot._raster import IterationRaster
 from mandelbrot._util import as_namedtuple
 
 
 SCALE_TEXT = 40
+# How many rows to write out at once.
+ROWS_PER_WRITE = 16
 CHARS = {
         None: '  ',
         0: '..',
@@ -67,26 +73,64 @@ class Spec:
         return cls(chars, matched, default)
 
 
-def render(iter_raster, area, grid, scale, spec=None):
+def render(iter_raster, area, grid, scale, spec=None, *, out=None):
     steps = int(grid.width) if grid else SCALE_TEXT
     if steps <= 0:
         raise ValueError('got non-positive steps')
     spec = Spec.from_raw(spec)
-    _text(iter_raster, area, grid, scale, spec)
+    _text(iter_raster, area, grid, scale, spec, out)
 
 
-def _text(iter_raster, area, grid, scale, spec):
+def _encode_spec(spec, encoding):
+    """Return the lookup table of encoded chars, and the default."""
     chars, matched, default = spec
+    table = {i: char.encode(encoding) for i, char in chars.items()}
+    table[None] = matched.encode(encoding)
+    return table, default.encode(encoding)
+
+
+def _iter_rows(values, width):
+    values = iter(values)
+    while True:
+        row = [i for _, i in itertools.islice(values, width)]
+        if not row:
+            break
+        yield row
+
+
+def _text(iter_raster, area, grid, scale, spec, out=None):
+    """Write out the rows of the text rendering to the binary stream.
+
+    By default that is sys.stdout.buffer.
+    """
+    if out is None:
+        sys.stdout.flush()
+        encoding = sys.stdout.encoding or 'utf-8'
+        out = sys.stdout.buffer
+    else:
+        encoding = 'utf-8'
+    table, default = _encode_spec(spec, encoding)
+    lookup = table.get
+
     values = iter_raster(area, grid, scale)
-    step = 0
-    for _, i in values:
-        if i is None:
-            print(matched, end='')
-        else:
-            print(chars.get(i, default), end='')
-
-        if step == grid.width:
-            print()
-            step = 0
-        else:
-            step += 1
+    if isinstance(values, IterationRaster) and values.smooth:
+        # Each char covers a whole count.
+        table[int(values.sentinel)] = table.pop(None)
+        rows = ([int(i) for i in row] for row in values.iter_rows())
+    elif isinstance(values, IterationRaster):
+        # The rows are read straight from the buffer.
+        table[values.sentinel] = table.pop(None)
+        rows = values.iter_rows()
+    else:
+        rows = _iter_rows(values, len(grid.width))
+    lines = []
+    for row in rows:
+        lines.append(b''.join([lookup(i, default) for i in row]))
+        if len(lines) == ROWS_PER_WRITE:
+            lines.append(b'')
+            out.write(b'\n'.join(lines))
+            lines = []
+    if lines:
+        lines.append(b'')
+        out.write(b'\n'.join(lines))
+    out.flush()
@@ -1,39 +1,156 @@
+from mandelbrot._cache import CachedEngine
+from mandelbrot._geometry import Grid
+from ._ppm import encode as _ppm, find_supersamples
 
 
-def ui(iter_raster, area, grid, scale, *, static=False):
-    values = iter_raster(area, grid, scale)
-    if static:
-        tk(values, grid)
+# The pixel spacing of each pass of a progressive render.
+STRIDES = (8, 4, 2, 1)
+
+_UNKNOWN = object()
+
+
+def ui(iter_raster, area, grid, scale, *, static=False, progressive=False,
+       antialias=False, sampler=None, iter_points=None, numpy=False):
+    if progressive:
+        passes = iter_passes(iter_raster, area, grid, scale,
+                             iter_points=iter_points)
+        tk_progressive(passes, grid)
+    elif static:
+        values = iter_raster(area, grid, scale)
+        supersamples = None
+        if antialias:
+            values, supersamples = find_supersamples(
+                    sampler or iter_raster, area, grid, scale, values,
+                    iter_points=iter_points, numpy=numpy)
+        tk(values, grid, supersamples, numpy)
     else:
         raise NotImplementedError
 
 
-def _ppm(values, grid):
-    image = b'P6 %d %d 255 ' % (len(grid.width), len(grid.height))
-    for _, i in values:
-        if i is None:
-            image += b'\x00\x00\x00'
-        elif i < 5:
-            image += bytes([max(1, 255 - i * 20), 0, 0])
-        elif i < 20:
-            image += bytes([0, max(1, 255 - i * 20), 0])
-        else:
-            #image += bytes([max(1, 255 - i * 4)] * 3)
-            image += bytes([0, 0, max(1, 255 - i * 4)])
-    return image
+def _sublattices(grid, stride, coarser=None):
+    """Yield (columns, rows) for each lattice of points new at this stride.
+
+    Points already covered at the coarser stride are left out.
+    """
+    columns = range(0, len(grid.width), stride)
+    rows = range(0, len(grid.height), stride)
+    if coarser is None:
+        yield columns, rows
+        return
+    # new columns on the old rows
+    yield (range(stride, len(grid.width), coarser),
+           range(0, len(grid.height), coarser))
+    # new rows, with every column
+    yield columns, range(stride, len(grid.height), coarser)
+
+
+def iter_passes(iter_raster, area, grid, scale, strides=STRIDES, *,
+                iter_points=None):
+    """Yield (stride, counts) after each pass of a progressive render.
 
+    Each pass only computes the points that earlier (coarser) passes
+    didn't.  Those points are regular lattices.  If "iter_points" is
+    provided (see _engines.resolve_point_engine()) then each lattice's
+    points are taken straight from the grid's axes and iterated with
+    it, so the last pass matches iter_raster(area, grid) exactly.
+    Otherwise each lattice is rendered as its own (area, grid) with
+    iter_raster(), where the points may be off by a float rounding.
+    "counts" is the list of counts for the whole grid, in raster order,
+    with _UNKNOWN for points not computed yet.
 
-def tk(values, grid):
+    The points bypass iter_raster(), and any wrappers around it (e.g.
+    for symmetry), except for the cache (see _cache.cached()).  If the
+    whole grid is cached then it is the only pass, and otherwise the
+    final pass is stored there.
+    """
+    width = len(grid.width)
+    counts = [_UNKNOWN] * len(grid)
+    cache = None
+    if iter_points is not None:
+        xs, ys = grid.axes(area.min.x, area.max.x, area.max.y, area.min.y)
+        if isinstance(iter_raster, CachedEngine):
+            cache = iter_raster
+            raster = cache.get(area, grid, scale)
+            if raster is not None:
+                yield 1, [i for _, i in raster]
+                return
+    coarser = None
+    for stride in strides:
+        for columns, rows in _sublattices(grid, stride, coarser):
+            if not columns or not rows:
+                continue
+            if iter_points is not None:
+                candidates = (xs[i] + ys[j] * 1j
+                              for j in rows for i in columns)
+                values = iter(iter_points(candidates, scale))
+            else:
+                subarea, subgrid = grid.subarea(area, columns, rows)
+                values = iter(iter_raster(subarea, subgrid, scale))
+            for j in rows:
+                for i in columns:
+                    _, counts[j * width + i] = next(values)
+        coarser = stride
+        if cache is not None and stride == 1:
+            cache.set(area, grid, scale, counts)
+        yield stride, counts
+
+
+def _lattice(counts, grid, stride):
+    """Return ((None, count) for each point at the stride, lattice grid).
+
+    Each point stands for the stride x stride block of pixels below and
+    to the right of it.
+    """
+    width = len(grid.width)
+    columns = range(0, width, stride)
+    rows = range(0, len(grid.height), stride)
+    values = [(None, counts[j * width + i]) for j in rows for i in columns]
+    return values, Grid(len(columns) - 1, len(rows) - 1)
+
+
+def tk(values, grid, supersamples=None, numpy=False):
     import tkinter as tk
 
     root = tk.Tk()
     canvas = tk.Canvas(root, width=len(grid.width), height=len(grid.height))
     canvas.pack()
 
-    data = _ppm(values, grid)
+    data = _ppm(values, grid, supersamples=supersamples, numpy=numpy)
     bitmap = tk.PhotoImage(data=data, format='PPM')
     canvas.create_image(0, 0,
                         image=bitmap,
                         anchor=tk.NW)
 
     tk.mainloop()
+
+
+def tk_progressive(passes, grid):
+    import tkinter as tk
+
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=len(grid.width), height=len(grid.height))
+    canvas.pack()
+
+    def show(stride, counts):
+        # Each pass is drawn small and then scaled up, as blocks.
+        data = _ppm(*_lattice(counts, grid, stride))
+        bitmap = tk.PhotoImage(data=data, format='PPM')
+        if stride > 1:
+            bitmap = bitmap.zoom(stride)
+        canvas.itemconfigure(image, image=bitmap)
+        # Keep a reference, or tk will drop the image.
+        canvas.bitmap = bitmap
+
+    image = canvas.create_image(0, 0,
+                                anchor=tk.NW)
+    show(*next(passes))
+
+    def refine():
+        try:
+            show(*next(passes))
+        except StopIteration:
+            return
+        root.after(1, refine)
+    root.after(1, refine)
+
+    tk.mainloop()
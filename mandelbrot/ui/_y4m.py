@@ -0,0 +1,35 @@
+from . import _ppm
+
+
+def _ycbcr(color):
+    # ITU-R BT.601, with the usual ("studio") range
+    r, g, b = color
+    y = 16 + (65.481 * r + 128.553 * g + 24.966 * b) / 255
+    cb = 128 + (-37.797 * r - 74.203 * g + 112.0 * b) / 255
+    cr = 128 + (112.0 * r - 93.786 * g - 18.214 * b) / 255
+    return bytes([round(y), round(cb), round(cr)])
+
+
+# The PPM palette, converted to (Y, Cb, Cr).
+PALETTE = [_ycbcr(color) for color in _ppm.PALETTE]
+
+
+def header(grid, fps):
+    """Return the header of a YUV4MPEG2 stream of frames for the grid.
+
+    The frames are full resolution in every plane (4:4:4).
+    """
+    return b'YUV4MPEG2 W%d H%d F%d:1 Ip A1:1 C444\n' % (
+            len(grid.width), len(grid.height), fps)
+
+
+def encode_frame(values, grid, palette=PALETTE):
+    """Return one frame of the stream for the (C, num iterations) values.
+
+    The values may also be an IterationRaster.  "palette" is like the
+    one for _ppm.encode(), but with (Y, Cb, Cr) instead of RGB.
+    """
+    # The pixels come out interleaved, so they only need splitting up.
+    image = _ppm.encode(values, grid, palette)
+    pixels = bytes(image[len(_ppm.header(grid)):])
+    return b''.join([b'FRAME\n', pixels[0::3], pixels[1::3], pixels[2::3]])
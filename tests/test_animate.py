@@ -0,0 +1,190 @@
+from fractions import Fraction
+import io
+import unittest
+
+from mandelbrot import _animate, imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import IterationRaster
+from mandelbrot.ui import _ppm, _y4m
+
+
+START = Area.from_radius(2, '-0.5,0')
+END = Area.from_radius(0.01, '-0.75,0.1')
+
+
+class IterAreasTests(unittest.TestCase):
+
+    def test_endpoints(self):
+        areas = list(_animate.iter_areas(START, END, 5))
+
+        self.assertEqual(len(areas), 5)
+        self.assertIs(areas[0], START)
+        self.assertIs(areas[-1], END)
+
+    def test_steady_zoom(self):
+        areas = list(_animate.iter_areas(START, END, 5))
+
+        ratios = [b.delta.x / a.delta.x for a, b in zip(areas, areas[1:])]
+        for ratio in ratios:
+            with self.subTest(ratio):
+                self.assertAlmostEqual(ratio, (0.01 / 2) ** 0.25)
+
+    def test_fixed_point(self):
+        # The zoom is a scaling about one point, which doesn't move.
+        areas = list(_animate.iter_areas(START, END, 5))
+        size0, size1 = START.delta.x, END.delta.x
+        x = (END.min.x * size0 - START.min.x * size1) / (size0 - size1)
+        y = (END.min.y * size0 - START.min.y * size1) / (size0 - size1)
+
+        expected = ((x - START.min.x) / size0, (y - START.min.y) / size0)
+        for area in areas:
+            with self.subTest(area):
+                self.assertAlmostEqual((x - area.min.x) / area.delta.x,
+                                       expected[0])
+                self.assertAlmostEqual((y - area.min.y) / area.delta.y,
+                                       expected[1])
+
+    def test_same_size(self):
+        end = Area.from_radius(2, '0.5,0.5')
+        areas = list(_animate.iter_areas(START, end, 3))
+
+        self.assertAlmostEqual(areas[1].min.x, -2)
+        self.assertAlmostEqual(areas[1].min.y, -1.75)
+        self.assertAlmostEqual(areas[1].delta.x, 4)
+
+    def test_valuetype(self):
+        start = Area.from_radius(Fraction(2), '-0.5,0', valuetype=Fraction)
+        end = Area.from_radius(Fraction(1, 10**20), '-0.75,0.1',
+                               valuetype=Fraction)
+        areas = list(_animate.iter_areas(start, end, 4))
+
+        for area in areas:
+            with self.subTest(area):
+                self.assertIsInstance(area.min.x, Fraction)
+                self.assertIsInstance(area.max.y, Fraction)
+                self.assertGreater(area.delta.x, 0)
+
+    def test_single_frame(self):
+        areas = list(_animate.iter_areas(START, END, 1))
+
+        self.assertEqual(areas, [START])
+
+    def test_bad_frames(self):
+        with self.assertRaises(ValueError):
+            list(_animate.iter_areas(START, END, 0))
+
+
+class IterFramesTests(unittest.TestCase):
+
+    def test_matches_serial(self):
+        grid = Grid(8, 8)
+        areas = list(_animate.iter_areas(START, END, 5))
+        frames = list(_animate.iter_frames(areas, grid, 50, workers=2))
+
+        self.assertEqual(len(frames), 5)
+        for area, frame in zip(areas, frames):
+            with self.subTest(area):
+                candidates = imaginary.iter_raster(area, grid)
+                expected = IterationRaster.from_values(
+                        area, grid, iter_mandelbrot(candidates, 50), 50)
+                self.assertIsInstance(frame, IterationRaster)
+                self.assertEqual(list(frame.iter_counts()),
+                                 list(expected.iter_counts()))
+
+    def test_auto(self):
+        grid = Grid(4, 4)
+        areas = list(_animate.iter_areas(START, END, 2))
+        frames = list(_animate.iter_frames(areas, grid, 'auto', workers=1))
+
+        self.assertEqual(len(frames), 2)
+
+
+class IterExpMapFramesTests(unittest.TestCase):
+
+    START = Area.from_radius(0.5, '-0.75,0.1')
+
+    def test_frames(self):
+        # Each pixel is read off the nearest point of the strip, so most
+        # (not all) match a direct render.
+        grid = Grid(30, 30)
+        frames = list(_animate.iter_expmap_frames(self.START, END, 4,
+                                                  grid, 50))
+
+        areas = list(_animate.iter_areas(self.START, END, 4))
+        self.assertEqual(len(frames), 4)
+        for area, frame in zip(areas, frames):
+            with self.subTest(area):
+                candidates = imaginary.iter_raster(area, grid)
+                expected = [i for _, i in iter_mandelbrot(candidates, 50)]
+                same = sum(1 for a, b in zip(frame.iter_counts(), expected)
+                           if a == b)
+                self.assertEqual(frame.area, area)
+                self.assertGreater(same / len(expected), 0.8)
+
+    def test_zoom_out(self):
+        # The strip covers the end just as well as when zooming in.
+        grid = Grid(40, 40)
+        start = Area.from_radius(0.001, '-0.75,0.1')
+        end = Area.from_radius(0.5, '-0.75,0.1')
+        outward = list(_animate.iter_expmap_frames(start, end, 3, grid, 50))
+        inward = list(_animate.iter_expmap_frames(end, start, 3, grid, 50))
+
+        self.assertEqual(outward[-1].counts, inward[0].counts)
+        self.assertEqual(outward[0].counts, inward[-1].counts)
+
+    def test_auto(self):
+        frames = list(_animate.iter_expmap_frames(self.START, END, 2,
+                                                  Grid(4, 4), 'auto'))
+
+        self.assertEqual(len(frames), 2)
+
+    def test_different_centers(self):
+        with self.assertRaises(ValueError):
+            list(_animate.iter_expmap_frames(START, END, 2, Grid(4, 4), 50))
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(ValueError):
+            list(_animate.iter_expmap_frames(self.START, END, 2, Grid(4, 4),
+                                             50, engine='fixed'))
+
+
+class RenderTests(unittest.TestCase):
+
+    def test_y4m(self):
+        grid = Grid(3, 2)
+        out = io.BytesIO()
+        _animate.render(START, END, 3, grid, 20, out, fps=24, workers=1)
+
+        data = out.getvalue()
+        header = _y4m.header(grid, 24)
+        frame = 6 + 3 * 4 * 3
+        self.assertTrue(data.startswith(header))
+        self.assertEqual(len(data), len(header) + 3 * frame)
+        self.assertEqual(data.count(b'FRAME\n'), 3)
+
+    def test_ppm(self):
+        grid = Grid(3, 2)
+        out = io.BytesIO()
+        _animate.render(START, END, 3, grid, 20, out, fmt='ppm', workers=1)
+
+        data = out.getvalue()
+        image = len(_ppm.header(grid)) + 3 * 4 * 3
+        self.assertEqual(len(data), 3 * image)
+        self.assertEqual(data.count(_ppm.header(grid)), 3)
+
+    def test_expmap(self):
+        grid = Grid(3, 2)
+        start = Area.from_radius(0.5, '-0.75,0.1')
+        out = io.BytesIO()
+        _animate.render(start, END, 3, grid, 20, out, expmap=True)
+
+        data = out.getvalue()
+        header = _y4m.header(grid, _animate.DEFAULT_FPS)
+        self.assertTrue(data.startswith(header))
+        self.assertEqual(data.count(b'FRAME\n'), 3)
+
+    def test_bad_format(self):
+        with self.assertRaises(ValueError):
+            _animate.render(START, END, 3, Grid(3, 2), 20, io.BytesIO(),
+                            fmt='gif')
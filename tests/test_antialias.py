@@ -0,0 +1,179 @@
+from fractions import Fraction
+import unittest
+
+from mandelbrot._antialias import (
+        Supersamples, _iter_runs, corner_lattice, find_edges, supersample)
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+
+from .util import iter_brute
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FindEdgesTests(unittest.TestCase):
+
+    def test_edges(self):
+        values = [
+            0, 0, 0, 0,
+            0, 1, 0, 0,
+            0, 0, 0, 0,
+            ]
+        edges = find_edges(values, Grid(3, 2))
+
+        self.assertEqual(edges, [1, 4, 5, 6, 9])
+
+    def test_uniform(self):
+        self.assertEqual(find_edges([3] * 12, Grid(3, 2)), [])
+
+    def test_differ(self):
+        values = [
+            0, 1, 5,
+            0, 1, 1,
+            ]
+        edges = find_edges(values, Grid(2, 1),
+                           lambda a, b: abs(a - b) > 1)
+
+        self.assertEqual(edges, [1, 2, 5])
+
+
+class CornerLatticeTests(unittest.TestCase):
+
+    def test_lattice(self):
+        area, grid = corner_lattice(Area((0, 0), (4, 2)), Grid(4, 2))
+
+        self.assertEqual(area, Area((-0.5, -0.5), (4.5, 2.5)))
+        self.assertEqual((grid.width, grid.height), (5, 3))
+
+    def test_exact(self):
+        area = Area.from_radius(Fraction(1, 3), None, Fraction)
+        area, _ = corner_lattice(area, Grid(2))
+
+        self.assertEqual(area.max, (Fraction(1, 2), Fraction(1, 2)))
+
+
+class SupersampleTests(unittest.TestCase):
+
+    def test_iter_runs(self):
+        runs = list(_iter_runs([0, 1, 2, 7, 8, 30]))
+
+        self.assertEqual(runs, [range(0, 3), range(7, 9), range(30, 31)])
+
+    def test_corners(self):
+        area = Area.from_radius(1.5, (-0.75, 0.5))
+        grid = Grid(20)
+        values = [i for _, i in iter_brute(area, grid, 50)]
+        edges = find_edges(values, grid)
+        samples = supersample(iter_brute, area, grid, 50, edges)
+
+        cornerarea, cornergrid = corner_lattice(area, grid)
+        corners = [i for _, i in iter_brute(cornerarea, cornergrid, 50)]
+        width = len(grid.width)
+        self.assertEqual(sorted(samples), edges)
+        for index, counts in samples.items():
+            j, i = divmod(index, width)
+            top = j * (width + 1) + i
+            bottom = top + width + 1
+            with self.subTest(index):
+                self.assertEqual(counts, (
+                    corners[top], corners[top + 1],
+                    corners[bottom], corners[bottom + 1]))
+
+    def test_mirrored(self):
+        # The corners below the real axis are copied from above.
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(20)
+        values = [i for _, i in iter_brute(area, grid, 50)]
+        edges = find_edges(values, grid)
+        calls = []
+        samples = supersample(
+                lambda *args: iter_brute(*args, calls=calls),
+                area, grid, 50, edges)
+
+        computed = sum(len(g) for _, g in calls)
+        corners = set()
+        for index in edges:
+            j, i = divmod(index, len(grid.width))
+            corners.update((cj, ci) for cj in (j, j + 1) for ci in (i, i + 1))
+        self.assertLess(computed, len(corners) * 0.6)
+        j, i = divmod(edges[0], len(grid.width))
+        mirror = (len(grid.height) - 1 - j) * len(grid.width) + i
+        topleft, topright, bottomleft, bottomright = samples[edges[0]]
+        self.assertEqual(samples[mirror],
+                         (bottomleft, bottomright, topleft, topright))
+
+    def test_points(self):
+        # All the corners are iterated in one go, straight off the axes.
+        area = Area.from_radius(1.5, (-0.75, 0.5))
+        grid = Grid(20)
+        values = [i for _, i in iter_brute(area, grid, 50)]
+        edges = find_edges(values, grid)
+        calls = []
+        batches = []
+
+        def iter_points(candidates, maxiter):
+            candidates = list(candidates)
+            batches.append(len(candidates))
+            return iter_mandelbrot(candidates, maxiter)
+        samples = supersample(
+                lambda *args: iter_brute(*args, calls=calls),
+                area, grid, 50, edges, iter_points=iter_points)
+
+        cornerarea, cornergrid = corner_lattice(area, grid)
+        corners = [i for _, i in iter_brute(cornerarea, cornergrid, 50)]
+        width = len(grid.width)
+        self.assertEqual(calls, [])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(sorted(samples), edges)
+        for index, counts in samples.items():
+            j, i = divmod(index, width)
+            top = j * (width + 1) + i
+            bottom = top + width + 1
+            with self.subTest(index):
+                self.assertEqual(counts, (
+                    corners[top], corners[top + 1],
+                    corners[bottom], corners[bottom + 1]))
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy(self):
+        grid = Grid(20)
+        for area in [Area.from_radius(1.5, (-0.75, 0)),
+                     Area.from_radius(1.5, (-0.75, 0.5))]:
+            values = [i for _, i in iter_brute(area, grid, 50)]
+            edges = find_edges(values, grid)
+            with self.subTest(area):
+                expected = supersample(iter_brute, area, grid, 50, edges,
+                                       iter_points=iter_mandelbrot)
+                samples = supersample(iter_brute, area, grid, 50, edges,
+                                      iter_points=iter_mandelbrot,
+                                      numpy=True)
+
+                self.assertIsInstance(samples, Supersamples)
+                self.assertEqual(samples, expected)
+                self.assertEqual(dict(samples.items()), expected)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_supersamples_mapping(self):
+        samples = Supersamples(numpy.array([3, 8]),
+                               numpy.array([[0, 1, -1, 2], [4, 4, 4, 4]]))
+
+        self.assertEqual(len(samples), 2)
+        self.assertEqual(list(samples), [3, 8])
+        self.assertEqual(samples[3], (0, 1, None, 2))
+        self.assertEqual(samples[8], (4, 4, 4, 4))
+        for index in (0, 5, 9):
+            with self.subTest(index):
+                with self.assertRaises(KeyError):
+                    samples[index]
+
+    def test_no_edges(self):
+        calls = []
+        samples = supersample(
+                lambda *args: iter_brute(*args, calls=calls),
+                Area.from_radius(1), Grid(4), 50, [])
+
+        self.assertEqual(samples, {})
+        self.assertEqual(calls, [])
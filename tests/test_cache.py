@@ -0,0 +1,132 @@
+import os
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._cache import HEADER, TileCache, cached
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import IterationRaster
+
+
+class TileCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dirname)
+
+    def test_key(self):
+        area = Area.from_radius(1.5, (-0.75, 0))
+        key1 = TileCache.key(area, Grid(40), 100, 'brute')
+        key2 = TileCache.key(area, Grid(40), None, 'brute')
+        key3 = TileCache.key(area, Grid(40), 100, 'subdivide')
+        key4 = TileCache.key(area, Grid(40, 41), 100, 'brute')
+        key5 = TileCache.key(Area.from_radius(1.5), Grid(40), 100, 'brute')
+
+        self.assertEqual(key1, key2)
+        self.assertEqual(len({key1, key3, key4, key5}), 4)
+
+    def test_roundtrip(self):
+        cache = TileCache(self.dirname)
+        counts = [0, 1, None, 99, None, 5]
+        cache.set('spam', counts, 100)
+        loaded = cache.get('spam')
+
+        self.assertEqual(list(loaded), counts)
+        self.assertEqual(len(loaded), 6)
+        self.assertEqual(loaded[2], None)
+        self.assertEqual(loaded[3], 99)
+
+    def test_big_maxiter(self):
+        cache = TileCache(self.dirname)
+        counts = [0, 70000, None]
+        cache.set('spam', counts, 100000)
+        loaded = cache.get('spam')
+
+        self.assertEqual(list(loaded), counts)
+
+    def test_missing(self):
+        cache = TileCache(self.dirname)
+        loaded = cache.get('spam')
+
+        self.assertIsNone(loaded)
+
+    def test_corrupt(self):
+        cache = TileCache(self.dirname)
+        cache.set('spam', [1, 2, 3])
+        filename = os.path.join(self.dirname, 'spam.tile')
+        with open(filename, 'r+b') as file:
+            file.write(b'eggs')
+        loaded = cache.get('spam')
+
+        self.assertIsNone(loaded)
+
+    def test_truncated(self):
+        cache = TileCache(self.dirname)
+        filename = os.path.join(self.dirname, 'spam.tile')
+        for size in (11, HEADER.size + 3):
+            with self.subTest(size):
+                cache.set('spam', [1, 2, 3])
+                with open(filename, 'r+b') as file:
+                    file.truncate(size)
+                loaded = cache.get('spam')
+
+                self.assertIsNone(loaded)
+                self.assertFalse(os.path.exists(filename))
+
+    def test_evict_lru(self):
+        cache = TileCache(self.dirname, 350)  # room for 3
+        for i, key in enumerate(['a', 'b', 'c']):
+            cache.set(key, [0] * 40)
+            os.utime(os.path.join(self.dirname, key + '.tile'), (i, i))
+        cache.get('a')  # "a" is now the most recently used.
+        cache.set('d', [0] * 40)
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertIsNotNone(cache.get('d'))
+
+
+class CachedTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dirname)
+
+    def test_cached(self):
+        calls = []
+
+        def iter_raster(area, grid, maxiter):
+            calls.append((area, grid, maxiter))
+            candidates = imaginary.iter_raster(area, grid)
+            return iter_mandelbrot(candidates, maxiter)
+        iter_cached = cached(iter_raster, TileCache(self.dirname), 'brute')
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(20)
+        expected = list(iter_raster(area, grid, 50))
+        del calls[:]
+        first = list(iter_cached(area, grid, 50))
+        second = list(iter_cached(area, grid, 50))
+
+        self.assertEqual(first, expected)
+        self.assertEqual(second, expected)
+        self.assertEqual(len(calls), 1)
+
+    def test_cached_raster(self):
+        def iter_raster(area, grid, maxiter):
+            candidates = imaginary.iter_raster(area, grid)
+            values = iter_mandelbrot(candidates, maxiter)
+            return IterationRaster.from_values(area, grid, values, maxiter)
+        iter_cached = cached(iter_raster, TileCache(self.dirname), 'brute')
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(20)
+        expected = list(iter_raster(area, grid, 50))
+        first = iter_cached(area, grid, 50)
+        second = iter_cached(area, grid, 50)
+
+        self.assertIsInstance(second, IterationRaster)
+        self.assertEqual(list(first), expected)
+        self.assertEqual(list(second), expected)
@@ -0,0 +1,127 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mandelbrot import imaginary
+from mandelbrot._deepen import (
+        AUTO_SAMPLES, MIN_AUTO_ITER, OrbitState, auto_maxiter)
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import IterationRaster
+
+
+class OrbitStateTests(unittest.TestCase):
+
+    AREA = Area.from_radius(0.01, (-0.745, 0.1))
+    GRID = Grid(30)
+
+    def _expected(self, maxiter, numpy=False):
+        if numpy:
+            from mandelbrot import _numpy
+            values = _numpy.iter_raster(self.AREA, self.GRID, maxiter)
+        else:
+            candidates = imaginary.iter_raster(self.AREA, self.GRID)
+            values = iter_mandelbrot(candidates, maxiter)
+        return [i for _, i in values]
+
+    def _check_deepen(self, **kwargs):
+        state = OrbitState(self.AREA, self.GRID, **kwargs)
+        numpy = kwargs.get('numpy', False)
+        for maxiter in (50, 200, 200, 600):
+            with self.subTest(maxiter):
+                raster = state.deepen(maxiter)
+
+                self.assertIsInstance(raster, IterationRaster)
+                self.assertEqual(state.maxiter, maxiter)
+                self.assertEqual(list(raster.iter_counts()),
+                                 self._expected(maxiter, numpy))
+                if not kwargs.get('bulbs'):
+                    self.assertEqual(len(state),
+                                     list(raster.iter_counts()).count(None))
+
+    def test_deepen(self):
+        self._check_deepen()
+
+    def test_bulbs(self):
+        self._check_deepen(bulbs=True)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy(self):
+        self._check_deepen(numpy=True)
+
+    def test_escaped(self):
+        state = OrbitState(self.AREA, self.GRID)
+        first = state.deepen(100)
+        live = len(state)
+        state.deepen(1000)
+
+        self.assertEqual(state.escaped, live - len(state))
+        self.assertEqual(list(first.iter_counts()).count(None), live)
+
+    def test_only_live_iterated(self):
+        state = OrbitState(Area.from_radius(2.1), Grid(10))
+        state.deepen(1)
+        live = len(state)
+        state.deepen(1)
+
+        self.assertEqual(state.escaped, 0)
+        self.assertEqual(len(state), live)
+
+    def test_lower_maxiter(self):
+        state = OrbitState(self.AREA, self.GRID)
+        state.deepen(100)
+
+        with self.assertRaises(ValueError):
+            state.deepen(50)
+
+
+class AutoMaxiterTests(unittest.TestCase):
+
+    def test_full(self):
+        maxiter = auto_maxiter(Area.from_radius(2.1), Grid(100))
+
+        self.assertGreater(maxiter, MIN_AUTO_ITER)
+        self.assertEqual(maxiter & (maxiter - 1), 0)
+
+    def test_deeper_view(self):
+        shallow = auto_maxiter(Area.from_radius(1.5, (-0.75, 0)), Grid(40))
+        deep = auto_maxiter(Area.from_radius(0.01, (-0.745, 0.1)), Grid(40))
+
+        self.assertGreater(deep, shallow)
+
+    def test_outside(self):
+        maxiter = auto_maxiter(Area.from_radius(0.1, (5, 5)), Grid(40))
+
+        self.assertEqual(maxiter, MIN_AUTO_ITER)
+
+    def test_inside_bulbs(self):
+        maxiter = auto_maxiter(Area.from_radius(0.1, (-0.1, 0)), Grid(40))
+
+        self.assertEqual(maxiter, MIN_AUTO_ITER)
+
+    def test_threshold(self):
+        area = Area.from_radius(0.01, (-0.745, 0.1))
+        strict = auto_maxiter(area, Grid(40), threshold=0.0001)
+        loose = auto_maxiter(area, Grid(40), threshold=0.1)
+
+        self.assertGreater(strict, loose)
+
+    def test_iter_raster(self):
+        calls = []
+
+        def iter_raster(area, grid, maxiter):
+            calls.append((grid, maxiter))
+            candidates = imaginary.iter_raster(area, grid)
+            return iter_mandelbrot(candidates, maxiter)
+        area = Area.from_radius(2.1)
+        maxiter = auto_maxiter(area, Grid(100), iter_raster)
+
+        self.assertEqual(maxiter, auto_maxiter(area, Grid(100)))
+        self.assertEqual([m for _, m in calls],
+                         [MIN_AUTO_ITER * 2 ** n
+                          for n in range(1, len(calls) + 1)])
+        grid, _ = calls[0]
+        self.assertEqual(len(grid), AUTO_SAMPLES ** 2)
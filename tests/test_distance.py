@@ -0,0 +1,65 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mandelbrot import imaginary
+from mandelbrot._distance import iter_raster, pixel_size
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import IterationRaster
+
+
+class PixelSizeTests(unittest.TestCase):
+
+    def test_square(self):
+        size = pixel_size(Area.from_radius(2), Grid(40))
+
+        self.assertEqual(size, 0.1)
+
+    def test_narrow(self):
+        size = pixel_size(Area((-2, -1), (2, 1)), Grid(40, 40))
+
+        self.assertEqual(size, 0.05)
+
+    def test_single_row(self):
+        size = pixel_size(Area((-2, 0), (2, 0)), Grid(40, 0))
+
+        self.assertEqual(size, 0.1)
+
+
+class IterRasterTests(unittest.TestCase):
+
+    AREA = Area.from_radius(1.5, (-0.75, 0))
+
+    def test_raster(self):
+        raster = iter_raster(self.AREA, Grid(40), 50)
+
+        self.assertIsInstance(raster, IterationRaster)
+        self.assertEqual(len(raster), len(Grid(40)))
+
+    def test_thickness(self):
+        grid = Grid(40)
+        candidates = imaginary.iter_raster(self.AREA, grid)
+        expected = [i for _, i in iter_mandelbrot(candidates, 50)]
+        thin = iter_raster(self.AREA, grid, 50, thickness=0)
+        thin = list(thin.iter_counts())
+        thick = list(iter_raster(self.AREA, grid, 50).iter_counts())
+
+        self.assertEqual(thin, expected)
+        # Points near the set are drawn in, the rest are unchanged.
+        self.assertGreater(thick.count(None), expected.count(None))
+        for i, count in zip(expected, thick):
+            if count is not None:
+                self.assertEqual(count, i)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy(self):
+        for grid in [Grid(40), Grid(31, 17)]:
+            with self.subTest(grid):
+                expected = list(iter_raster(self.AREA, grid, 50))
+                values = list(iter_raster(self.AREA, grid, 50, numpy=True))
+
+                self.assertEqual(values, expected)
@@ -0,0 +1,97 @@
+from fractions import Fraction
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mandelbrot._geometry import Area, Grid, Point2D
+if numpy is not None:
+    from mandelbrot import _double, _numpy
+
+from .util import exact_count
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class ArithmeticTests(unittest.TestCase):
+
+    VALUES = [0.1, 1 / 3, -2.0 ** 0.5, 1e-20, 3.0]
+
+    def test_split(self):
+        for value in [Fraction(1, 3), Fraction('-0.1'), Fraction(3)]:
+            with self.subTest(value):
+                hi, lo = _double.split(value)
+
+                self.assertEqual(hi, float(value))
+                self.assertLess(abs(Fraction(hi) + Fraction(lo) - value),
+                                abs(value) * Fraction(1, 2 ** 104))
+
+    def test_error_free(self):
+        for a in self.VALUES:
+            for b in self.VALUES:
+                with self.subTest((a, b)):
+                    s, e = _double.two_sum(a, b)
+                    p, f = _double.two_prod(a, b)
+
+                    self.assertEqual(Fraction(s) + Fraction(e),
+                                     Fraction(a) + Fraction(b))
+                    self.assertEqual(Fraction(p) + Fraction(f),
+                                     Fraction(a) * Fraction(b))
+
+    def test_double_double(self):
+        a = Fraction(1, 3)
+        b = Fraction(-2, 7)
+        tests = [
+                (_double.add(*_double.split(a), *_double.split(b)), a + b),
+                (_double.mul(*_double.split(a), *_double.split(b)), a * b),
+                (_double.sqr(*_double.split(b)), b * b),
+                ]
+        for (hi, lo), expected in tests:
+            with self.subTest(expected):
+                error = abs(Fraction(hi) + Fraction(lo) - expected)
+
+                self.assertLess(error, Fraction(1, 10 ** 31))
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class EscapeCountsTests(unittest.TestCase):
+
+    def test_shallow(self):
+        center = Point2D(-0.75, 0, Fraction)
+        area = Area.from_radius(Fraction(3, 2), center, Fraction)
+        grid = Grid(40)
+        plane = _numpy.complex_plane(Area.from_radius(1.5, center), grid)
+        expected = _numpy.escape_counts(plane)
+        counts = _double.escape_counts(area, grid)
+
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_deep(self):
+        # Floats can't tell these pixels apart.
+        center = Point2D.parse('-0.74252535201054930806909, 0.1', Fraction)
+        area = Area.from_radius(Fraction('1e-15'), center, Fraction)
+        grid = Grid(4)
+        maxiter = 8000
+        counts = _double.escape_counts(area, grid, maxiter)
+
+        xs = [area.min.x + area.delta.x * i / 4 for i in range(5)]
+        ys = [area.max.y - area.delta.y * j / 4 for j in range(5)]
+        expected = [[exact_count(x, y, maxiter) for x in xs] for y in ys]
+        self.assertEqual(counts.tolist(), expected)
+        self.assertGreater(len(set(counts.reshape(-1).tolist())), 1)
+
+    def test_iter_raster(self):
+        area = Area.from_radius(Fraction(1), (-1, 0), Fraction)
+        values = list(_double.iter_raster(area, Grid(2)))
+
+        self.assertEqual([c for c, _ in values], [
+            -2+1j, -1+1j, 1j,
+            -2+0j, -1+0j, 0j,
+            -2-1j, -1-1j, -1j,
+            ])
+        self.assertEqual([i for _, i in values], [
+            0, 2, None,
+            None, None, None,
+            0, 2, None,
+            ])
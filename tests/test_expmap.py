@@ -0,0 +1,133 @@
+import cmath
+import math
+import unittest
+
+from mandelbrot import _expmap, imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import IterationRaster
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+CENTER = -0.75 + 0.1j
+
+
+class GeometryTests(unittest.TestCase):
+
+    def test_width_for(self):
+        for grid, expected in [
+                (Grid(0, 0), 5),
+                (Grid(9, 9), 45),
+                (Grid(9, 19), 89),
+                ]:
+            with self.subTest(grid):
+                width = _expmap.width_for(grid)
+
+                self.assertEqual(width, expected)
+
+    def test_rows_for(self):
+        rows = _expmap.rows_for(1, math.exp(-2 * math.pi), 10)
+
+        self.assertEqual(rows, 11)
+
+    def test_rows_for_bad_radii(self):
+        for outer, inner in [(1, 0), (1, 2), (1, -1)]:
+            with self.subTest((outer, inner)):
+                with self.assertRaises(ValueError):
+                    _expmap.rows_for(outer, inner, 10)
+
+    def test_iter_candidates(self):
+        candidates = list(_expmap.iter_candidates(CENTER, 2, 4, 3))
+
+        self.assertEqual(len(candidates), 12)
+        for k, c in enumerate(candidates):
+            j, i = divmod(k, 4)
+            with self.subTest((j, i)):
+                radius, angle = cmath.polar(c - CENTER)
+                self.assertAlmostEqual(radius, 2 * math.exp(-math.pi * j / 2))
+                self.assertAlmostEqual(angle % (2 * math.pi), math.pi * i / 2)
+
+
+class RenderTests(unittest.TestCase):
+
+    def test_counts(self):
+        expmap = _expmap.render(CENTER, 2, 0.01, 16, 50)
+
+        candidates = _expmap.iter_candidates(CENTER, 2, 16, expmap.rows)
+        expected = [i for _, i in iter_mandelbrot(candidates, 50)]
+        sentinel = expmap.sentinel
+        counts = [None if i == sentinel else i for i in expmap.counts]
+        self.assertEqual(expmap.rows, _expmap.rows_for(2, 0.01, 16))
+        self.assertEqual(counts, expected)
+
+    def test_rows(self):
+        expmap = _expmap.render(CENTER, 2, 0.01, 16, 50)
+
+        self.assertEqual(len(expmap.row(0)), 16)
+        self.assertAlmostEqual(expmap.radius(0), 2)
+        self.assertLessEqual(expmap.inner, 0.01)
+        with self.assertRaises(IndexError):
+            expmap.row(expmap.rows)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy(self):
+        for kwargs in [{}, {'bulbs': True}]:
+            with self.subTest(kwargs):
+                expected = _expmap.render(CENTER, 2, 0.01, 16, 50, **kwargs)
+                expmap = _expmap.render(CENTER, 2, 0.01, 16, 50,
+                                        numpy=True, **kwargs)
+
+                self.assertEqual(expmap.counts, expected.counts)
+
+
+class RemapTests(unittest.TestCase):
+
+    def test_on_the_strip(self):
+        # The corners of a 3x3 grid are on a strip through them, as are
+        # the sides on another.  The center takes the innermost row.
+        radius = 0.1
+        area = Area.from_radius(radius, (CENTER.real, CENTER.imag))
+        candidates = list(imaginary.iter_raster(area, Grid(2, 2)))
+        expected = [i for _, i in iter_mandelbrot(candidates, 100)]
+        for outer, indices in [(radius * math.sqrt(2), [0, 2, 6, 8]),
+                               (radius, [1, 3, 5, 7])]:
+            with self.subTest(outer):
+                expmap = _expmap.render(CENTER, outer, radius / 8, 8, 100)
+                raster = _expmap.remap(expmap, area, Grid(2, 2))
+
+                counts = list(raster.iter_counts())
+                self.assertIsInstance(raster, IterationRaster)
+                self.assertEqual([counts[k] for k in indices],
+                                 [expected[k] for k in indices])
+                self.assertEqual(raster.counts[4],
+                                 expmap.row(expmap.rows - 1)[0])
+
+    def test_close_to_direct(self):
+        grid = Grid(30, 30)
+        area = Area.from_radius(0.05, (CENTER.real, CENTER.imag))
+        outer = 0.05 * math.sqrt(2)
+        expmap = _expmap.render(CENTER, outer, 0.05 / 30,
+                                _expmap.width_for(grid), 100)
+        raster = _expmap.remap(expmap, area, grid)
+
+        candidates = imaginary.iter_raster(area, grid)
+        expected = [i for _, i in iter_mandelbrot(candidates, 100)]
+        same = sum(1 for a, b in zip(raster.iter_counts(), expected)
+                   if a == b)
+        self.assertGreater(same / len(expected), 0.8)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy(self):
+        grid = Grid(20, 20)
+        expmap = _expmap.render(CENTER, 1.5, 0.001, 50, 100)
+        for radius in (1, 0.1, 0.01, 0.001):
+            area = Area.from_radius(radius, (CENTER.real, CENTER.imag))
+            with self.subTest(radius):
+                expected = _expmap.remap(expmap, area, grid)
+                raster = _expmap.remap(expmap, area, grid, numpy=True)
+
+                self.assertEqual(raster.counts, expected.counts)
@@ -0,0 +1,105 @@
+from fractions import Fraction
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._fixed import (
+        GUARD_BITS, MIN_BITS, bits_for, from_fixed, iter_counts, iter_orbit,
+        iter_raster, to_fixed)
+from mandelbrot._geometry import Area, Grid, Point2D
+from mandelbrot._mandelbrot import iter_mandelbrot
+
+from .util import exact_count
+
+
+class FixedTests(unittest.TestCase):
+
+    def test_to_fixed(self):
+        tests = [
+                (Fraction(3, 4), 8, 192),
+                ('-0.75', 8, -192),
+                (0.5, 53, 2 ** 52),
+                (Fraction(1, 3), 4, 5),
+                ]
+        for value, bits, expected in tests:
+            with self.subTest((value, bits)):
+                self.assertEqual(to_fixed(value, bits), expected)
+
+    def test_from_fixed(self):
+        self.assertEqual(from_fixed(-192, 8), -0.75)
+        self.assertEqual(from_fixed(to_fixed('0.1', 200), 200), 0.1)
+
+    def test_bits_for(self):
+        tests = [
+                # The pixels are about 2**-7 and 2**-173 wide.
+                (Area.from_radius(1.5), Grid(400), GUARD_BITS + 7),
+                (Area.from_radius(Fraction('1e-50'), None, Fraction),
+                 Grid(400), GUARD_BITS + 173),
+                # Only the one row.
+                (Area((-2, 0), (2, 0)), Grid(400, 0), GUARD_BITS + 6),
+                ]
+        for area, grid, expected in tests:
+            with self.subTest(area):
+                self.assertEqual(bits_for(area, grid), expected)
+
+    def test_min_bits(self):
+        area = Area.from_radius(2 ** 70)
+
+        self.assertEqual(bits_for(area, Grid(1)), MIN_BITS)
+
+    def test_bits_for_empty(self):
+        with self.assertRaises(ValueError):
+            bits_for(Area((0, 0), (0, 0)), Grid(4))
+
+    def test_iter_orbit(self):
+        bits = 64
+        orbit = list(iter_orbit(to_fixed(-1, bits), 0, 5, bits))
+        escaped = list(iter_orbit(to_fixed(1, bits), 0, 5, bits))
+
+        self.assertEqual([from_fixed(x, bits) for x, _ in orbit],
+                         [-1, 0, -1, 0, -1])
+        self.assertEqual([from_fixed(x, bits) for x, _ in escaped],
+                         [1, 2, 5])
+
+
+class IterCountsTests(unittest.TestCase):
+
+    def test_matches_floats(self):
+        area = Area.from_radius(2.1)
+        candidates = list(imaginary.iter_raster(area, Grid(30, 20)))
+        expected = [i for _, i in iter_mandelbrot(candidates, 50)]
+        fixed = [(to_fixed(c.real, 60), to_fixed(c.imag, 60))
+                 for c in candidates]
+        counts = list(iter_counts(fixed, 50, 60))
+
+        self.assertEqual(counts, expected)
+
+
+class IterRasterTests(unittest.TestCase):
+
+    def test_deep(self):
+        # Floats can't tell these pixels apart.
+        center = Point2D.parse('-0.74252535201054930806909, 0.1', Fraction)
+        area = Area.from_radius(Fraction('1e-15'), center, Fraction)
+        maxiter = 8000
+        counts = list(iter_raster(area, Grid(4), maxiter).iter_counts())
+
+        xs = [area.min.x + area.delta.x * i / 4 for i in range(5)]
+        ys = [area.max.y - area.delta.y * j / 4 for j in range(5)]
+        expected = [exact_count(x, y, maxiter) for y in ys for x in xs]
+        self.assertEqual([-1 if i is None else i for i in counts], expected)
+        self.assertGreater(len(set(counts)), 1)
+
+    def test_candidates(self):
+        area = Area.from_radius(Fraction(1), (-1, 0), Fraction)
+        values = list(iter_raster(area, Grid(2)))
+
+        self.assertEqual([c for c, _ in values], [
+            -2+1j, -1+1j, 1j,
+            -2+0j, -1+0j, 0j,
+            -2-1j, -1-1j, -1j,
+            ])
+        self.assertEqual([i for _, i in values], [
+            0, 2, None,
+            None, None, None,
+            0, 2, None,
+            ])
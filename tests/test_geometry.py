@@ -1,5 +1,7 @@
 
+from fractions import Fraction
 import math
+import pickle
 from types import SimpleNamespace as ns
 import unittest
 
@@ -148,6 +150,12 @@ class GridTests(unittest.TestCase):
                 with self.assertRaises(IndexError):
                     grid[value]
 
+    def test_pickle(self):
+        grid = Grid(200, 300)
+        copied = pickle.loads(pickle.dumps(grid))
+
+        self.assertEqual((copied.width, copied.height), (200, 300))
+
     def test_iter_floats(self):
         grid = Grid(4, 7)
         floats = list(grid.iter_floats(-0.1, 0.9, 2.5, -1.0))
@@ -163,6 +171,41 @@ class GridTests(unittest.TestCase):
             (-.1, -1.0), (.15, -1.0), (.40, -1.0), (.65, -1.0), (.9, -1.0),
             ])
 
+    def test_axes(self):
+        grid = Grid(4, 7)
+        xs, ys = grid.axes(-0.1, 0.9, 2.5, -1.0)
+        floats = [(x, y) for y in ys for x in xs]
+
+        self.assertEqual(floats, list(grid.iter_floats(-0.1, 0.9, 2.5, -1.0)))
+
+    def test_iter_rows(self):
+        grid = Grid(4, 7)
+        xs, ys = grid.axes(-0.1, 0.9, 2.5, -1.0)
+        for rows, expected in [(1, [[y] for y in ys]),
+                               (3, [ys[:3], ys[3:6], ys[6:]]),
+                               (8, [ys]),
+                               (20, [ys]),
+                               ]:
+            with self.subTest(rows):
+                bands = list(grid.iter_rows(-0.1, 0.9, 2.5, -1.0, rows))
+
+                self.assertEqual([list(b) for _, b in bands],
+                                 [list(e) for e in expected])
+                for bandxs, _ in bands:
+                    self.assertEqual(bandxs, xs)
+
+    def test_iter_rows_bad(self):
+        with self.assertRaises(ValueError):
+            list(Grid(4).iter_rows(0, 1, 0, 1, 0))
+
+    def test_subarea(self):
+        area = Area((-0.1, -1.0), (0.9, 2.5))
+        grid = Grid(4, 7)
+        subarea, subgrid = grid.subarea(area, range(1, 5, 2), range(2, 8))
+
+        self.assertEqual(subarea, Area((0.15, -1.0), (0.65, 1.5)))
+        self.assertEqual((subgrid.width, subgrid.height), (1, 5))
+
     def test_iter_points(self):
         start = Point2D(1, 2)
         end = Point2D(3, -2)
@@ -260,6 +303,32 @@ class Point2DTests(unittest.TestCase):
                 with self.assertRaises(ValueError):
                     Point2D.parse(raw)
 
+    def test_parse_valuetype(self):
+        p = Point2D.parse('-0.75,0.1', Fraction)
+
+        self.assertEqual(p, (Fraction(-3, 4), Fraction(1, 10)))
+        self.assertIsInstance(p.x, Fraction)
+
+    def test_pickle_valuetype(self):
+        p = Point2D(Fraction(1, 3), 2, Fraction)
+        copied = pickle.loads(pickle.dumps(p))
+
+        self.assertEqual(copied, p)
+        self.assertIsInstance(copied.x, Fraction)
+
+    def test_parse_valuetype_complex(self):
+        tests = {
+                '-0.75+0.1j': (Fraction(-3, 4), Fraction(1, 10)),
+                '1e-30-2.5E-40i': (Fraction(1, 10**30),
+                                   Fraction(-1, 4 * 10**39)),
+                '.5 + 1.j': (Fraction(1, 2), Fraction(1)),
+                }
+        for raw, expected in tests.items():
+            with self.subTest(repr(raw)):
+                p = Point2D.parse(raw, Fraction)
+
+                self.assertEqual(p, expected)
+
     def test_parse_empty(self):
         p = Point2D.parse('')
 
@@ -303,6 +372,27 @@ class Point2DTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             Point2D(1, None)
 
+    def test_keep_valuetype(self):
+        p = Point2D(1, 2, Fraction)
+        results = [p + 1, p - 1, p * 2, p / 3, p // 2, -p, ~p, round(p)]
+        for result in results:
+            with self.subTest(result):
+                self.assertIsInstance(result.x, Fraction)
+                self.assertIsInstance(result.y, Fraction)
+
+    def test_int_values(self):
+        p = Point2D(3, 5, None)
+        tests = [
+                (p / 2, (1.5, 2.5)),
+                (p + 0.5, (3.5, 5.5)),
+                (p * 0.5, (1.5, 2.5)),
+                (-p, (-3, -5)),
+                ]
+        for result, expected in tests:
+            with self.subTest(result):
+                self.assertEqual(result, expected)
+                self.assertIsInstance(result.x, float)
+
     def test_str(self):
         ptstr = str(Point2D(1.0, 1.0))
 
@@ -509,6 +599,32 @@ class AreaTests(unittest.TestCase):
     def test_from_radius(self):
         Area.from_radius()
 
+    def test_from_radius_valuetype(self):
+        center = Point2D.parse('-0.75,0.1', Fraction)
+        area = Area.from_radius(Fraction('1e-50'), center, Fraction)
+        delta = area.delta
+
+        self.assertEqual(delta, (Fraction(2, 10**50), Fraction(2, 10**50)))
+        self.assertEqual(area.center, center)
+
+    def test_from_radius_strings(self):
+        digits = '0.1000000000000000000000000000001'
+        area = Area.from_radius('1e-40', '-0.75,' + digits, Fraction)
+
+        self.assertEqual(area.center, (Fraction(-3, 4), Fraction(digits)))
+        self.assertEqual(area.delta.y, Fraction(2, 10**40))
+
+    def test_center(self):
+        area = Area(self.MIN, (3, 5))
+        center = area.center
+
+        self.assertEqual(center, (1, 2))
+
+    def test_center_int_values(self):
+        area = Area(Point2D(-1, -1, None), Point2D(2, 2, None))
+
+        self.assertEqual(area.center, (0.5, 0.5))
+
     def test_from_sides(self):
         # Note that MAX.x was passed as x1.
         area = Area.from_sides(self.MAX.x, self.MIN.x, self.MIN.y, self.MAX.y)
@@ -0,0 +1,32 @@
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+
+
+class IterBatchesTests(unittest.TestCase):
+
+    AREA = Area.from_radius(1.5, (-0.75, 0))
+
+    def test_matches_iter_raster(self):
+        grid = Grid(10, 40)
+        expected = list(imaginary.iter_raster(self.AREA, grid))
+        for rows in (None, 1, 3, 41, 100):
+            with self.subTest(rows):
+                batches = list(imaginary.iter_batches(self.AREA, grid, rows))
+                candidates = [c for batch in batches for c in batch]
+
+                self.assertEqual(candidates, expected)
+
+    def test_batch_size(self):
+        grid = Grid(10, 40)
+        for rows, expected in [(None, [16, 16, 9]),
+                               (1, [1] * 41),
+                               (20, [20, 20, 1]),
+                               (41, [41]),
+                               ]:
+            with self.subTest(rows):
+                batches = imaginary.iter_batches(self.AREA, grid, rows)
+                sizes = [len(batch) // 11 for batch in batches]
+
+                self.assertEqual(sizes, expected)
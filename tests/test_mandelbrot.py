@@ -1,7 +1,63 @@
 
 import unittest
 
-from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import (
+        SMOOTH_BAILOUT, in_main_bulbs, iter_distances, iter_mandelbrot,
+        iter_mandelbrot_batches, iter_orbits, iter_periods, iter_smooth)
+
+
+class InMainBulbsTests(unittest.TestCase):
+
+    def test_inside(self):
+        values = [0j, -0.5+0j, 0.2+0.2j, -0.6+0.2j, 0.25+0j, -1+0j,
+                  -1.2+0.1j, -0.1+0.6j, -0.1-0.6j]
+        for c in values:
+            with self.subTest(c):
+                found = in_main_bulbs(c)
+
+                self.assertTrue(found)
+
+    def test_outside(self):
+        values = [0.26+0j, -1.26+0j, -0.75+0.2j, 0.7j, -1.5+0j, 1+1j,
+                  -0.1+0.7j, -1.8+0j]
+        for c in values:
+            with self.subTest(c):
+                found = in_main_bulbs(c)
+
+                self.assertFalse(found)
+
+
+class IterPeriodsTests(unittest.TestCase):
+
+    def test_periods(self):
+        candidates = [0j, -1+0j, -0.1+0.1j, -1.1+0.1j, 1j, 1+0j]
+        periods = list(iter_periods(candidates, 1000))
+
+        self.assertEqual(periods, [
+            (0j, None, 1),
+            (-1+0j, None, 2),
+            (-0.1+0.1j, None, 1),
+            (-1.1+0.1j, None, 2),
+            (1j, None, 2),
+            (1+0j, 2, None),
+            ])
+
+    def test_bulbs(self):
+        candidates = [0j, -1+0j, 0.7j]
+        periods = list(iter_periods(candidates, 1000, bulbs=True))
+
+        self.assertEqual(periods, [
+            (0j, None, 1),
+            (-1+0j, None, 2),
+            (0.7j, 12, None),
+            ])
+
+    def test_not_found(self):
+        periods = list(iter_periods([0.25+0j], 100))
+
+        self.assertEqual(periods, [(0.25+0j, None, None)])
 
 
 class IterMandelbrotTests(unittest.TestCase):
@@ -82,3 +138,145 @@ class IterMandelbrotTests(unittest.TestCase):
         maxiter = object()
         with self.assertRaises(TypeError):
             list(iter_mandelbrot([0j], maxiter))
+
+    def test_bulbs(self):
+        area = Area.from_radius(2.1)
+        grid = Grid(60, 40)
+        candidates = list(imaginary.iter_raster(area, grid))
+        expected = list(iter_mandelbrot(candidates))
+        mandelbrot = list(iter_mandelbrot(candidates, bulbs=True))
+
+        self.assertEqual(mandelbrot, expected)
+
+    def test_periodicity(self):
+        area = Area.from_radius(0.01, (-0.745, 0.1))
+        grid = Grid(40)
+        candidates = list(imaginary.iter_raster(area, grid))
+        expected = list(iter_mandelbrot(candidates, 1000))
+        mandelbrot = list(iter_mandelbrot(candidates, 1000,
+                                          periodicity=True))
+
+        self.assertEqual(mandelbrot, expected)
+
+
+class IterOrbitsTests(unittest.TestCase):
+
+    def test_from_zero(self):
+        candidates = [0.1j * i for i in range(10)]
+        candidates.extend([c + 1 for c in candidates])
+        expected = list(iter_mandelbrot(candidates))
+        orbits = iter_orbits((c, 0) for c in candidates)
+
+        self.assertEqual([(c, i) for c, i, _ in orbits], expected)
+
+    def test_resume(self):
+        area = Area.from_radius(0.01, (-0.745, 0.1))
+        candidates = list(imaginary.iter_raster(area, Grid(20)))
+        expected = list(iter_mandelbrot(candidates, 500))
+        first = list(iter_orbits(((c, 0) for c in candidates), 100))
+        resumed = iter_orbits(((c, z) for c, _, z in first), 500, start=100)
+        values = [(c, i if i is not None else j)
+                  for (c, i, _), (_, j, _) in zip(first, resumed)]
+
+        self.assertEqual(values, expected)
+
+
+class IterSmoothTests(unittest.TestCase):
+
+    def test_range(self):
+        candidates = [0.1j * i for i in range(10)]
+        candidates.extend([c + 1 for c in candidates])
+        for (c, smooth), (_, i) in zip(iter_smooth(candidates, 1000),
+                                       iter_mandelbrot(candidates, 1000)):
+            with self.subTest(c):
+                if i is None:
+                    self.assertIsNone(smooth)
+                else:
+                    # The bigger bailout takes a few more iterations.
+                    self.assertGreaterEqual(smooth, i)
+                    self.assertLess(smooth, i + 5)
+
+    def test_continuous(self):
+        # Along a ray out from the set, the counts change a little at a
+        # time, rather than in steps.
+        candidates = [0.5 + 0.01 * k for k in range(100)]
+        values = [s for _, s in iter_smooth(candidates)]
+        jumps = [a - b for a, b in zip(values, values[1:])]
+
+        self.assertTrue(all(0 < jump < 1 for jump in jumps))
+
+    def test_bailout(self):
+        c = 1 + 1j
+        (_, low), = iter_smooth([c], bailout=4.0)
+        (_, high), = iter_smooth([c], bailout=SMOOTH_BAILOUT)
+
+        self.assertLess(low, high)
+
+    def test_bulbs(self):
+        area = Area.from_radius(2.1)
+        candidates = list(imaginary.iter_raster(area, Grid(30, 20)))
+        expected = list(iter_smooth(candidates, 50))
+        values = list(iter_smooth(candidates, 50, bulbs=True))
+
+        self.assertEqual(values, expected)
+
+
+class IterDistancesTests(unittest.TestCase):
+
+    def test_counts(self):
+        area = Area.from_radius(2.1)
+        candidates = list(imaginary.iter_raster(area, Grid(30, 20)))
+        expected = list(iter_mandelbrot(candidates, 50))
+        values = [(c, i) for c, i, _ in iter_distances(candidates, 50)]
+
+        self.assertEqual(values, expected)
+
+    def test_estimates(self):
+        # The set's left tip is at -2, so the distance from a point on
+        # the real axis past it is known exactly.
+        for x in [-2.01, -2.1, -2.5, -3]:
+            with self.subTest(x):
+                (_, _, distance), = iter_distances([x], 1000)
+
+                self.assertLessEqual(distance, -2 - x)
+                self.assertGreater(distance, (-2 - x) * 0.9)
+
+    def test_lower_bound(self):
+        # Near the cusp at 0.25 the estimate is poor, but still low.
+        for x in [0.26, 0.3, 0.5, 1, 2]:
+            with self.subTest(x):
+                (_, _, distance), = iter_distances([x], 1000)
+
+                self.assertLessEqual(distance, x - 0.25)
+
+    def test_in_set(self):
+        values = list(iter_distances([0, -1, 0.25j], 100))
+
+        self.assertEqual([(i, d) for _, i, d in values], [(None, 0.0)] * 3)
+
+    def test_bulbs(self):
+        area = Area.from_radius(2.1)
+        candidates = list(imaginary.iter_raster(area, Grid(30, 20)))
+        expected = list(iter_distances(candidates, 50))
+        values = list(iter_distances(candidates, 50, bulbs=True))
+
+        self.assertEqual(values, expected)
+
+
+class IterMandelbrotBatchesTests(unittest.TestCase):
+
+    def test_matches_unbatched(self):
+        area = Area.from_radius(2.1)
+        grid = Grid(30, 20)
+        candidates = list(imaginary.iter_raster(area, grid))
+        expected = list(iter_mandelbrot(candidates, 50, bulbs=True))
+        batches = imaginary.iter_batches(area, grid, 4)
+        results = list(iter_mandelbrot_batches(batches, 50, bulbs=True))
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual([v for r in results for v in r], expected)
+
+    def test_no_batches(self):
+        results = list(iter_mandelbrot_batches([]))
+
+        self.assertEqual(results, [])
@@ -0,0 +1,162 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_distances, iter_mandelbrot, iter_smooth
+from mandelbrot._raster import IterationRaster
+if numpy is not None:
+    from mandelbrot import _numpy
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class EscapeCountsTests(unittest.TestCase):
+
+    def test_basic(self):
+        candidates = [0.1j * i for i in range(10)]
+        candidates.extend([c + 1 for c in candidates])
+        counts = _numpy.escape_counts(candidates)
+
+        self.assertEqual(counts.tolist(), [
+            -1, -1, -1, -1, -1, -1, -1, 12, 17, 7,
+            2, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+            ])
+
+    def test_maxiter(self):
+        candidates = [0.1j * i for i in range(10)]
+        candidates.extend([c + 1 for c in candidates])
+        counts = _numpy.escape_counts(candidates, 2)
+
+        self.assertEqual(counts.tolist(), [-1] * 11 + [1] * 9)
+
+    def test_orbits(self):
+        area = Area.from_radius(0.01, (-0.745, 0.1))
+        candidates = _numpy.complex_plane(area, Grid(20))
+        expected = _numpy.escape_counts(candidates, 500)
+        orbits = numpy.zeros_like(candidates)
+        first = _numpy.escape_counts(candidates, 100, orbits=orbits)
+        second = _numpy.escape_counts(candidates, 500, orbits=orbits,
+                                      start=100)
+        counts = numpy.where(first >= 0, first, second)
+
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_orbits_periodicity(self):
+        candidates = numpy.zeros(3, dtype=complex)
+        with self.assertRaises(ValueError):
+            _numpy.escape_counts(candidates, orbits=candidates.copy(),
+                                 periodicity=True)
+
+    def test_smooth_counts(self):
+        area = Area.from_radius(2.1)
+        candidates = list(imaginary.iter_raster(area, Grid(30, 20)))
+        expected = [-1 if s is None else s
+                    for _, s in iter_smooth(candidates, 50)]
+        counts = _numpy.smooth_counts(candidates, 50, bulbs=True)
+
+        self.assertEqual(counts.dtype, numpy.float32)
+        for value, smooth in zip(counts.tolist(), expected):
+            self.assertAlmostEqual(value, smooth, places=4)
+
+    def test_distance_estimates(self):
+        area = Area.from_radius(2.1)
+        candidates = list(imaginary.iter_raster(area, Grid(30, 20)))
+        expected = list(iter_distances(candidates, 50))
+        counts, distances = _numpy.distance_estimates(candidates, 50,
+                                                      bulbs=True)
+
+        self.assertEqual(counts.tolist(),
+                         [-1 if i is None else i for _, i, _ in expected])
+        for value, (_, _, distance) in zip(distances.tolist(), expected):
+            self.assertAlmostEqual(value, distance)
+
+    def test_shape(self):
+        candidates = numpy.zeros((3, 4), dtype=complex)
+        counts = _numpy.escape_counts(candidates)
+
+        self.assertEqual(counts.shape, (3, 4))
+
+    def test_bulbs(self):
+        candidates = _numpy.complex_plane(Area.from_radius(2.1), Grid(60, 40))
+        expected = _numpy.escape_counts(candidates)
+        counts = _numpy.escape_counts(candidates, bulbs=True)
+
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_periodicity(self):
+        candidates = _numpy.complex_plane(Area.from_radius(1.5, (-0.75, 0)),
+                                          Grid(40))
+        expected = _numpy.escape_counts(candidates, 1000)
+        counts = _numpy.escape_counts(candidates, 1000, periodicity=True)
+
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_periods(self):
+        candidates = numpy.array([0j, -1+0j, -1.1+0.1j, 1+0j, 0.25+0j])
+        periods = numpy.empty(candidates.shape, dtype=int)
+        counts = _numpy.escape_counts(candidates, 1000,
+                                      periodicity=True, periods=periods)
+
+        self.assertEqual(counts.tolist(), [-1, -1, -1, 2, -1])
+        self.assertEqual(periods.tolist(), [1, 2, 2, 0, 0])
+
+    def test_in_main_bulbs(self):
+        candidates = numpy.array([0j, -1+0j, 0.26+0j, 0.7j])
+        found = _numpy.in_main_bulbs(candidates)
+
+        self.assertEqual(found.tolist(), [True, True, False, False])
+
+    def test_no_candidates(self):
+        counts = _numpy.escape_counts([])
+
+        self.assertEqual(counts.tolist(), [])
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class IterRasterTests(unittest.TestCase):
+
+    def test_complex_plane(self):
+        area = Area.from_sides(-0.1, 0.9, -1.0, 2.5)
+        grid = Grid(4, 7)
+        plane = _numpy.complex_plane(area, grid)
+        expected = list(imaginary.iter_raster(area, grid))
+
+        self.assertEqual(plane.shape, (8, 5))
+        self.assertEqual(plane.reshape(-1).tolist(), expected)
+
+    def test_matches_scalar(self):
+        tests = [
+                (Area.from_radius(1.5, (-0.75, 0)), Grid(40), None),
+                (Area.from_radius(2.1), Grid(30, 20), 50),
+                (Area.from_radius(0.01, (-0.745, 0.1)), Grid(25), 500),
+                ]
+        for area, grid, maxiter in tests:
+            with self.subTest((area, grid, maxiter)):
+                candidates = imaginary.iter_raster(area, grid)
+                expected = list(iter_mandelbrot(candidates, maxiter))
+                raster = _numpy.iter_raster(area, grid, maxiter)
+
+                self.assertIsInstance(raster, IterationRaster)
+                self.assertEqual(list(raster), expected)
+
+    def test_iter_mandelbrot_batches(self):
+        area = Area.from_radius(2.1)
+        grid = Grid(30, 20)
+        candidates = imaginary.iter_raster(area, grid)
+        expected = list(iter_mandelbrot(candidates, 50))
+        batches = imaginary.iter_batches(area, grid, 8)
+        results = list(_numpy.iter_mandelbrot_batches(batches, 50))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual([v for r in results for v in r], expected)
+
+    def test_iter_mandelbrot(self):
+        candidates = [0.1j * i for i in range(10)]
+        expected = list(iter_mandelbrot(candidates))
+        values = list(_numpy.iter_mandelbrot(iter(candidates)))
+
+        self.assertEqual(values, expected)
@@ -0,0 +1,54 @@
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._parallel import iter_bands, iter_raster
+
+
+class IterBandsTests(unittest.TestCase):
+
+    def test_even(self):
+        bands = list(iter_bands(Grid(4, 7), 4))
+
+        self.assertEqual(bands, [range(0, 4), range(4, 8)])
+
+    def test_remainder(self):
+        bands = list(iter_bands(Grid(4, 5), 4))
+
+        self.assertEqual(bands, [range(0, 4), range(4, 6)])
+
+    def test_default(self):
+        bands = list(iter_bands(Grid(4, 5)))
+
+        self.assertEqual(bands, [range(0, 6)])
+
+    def test_negative(self):
+        with self.assertRaises(ValueError):
+            list(iter_bands(Grid(4, 5), -1))
+
+
+class IterRasterTests(unittest.TestCase):
+
+    AREA = Area.from_radius(1.5, (-0.75, 0))
+    GRID = Grid(30, 20)
+
+    def test_matches_serial(self):
+        candidates = imaginary.iter_raster(self.AREA, self.GRID)
+        expected = list(iter_mandelbrot(candidates, 50))
+        values = list(iter_raster(self.AREA, self.GRID, 50,
+                                  workers=2, rows=3))
+
+        self.assertEqual(values, expected)
+
+    def test_matches_serial_numpy(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest('numpy not installed')
+        candidates = imaginary.iter_raster(self.AREA, self.GRID)
+        expected = list(iter_mandelbrot(candidates, 50))
+        values = list(iter_raster(self.AREA, self.GRID, 50,
+                                  workers=2, rows=3, numpy=True))
+
+        self.assertEqual(values, expected)
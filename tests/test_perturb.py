@@ -0,0 +1,101 @@
+from fractions import Fraction
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from mandelbrot._engines import resolve_engine, symmetric_for
+from mandelbrot._geometry import Area, Grid, Point2D
+if numpy is not None:
+    from mandelbrot import _numpy, _perturb
+
+from .util import exact_count
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class EscapeCountsTests(unittest.TestCase):
+
+    def test_shallow(self):
+        center = Point2D(-0.75, 0, Fraction)
+        area = Area.from_radius(Fraction(3, 2), center, Fraction)
+        grid = Grid(40)
+        plane = _numpy.complex_plane(Area.from_radius(1.5, center), grid)
+        expected = _numpy.escape_counts(plane)
+        counts = _perturb.escape_counts(area, grid)
+
+        self.assertEqual(counts.tolist(), expected.tolist())
+
+    def test_deep(self):
+        center = Point2D.parse('-0.743643887037158704752191506114774,'
+                               '0.131825904205311970493132056385139',
+                               Fraction)
+        area = Area.from_radius(Fraction('1e-20'), center, Fraction)
+        grid = Grid(4)
+        maxiter = 20000
+        counts = _perturb.escape_counts(area, grid, maxiter)
+
+        xs = [area.min.x + area.delta.x * i / 4 for i in range(5)]
+        ys = [area.max.y - area.delta.y * j / 4 for j in range(5)]
+        expected = [[exact_count(x, y, maxiter) for x in xs] for y in ys]
+        self.assertEqual(counts.tolist(), expected)
+        self.assertGreater(len(set(counts.reshape(-1).tolist())), 1)
+
+    def test_precision(self):
+        tests = [
+                (Area.from_radius(1.5), 17),
+                (Area.from_radius(Fraction('1e-50'), None, Fraction), 63),
+                ]
+        for area, expected in tests:
+            with self.subTest(area):
+                precision = _perturb.precision_for(area, Grid(400))
+
+                self.assertEqual(precision, expected)
+
+    def test_precision_one_row(self):
+        area = Area.from_radius(Fraction('1e-50'), None, Fraction)
+        for grid in [Grid(5, 0), Grid(0, 5)]:
+            with self.subTest(grid):
+                precision = _perturb.precision_for(area, grid)
+
+                self.assertEqual(precision, 61)
+
+    def test_iter_raster(self):
+        area = Area.from_radius(Fraction(1), (-1, 0), Fraction)
+        values = list(_perturb.iter_raster(area, Grid(2)))
+
+        self.assertEqual([c for c, _ in values], [
+            -2+1j, -1+1j, 1j,
+            -2+0j, -1+0j, 0j,
+            -2-1j, -1-1j, -1j,
+            ])
+        self.assertEqual([i for _, i in values], [
+            0, 2, None,
+            None, None, None,
+            0, 2, None,
+            ])
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class SymmetryTests(unittest.TestCase):
+
+    def test_default_view(self):
+        iter_raster = resolve_engine('perturb')
+        wrapped = symmetric_for('perturb', iter_raster)
+        area = Area.from_radius(Fraction(3, 2), (-0.75, 0), Fraction)
+        grid = Grid(40)
+        expected = list(iter_raster(area, grid, 100))
+        values = list(wrapped(area, grid, 100))
+
+        self.assertEqual(values, expected)
+
+    def test_lone_row(self):
+        iter_raster = resolve_engine('perturb')
+        wrapped = symmetric_for('perturb', iter_raster)
+        area = Area.from_radius(Fraction(3, 2), (-0.75, -1.35), Fraction)
+        grid = Grid(10)
+        expected = list(iter_raster(area, grid, 100))
+        values = list(wrapped(area, grid, 100))
+
+        self.assertEqual(values, expected)
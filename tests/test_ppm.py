@@ -0,0 +1,202 @@
+import io
+import os
+import tempfile
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._antialias import Supersamples, find_edges
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import IterationRaster, SMOOTH_TYPECODE
+from mandelbrot.ui import _ppm
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class EncodeTests(unittest.TestCase):
+
+    def test_header(self):
+        image = _ppm.encode([(None, 0)] * 6, Grid(2, 1))
+
+        self.assertEqual(bytes(image[:11]), b'P6 3 2 255 ')
+
+    def test_pixels(self):
+        values = [(None, i) for i in (None, 0, 4, 5, 19, 20, 255, 1000)]
+        image = _ppm.encode(values, Grid(7, 0))
+
+        pixels = bytes(image[len(_ppm.header(Grid(7, 0))):])
+        self.assertEqual(pixels, b''.join([
+            b'\x00\x00\x00',
+            b'\xff\x00\x00',
+            b'\xaf\x00\x00',
+            b'\x00\x9b\x00',
+            b'\x00\x01\x00',
+            b'\x00\x00\xaf',
+            b'\x00\x00\x01',
+            b'\x00\x00\x01',
+            ]))
+
+    def test_palette(self):
+        palette = [b'aaa', b'bbb', b'...']
+        values = [(None, i) for i in (0, 1, 2, None)]
+        image = _ppm.encode(values, Grid(3, 0), palette)
+
+        self.assertTrue(bytes(image).endswith(b'aaabbbbbb...'))
+
+    def test_raster(self):
+        counts = [None, 0, 4, 5, 19, 20, 255, 1000]
+        raster = IterationRaster.from_counts(Area.from_radius(1), Grid(7, 0),
+                                             counts, 2000)
+        image = _ppm.encode(raster, Grid(7, 0))
+
+        expected = _ppm.encode([(None, i) for i in counts], Grid(7, 0))
+        self.assertEqual(image, expected)
+
+    def test_smooth(self):
+        palette = [b'\x00\x00\x00', b'\x10\x20\x40', b'\x10\x20\x40',
+                   b'...']
+        counts = [0.5, 0.25, 1.5, 2.5, None]
+        raster = IterationRaster.from_counts(Area.from_radius(1), Grid(4, 0),
+                                             counts,
+                                             typecode=SMOOTH_TYPECODE)
+        image = _ppm.encode(raster, Grid(4, 0), palette)
+
+        self.assertTrue(bytes(image).endswith(b''.join([
+            b'\x08\x10\x20',
+            b'\x04\x08\x10',
+            b'\x10\x20\x40',
+            b'\x10\x20\x40',
+            b'...',
+            ])))
+
+    def test_supersamples(self):
+        palette = [b'\x00\x00\x00', b'\x10\x20\x40', b'...']
+        values = [(None, i) for i in (0, 1, None, 0)]
+        supersamples = {0: (1, 1, 1, 1), 2: (0, 0, 0, 0)}
+        image = _ppm.encode(values, Grid(1, 1), palette,
+                            supersamples=supersamples)
+
+        self.assertTrue(bytes(image).endswith(b''.join([
+            b'\x0d\x1a\x33',
+            b'\x10\x20\x40',
+            b'\x09\x09\x09',
+            b'\x00\x00\x00',
+            ])))
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy(self):
+        counts = [None, 0, 4, 5, 19, 20, 255, 1000]
+        grid = Grid(3, 1)
+        raster = IterationRaster.from_counts(Area.from_radius(1), grid,
+                                             counts, 2000)
+        supersamples = Supersamples(
+                numpy.array([1, 2, 7]),
+                numpy.array([[0, 1, 2, 3], [-1, -1, 4, 4],
+                             [300, -1, 30, 3]]))
+        for samples in [None, supersamples]:
+            with self.subTest(samples):
+                image = _ppm.encode(raster, grid, supersamples=samples,
+                                    numpy=True)
+
+                expected = _ppm.encode(
+                        raster, grid,
+                        supersamples=samples and dict(samples.items()))
+                self.assertEqual(image, expected)
+
+    def test_wrong_size(self):
+        for count in (3, 5):
+            with self.subTest(count):
+                with self.assertRaises(ValueError):
+                    _ppm.encode([(None, 0)] * count, Grid(1, 1))
+
+
+class FindSupersamplesTests(unittest.TestCase):
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_numpy_edges(self):
+        area = Area.from_radius(1.5, (-0.75, 0.1))
+        grid = Grid(40)
+        candidates = imaginary.iter_raster(area, grid)
+        raster = IterationRaster.from_values(
+                area, grid, iter_mandelbrot(candidates, 300), 300)
+        lookup = _ppm._Lookup(_ppm.PALETTE)
+        lookup[raster.sentinel] = _ppm.PALETTE[-1]
+        colors = [lookup[i] for i in raster.counts]
+        expected = find_edges(colors, grid, _ppm._contrasting)
+        edges = _ppm._find_edges_numpy(raster, grid, _ppm.PALETTE)
+
+        self.assertTrue(expected)
+        self.assertEqual(edges, expected)
+
+
+class RenderTests(unittest.TestCase):
+
+    def test_file(self):
+        counts = [0, None, 1, 2]
+
+        def iter_raster(area, grid, scale):
+            return ((None, i) for i in counts)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'out.ppm')
+            _ppm.render(iter_raster, Area.from_radius(1), Grid(1, 1), None,
+                        filename=filename)
+            with open(filename, 'rb') as infile:
+                data = infile.read()
+
+        expected = _ppm.encode([(None, i) for i in counts], Grid(1, 1))
+        self.assertEqual(data, bytes(expected))
+
+    def test_antialias(self):
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(20)
+        calls = []
+
+        def iter_raster(area, grid, scale):
+            calls.append(grid)
+            candidates = imaginary.iter_raster(area, grid)
+            return iter_mandelbrot(candidates, scale)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'out.ppm')
+            _ppm.render(iter_raster, area, grid, 50, filename=filename,
+                        antialias=True)
+            with open(filename, 'rb') as infile:
+                data = infile.read()
+
+        plain = _ppm.encode(iter_raster(area, grid, 50), grid)
+        # Only the edges were supersampled.
+        self.assertGreater(len(calls), 2)
+        self.assertLess(sum(len(g) for g in calls[1:-1]), len(grid))
+        self.assertEqual(len(data), len(plain))
+        self.assertNotEqual(data, bytes(plain))
+
+    def test_antialias_sampler(self):
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(20)
+        calls = []
+        samples = []
+
+        def iter_raster(area, grid, scale):
+            calls.append(grid)
+            candidates = imaginary.iter_raster(area, grid)
+            return iter_mandelbrot(candidates, scale)
+
+        def sampler(area, grid, scale):
+            samples.append(grid)
+            return iter_raster(area, grid, scale)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'out.ppm')
+            _ppm.render(iter_raster, area, grid, 50, filename=filename,
+                        antialias=True, sampler=sampler)
+
+        # Only the full render went through iter_raster() itself.
+        self.assertEqual(len(calls) - len(samples), 1)
+        self.assertGreater(len(samples), 1)
+
+    def test_write(self):
+        out = io.BytesIO()
+        _ppm.write([(None, None)], Grid(0, 0), out)
+
+        self.assertEqual(out.getvalue(), b'P6 1 1 255 \x00\x00\x00')
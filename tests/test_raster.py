@@ -0,0 +1,149 @@
+from array import array
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._raster import (
+        _UNKNOWN, IterationRaster, SMOOTH_TYPECODE, _PointEngine,
+        sentinel_for, typecode_for)
+
+
+class TypecodeTests(unittest.TestCase):
+
+    def test_typecode_for(self):
+        for maxiter, expected in [(None, 'H'),
+                                  (100, 'H'),
+                                  (65534, 'H'),
+                                  (65535, 'I'),
+                                  (2 ** 32, 'Q'),
+                                  ]:
+            with self.subTest(maxiter):
+                self.assertEqual(typecode_for(maxiter), expected)
+
+    def test_too_big(self):
+        with self.assertRaises(ValueError):
+            typecode_for(2 ** 64)
+
+    def test_sentinel_for(self):
+        self.assertEqual(sentinel_for('H'), 65535)
+        self.assertEqual(sentinel_for('I'), 2 ** 32 - 1)
+
+
+class IterationRasterTests(unittest.TestCase):
+
+    AREA = Area.from_radius(1.5, (-0.75, 0))
+    GRID = Grid(3, 1)
+    COUNTS = [0, 1, None, 2,
+              None, 5, 99, 3]
+
+    def test_from_counts(self):
+        raster = IterationRaster.from_counts(self.AREA, self.GRID,
+                                             self.COUNTS, 100)
+
+        self.assertEqual(raster.typecode, 'H')
+        self.assertEqual(raster.sentinel, 65535)
+        self.assertEqual(len(raster), 8)
+        self.assertEqual(list(raster.iter_counts()), self.COUNTS)
+        self.assertEqual(raster.counts.tolist(),
+                         [0, 1, 65535, 2, 65535, 5, 99, 3])
+
+    def test_big_maxiter(self):
+        raster = IterationRaster.from_counts(self.AREA, Grid(0, 0),
+                                             [70000], 100000)
+
+        self.assertEqual(raster.typecode, 'I')
+        self.assertEqual(list(raster.iter_counts()), [70000])
+
+    def test_rows(self):
+        raster = IterationRaster.from_counts(self.AREA, self.GRID,
+                                             self.COUNTS)
+        rows = [row.tolist() for row in raster.iter_rows()]
+
+        self.assertEqual(rows, [[0, 1, 65535, 2], [65535, 5, 99, 3]])
+        self.assertEqual(raster.row(1).tolist(), rows[1])
+        with self.assertRaises(IndexError):
+            raster.row(2)
+
+    def test_no_copy(self):
+        raster = IterationRaster.from_counts(self.AREA, self.GRID,
+                                             self.COUNTS)
+        raster.row(1)[0] = 7
+
+        self.assertEqual(raster.counts[4], 7)
+
+    def test_iter(self):
+        candidates = list(imaginary.iter_raster(self.AREA, self.GRID))
+        raster = IterationRaster.from_counts(self.AREA, self.GRID,
+                                             self.COUNTS)
+
+        self.assertEqual(list(raster), list(zip(candidates, self.COUNTS)))
+
+    def test_from_values(self):
+        candidates = imaginary.iter_raster(self.AREA, self.GRID)
+        values = list(iter_mandelbrot(candidates))
+        raster = IterationRaster.from_values(self.AREA, self.GRID, values)
+
+        self.assertEqual(list(raster), values)
+        self.assertIs(IterationRaster.from_values(self.AREA, self.GRID,
+                                                  raster),
+                      raster)
+
+    def test_buffer(self):
+        counts = array('H', range(8))
+        raster = IterationRaster(self.AREA, self.GRID, counts)
+
+        self.assertIs(raster.counts, counts)
+        self.assertEqual(bytes(raster.__buffer__(0)), counts.tobytes())
+
+    def test_smooth(self):
+        counts = [0.5, None, 2.25, 99.75]
+        raster = IterationRaster.from_counts(self.AREA, Grid(1, 1), counts,
+                                             typecode=SMOOTH_TYPECODE)
+
+        self.assertTrue(raster.smooth)
+        self.assertEqual(raster.sentinel, -1)
+        self.assertEqual(list(raster.iter_counts()), counts)
+        self.assertEqual(raster.counts.tolist(), [0.5, -1, 2.25, 99.75])
+
+    def test_bad_counts(self):
+        for counts in [array('H', range(7)),
+                       array('h', range(8)),
+                       array('d', range(8)),
+                       memoryview(array('H', range(16)))[::2],
+                       ]:
+            with self.subTest(counts):
+                with self.assertRaises(ValueError):
+                    IterationRaster(self.AREA, self.GRID, counts)
+
+
+class PointEngineTests(unittest.TestCase):
+
+    def test_compute(self):
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(4)
+        expected = [i for _, i in iter_mandelbrot(
+                imaginary.iter_raster(area, grid), 50)]
+        engine = _PointEngine(area, grid, 50)
+        engine.compute([0, 7, 7, 12])
+        engine.compute([12, 24])
+
+        self.assertEqual(engine.computed, 4)
+        for p, i in enumerate(engine.counts):
+            with self.subTest(p):
+                if p in (0, 7, 12, 24):
+                    self.assertEqual(i, expected[p])
+                else:
+                    self.assertIs(i, _UNKNOWN)
+
+    def test_to_raster(self):
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(4)
+        expected = list(iter_mandelbrot(imaginary.iter_raster(area, grid), 50))
+        engine = _PointEngine(area, grid, 50)
+        engine.compute(range(len(grid)))
+        stats = {}
+        raster = engine.to_raster(stats)
+
+        self.assertEqual([i for _, i in raster], [i for _, i in expected])
+        self.assertEqual(stats, {'computed': len(grid)})
@@ -0,0 +1,52 @@
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._subdivide import iter_raster
+
+
+class IterRasterTests(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        tests = [
+                (Area.from_radius(2.1), Grid(40), None),
+                (Area.from_radius(1.5, (-0.75, 0)), Grid(60, 30), None),
+                (Area.from_radius(0.3, (-0.3, 0)), Grid(50), 1000),
+                (Area.from_radius(0.01, (-0.745, 0.1)), Grid(40), 500),
+                ]
+        for area, grid, maxiter in tests:
+            with self.subTest((area, grid, maxiter)):
+                candidates = imaginary.iter_raster(area, grid)
+                expected = list(iter_mandelbrot(candidates, maxiter))
+                values = list(iter_raster(area, grid, maxiter))
+
+                self.assertEqual(values, expected)
+
+    def test_stats(self):
+        area = Area.from_radius(0.3, (-0.3, 0))
+        grid = Grid(50)
+        stats = {}
+        list(iter_raster(area, grid, 1000, stats=stats))
+
+        self.assertEqual(stats['computed'], 200)
+
+    def test_tiny(self):
+        tests = [Grid(1), Grid(2), Grid(3, 1), Grid(1, 4)]
+        for grid in tests:
+            with self.subTest((grid.width, grid.height)):
+                values = list(iter_raster(Area.from_radius(1), grid))
+
+                self.assertEqual(len(values), len(grid))
+
+    def test_numpy(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest('numpy not installed')
+        area = Area.from_radius(1.5, (-0.75, 0))
+        grid = Grid(40)
+        expected = list(iter_raster(area, grid, bulbs=True))
+        values = list(iter_raster(area, grid, numpy=True, bulbs=True))
+
+        self.assertEqual(values, expected)
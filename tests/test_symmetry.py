@@ -0,0 +1,102 @@
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_smooth
+from mandelbrot._raster import IterationRaster, SMOOTH_TYPECODE
+from mandelbrot._symmetry import mirrored_rows, symmetric
+
+from .util import iter_brute
+
+
+class MirroredRowsTests(unittest.TestCase):
+
+    def test_centered(self):
+        mirrors = mirrored_rows(Area.from_radius(2.1), Grid(4))
+
+        self.assertEqual(mirrors, {3: 1, 4: 0})
+
+    def test_off_center(self):
+        area = Area((-2, -1), (1, 2))
+        mirrors = mirrored_rows(area, Grid(3, 6))
+
+        self.assertEqual(mirrors, {5: 3, 6: 2})
+
+    def test_not_crossing(self):
+        for area in [Area((-2, 0.5), (1, 2)),
+                     Area((-2, -2), (1, -0.5)),
+                     ]:
+            with self.subTest(area):
+                self.assertEqual(mirrored_rows(area, Grid(10)), {})
+
+    def test_not_aligned(self):
+        # The rows straddle the axis without any landing on a mirror.
+        area = Area((-2, -0.9), (1, 1.1))
+        mirrors = mirrored_rows(area, Grid(3, 4))
+
+        self.assertEqual(mirrors, {})
+
+
+class SymmetricTests(unittest.TestCase):
+
+    def test_matches_unmirrored(self):
+        tests = [
+                (Area.from_radius(1.5, (-0.75, 0)), Grid(40)),
+                (Area.from_radius(2.1), Grid(41)),
+                (Area((-2, -1), (1, 0.5)), Grid(30, 45)),
+                (Area((-2, -0.3), (1, 1.5)), Grid(30, 36)),
+                (Area((-2, 0.3), (1, 1.5)), Grid(30)),
+                ]
+        for area, grid in tests:
+            with self.subTest((area, grid)):
+                expected = list(iter_brute(area, grid, 100))
+                values = list(symmetric(iter_brute)(area, grid, 100))
+
+                self.assertEqual(values, expected)
+
+    def test_row_near_axis(self):
+        # The middle row is a hair off the axis, so it is its own mirror.
+        area = Area.from_radius(0.05, (-1.75, 0))
+        grid = Grid(22)
+        expected = [i for _, i in iter_brute(area, grid, 1000)]
+        values = [i for _, i in symmetric(iter_brute)(area, grid, 1000)]
+
+        self.assertNotIn(11, mirrored_rows(area, grid))
+        self.assertEqual(values, expected)
+
+    def test_rows_computed(self):
+        calls = []
+
+        def iter_raster(area, grid, maxiter):
+            return iter_brute(area, grid, maxiter, calls)
+        raster = symmetric(iter_raster)(Area.from_radius(2.1), Grid(40), 50)
+        (subarea, subgrid), = calls
+
+        self.assertIsInstance(raster, IterationRaster)
+        self.assertEqual(len(subgrid.height), 21)
+        self.assertEqual(subarea.min.y, 0)
+        self.assertEqual(subarea.max.y, 2.1)
+
+    def test_smooth(self):
+        def iter_raster(area, grid, maxiter):
+            candidates = imaginary.iter_raster(area, grid)
+            values = iter_smooth(candidates, maxiter)
+            return IterationRaster.from_values(area, grid, values,
+                                               typecode=SMOOTH_TYPECODE)
+        area = Area.from_radius(2.1)
+        expected = iter_raster(area, Grid(20), 50)
+        raster = symmetric(iter_raster)(area, Grid(20), 50)
+
+        self.assertTrue(raster.smooth)
+        self.assertEqual(list(raster), list(expected))
+
+    def test_passthrough(self):
+        calls = []
+
+        def iter_raster(area, grid, maxiter):
+            return iter_brute(area, grid, maxiter, calls)
+        area = Area((-2, 0.5), (1, 2))
+        grid = Grid(10)
+        symmetric(iter_raster)(area, grid, 50)
+
+        self.assertEqual(calls, [(area, grid)])
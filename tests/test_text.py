@@ -0,0 +1,75 @@
+import io
+import unittest
+
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._raster import IterationRaster
+from mandelbrot.ui import _text
+
+
+def _iter_raster(counts):
+    def iter_raster(area, grid, scale):
+        return ((None, i) for i in counts)
+    return iter_raster
+
+
+class RenderTests(unittest.TestCase):
+
+    AREA = Area.from_radius(1)
+
+    def test_rows(self):
+        counts = [None, 0, 1, 2,
+                  3, 4, 5, 19,
+                  20, 100, None, None]
+        out = io.BytesIO()
+        _text.render(_iter_raster(counts), self.AREA, Grid(3, 2), None,
+                     out=out)
+
+        self.assertEqual(out.getvalue().decode(), (
+            '  ..\'\'""\n'
+            '++**XXXX\n'
+            '####    \n'
+            ))
+
+    def test_raster(self):
+        counts = [None, 0, 1, 2,
+                  3, 4, 5, 19,
+                  20, 100, None, None]
+
+        def iter_raster(area, grid, scale):
+            return IterationRaster.from_counts(area, grid, counts)
+        out = io.BytesIO()
+        _text.render(iter_raster, self.AREA, Grid(3, 2), None, out=out)
+
+        self.assertEqual(out.getvalue().decode(), (
+            '  ..\'\'""\n'
+            '++**XXXX\n'
+            '####    \n'
+            ))
+
+    def test_spec(self):
+        counts = [None, 0, 1, 2, 3, 4]
+        out = io.BytesIO()
+        _text.render(_iter_raster(counts), self.AREA, Grid(2, 1), None,
+                     spec={'*': 'XX'}, out=out)
+
+        self.assertEqual(out.getvalue().decode(), (
+            '  XXXX\n'
+            'XXXXXX\n'
+            ))
+
+    def test_many_rows(self):
+        counts = [0] * 2 * (_text.ROWS_PER_WRITE * 2 + 1)
+        out = io.BytesIO()
+        _text.render(_iter_raster(counts), self.AREA,
+                     Grid(1, _text.ROWS_PER_WRITE * 2), None, out=out)
+
+        self.assertEqual(out.getvalue().decode(),
+                         '....\n' * (_text.ROWS_PER_WRITE * 2 + 1))
+
+    def test_unicode(self):
+        counts = [0, None]
+        out = io.BytesIO()
+        _text.render(_iter_raster(counts), self.AREA, Grid(1, 0), None,
+                     spec={0: '██'}, out=out)
+
+        self.assertEqual(out.getvalue().decode(), '██  \n')
@@ -0,0 +1,115 @@
+import shutil
+import tempfile
+import unittest
+
+from mandelbrot._cache import TileCache, cached
+from mandelbrot._engines import resolve_engine, resolve_point_engine
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot.ui import _tk
+
+from .util import iter_brute
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class IterPassesTests(unittest.TestCase):
+
+    # The coordinates of this view are all exact floats.
+    AREA = Area((-2.0, -1.5), (0.5, 1.5))
+    GRID = Grid(40, 24)
+
+    def test_final(self):
+        expected = [i for _, i in iter_brute(self.AREA, self.GRID, None)]
+        passes = list(_tk.iter_passes(iter_brute, self.AREA, self.GRID,
+                                      None))
+        stride, counts = passes[-1]
+
+        self.assertEqual([s for s, _ in passes], [8, 4, 2, 1])
+        self.assertEqual(counts, expected)
+
+    def test_final_points(self):
+        passes = list(_tk.iter_passes(iter_brute, self.AREA, self.GRID,
+                                      None, iter_points=iter_mandelbrot))
+        _, counts = passes[-1]
+
+        expected = [i for _, i in iter_brute(self.AREA, self.GRID, None)]
+        self.assertEqual(counts, expected)
+
+    @unittest.skipIf(numpy is None, 'numpy not installed')
+    def test_final_points_boundary(self):
+        # Re-deriving each lattice's points from its own corners drifts
+        # by a float rounding here, which changes a few counts.
+        area = Area.from_radius(0.01, (-0.745, 0.1))
+        grid = Grid(100)
+        iter_raster = resolve_engine('brute', numpy=True)
+        iter_points = resolve_point_engine('brute', numpy=True)
+        *_, (_, counts) = _tk.iter_passes(iter_raster, area, grid, 1000,
+                                          iter_points=iter_points)
+
+        expected = [i for _, i in iter_raster(area, grid, 1000)]
+        self.assertEqual(counts, expected)
+
+    def test_no_recompute(self):
+        calls = []
+
+        def iter_raster(area, grid, scale):
+            return iter_brute(area, grid, scale, calls)
+        for _ in _tk.iter_passes(iter_raster, self.AREA, self.GRID, None):
+            pass
+
+        self.assertEqual(sum(len(g) for _, g in calls), len(self.GRID))
+
+    def test_cached_points(self):
+        dirname = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dirname)
+        iter_cached = cached(iter_brute, TileCache(dirname), 'brute')
+        calls = []
+
+        def iter_points(candidates, scale):
+            candidates = list(candidates)
+            calls.append(len(candidates))
+            return iter_mandelbrot(candidates, scale)
+        first = list(_tk.iter_passes(iter_cached, self.AREA, self.GRID, 50,
+                                     iter_points=iter_points))
+        computed = sum(calls)
+        second = list(_tk.iter_passes(iter_cached, self.AREA, self.GRID, 50,
+                                      iter_points=iter_points))
+
+        self.assertEqual(computed, len(self.GRID))
+        self.assertEqual(sum(calls), computed)
+        self.assertEqual(second, [first[-1]])
+        self.assertEqual(list(iter_cached(self.AREA, self.GRID, 50)),
+                         list(iter_brute(self.AREA, self.GRID, 50)))
+
+    def test_coarse(self):
+        passes = _tk.iter_passes(iter_brute, self.AREA, self.GRID, None)
+        stride, counts = next(passes)
+        width = len(self.GRID.width)
+        known = [p for p, i in enumerate(counts) if i is not _tk._UNKNOWN]
+
+        self.assertEqual(stride, 8)
+        self.assertEqual(known, [j * width + i
+                                 for j in range(0, 25, 8)
+                                 for i in range(0, 41, 8)])
+
+    def test_odd_size(self):
+        grid = Grid(9, 3)
+        expected = [i for _, i in iter_brute(self.AREA, grid, None)]
+        *_, (_, counts) = _tk.iter_passes(iter_brute, self.AREA, grid, None)
+
+        self.assertEqual(counts, expected)
+
+    def test_lattice(self):
+        grid = Grid(4, 2)
+        counts = [1, 2, 3, 4, 5,
+                  6, 7, 8, 9, 10,
+                  11, 12, 13, 14, 15]
+        values, lattice = _tk._lattice(counts, grid, 2)
+
+        self.assertEqual([i for _, i in values], [1, 3, 5,
+                                                  11, 13, 15])
+        self.assertEqual((lattice.width, lattice.height), (2, 1))
@@ -1,4 +1,6 @@
 
+from array import array
+from fractions import Fraction
 import unittest
 
 from mandelbrot._util import Steps
@@ -220,3 +222,40 @@ class StepsTests(unittest.TestCase):
         values = list(steps.iter_floats(2.5, -1.0))
 
         self.assertEqual(values, [2.5, 2.0, 1.5, 1.0, 0.5, 0.0, -0.5, -1.0])
+
+    def test_iter_floats_zero(self):
+        steps = Steps(0)
+        values = list(steps.iter_floats(2.5, 2.5))
+
+        self.assertEqual(values, [2.5])
+
+    def test_float_at(self):
+        for steps, start, end in [(Steps(3), 0.0, 1.0),
+                                  (Steps(7), 2.5, -1.0),
+                                  (Steps(10), -0.1, 0.9),
+                                  (Steps(0), 2.5, 2.5),
+                                  ]:
+            with self.subTest((steps, start, end)):
+                expected = list(steps.iter_floats(start, end))
+                values = [steps.float_at(start, end, i) for i in steps]
+
+                self.assertEqual(values, expected)
+
+    def test_floats(self):
+        tests = [
+                (Steps(3), 0.0, 1.0),
+                (Steps(7), 2.5, -1.0),
+                (Steps(0), 2.5, 2.5),
+                (Steps(10), -0.1, 0.9),
+                (Steps(3), Fraction(1, 3), Fraction(2, 3)),
+                ]
+        for steps, start, end in tests:
+            with self.subTest((steps, start, end)):
+                values = steps.floats(start, end)
+                expected = [float(v) for v in steps.iter_floats(start, end)]
+
+                self.assertIsInstance(values, array)
+                self.assertEqual(values.typecode, 'd')
+                self.assertEqual(values.tolist(), expected)
+                self.assertEqual(values[0], float(start))
+                self.assertEqual(values[-1], float(end))
@@ -0,0 +1,85 @@
+import unittest
+
+from mandelbrot import imaginary
+from mandelbrot._geometry import Area, Grid
+from mandelbrot._mandelbrot import iter_mandelbrot
+from mandelbrot._viewport import ViewportStore
+
+
+def _brute(area, grid, maxiter=None):
+    candidates = imaginary.iter_raster(area, grid)
+    return [i for _, i in iter_mandelbrot(candidates, maxiter)]
+
+
+class ViewportStoreTests(unittest.TestCase):
+
+    # The coordinates of these views are all exact floats.
+    GRID = Grid(40, 24)
+    AREA = Area((-2.0, -1.5), (0.5, 1.5))
+
+    def render(self, store, area, grid=GRID, maxiter=None):
+        return [i for _, i in store.iter_raster(area, grid, maxiter)]
+
+    def test_first(self):
+        store = ViewportStore()
+        counts = self.render(store, self.AREA)
+
+        self.assertEqual(counts, _brute(self.AREA, self.GRID))
+        self.assertEqual(store.computed, len(self.GRID))
+        self.assertEqual(store.reused, 0)
+        self.assertEqual(len(store), 1)
+
+    def test_pan(self):
+        store = ViewportStore()
+        self.render(store, self.AREA)
+        # Move 3 pixels right and 2 pixels down.
+        dx = 2.5 / 40 * 3
+        dy = 3.0 / 24 * 2
+        area = Area((-2.0 + dx, -1.5 - dy), (0.5 + dx, 1.5 - dy))
+        counts = self.render(store, area)
+
+        self.assertEqual(counts, _brute(area, self.GRID))
+        self.assertEqual(store.reused, 38 * 23)
+        self.assertEqual(store.computed, len(self.GRID) - 38 * 23)
+
+    def test_zoom_in(self):
+        store = ViewportStore()
+        self.render(store, self.AREA)
+        area = Area((-2.0, -1.5), (-0.75, 0.0))
+        counts = self.render(store, area)
+
+        self.assertEqual(counts, _brute(area, self.GRID))
+        self.assertEqual(store.reused, 21 * 13)
+
+    def test_zoom_out(self):
+        store = ViewportStore()
+        self.render(store, self.AREA)
+        area = Area((-2.0, -4.5), (3.0, 1.5))
+        counts = self.render(store, area)
+
+        self.assertEqual(counts, _brute(area, self.GRID))
+        self.assertEqual(store.reused, 21 * 13)
+
+    def test_no_overlap(self):
+        store = ViewportStore()
+        self.render(store, self.AREA)
+        area = Area((1.0, 2.0), (3.5, 5.0))
+        self.render(store, area)
+
+        self.assertEqual(store.reused, 0)
+
+    def test_different_maxiter(self):
+        store = ViewportStore()
+        self.render(store, self.AREA)
+        counts = self.render(store, self.AREA, maxiter=20)
+
+        self.assertEqual(counts, _brute(self.AREA, self.GRID, 20))
+        self.assertEqual(store.reused, 0)
+
+    def test_maxviews(self):
+        store = ViewportStore(2)
+        for _ in range(3):
+            self.render(store, self.AREA)
+
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.reused, len(self.GRID))
@@ -0,0 +1,42 @@
+import unittest
+
+from mandelbrot._geometry import Grid
+from mandelbrot.ui import _y4m
+
+
+class HeaderTests(unittest.TestCase):
+
+    def test_header(self):
+        header = _y4m.header(Grid(2, 1), 24)
+
+        self.assertEqual(header, b'YUV4MPEG2 W3 H2 F24:1 Ip A1:1 C444\n')
+
+
+class PaletteTests(unittest.TestCase):
+
+    def test_studio_range(self):
+        for color, expected in [
+                ((0, 0, 0), b'\x10\x80\x80'),
+                ((255, 255, 255), b'\xeb\x80\x80'),
+                ((255, 0, 0), b'\x51\x5a\xf0'),
+                ]:
+            with self.subTest(color):
+                ycbcr = _y4m._ycbcr(color)
+
+                self.assertEqual(ycbcr, expected)
+
+
+class EncodeFrameTests(unittest.TestCase):
+
+    def test_planes(self):
+        palette = [b'abc', b'def', b'...']
+        values = [(None, i) for i in (0, 1, None, 1)]
+        frame = _y4m.encode_frame(values, Grid(1, 1), palette)
+
+        self.assertEqual(frame, b'FRAME\n' + b'ad.d' + b'be.e' + b'cf.f')
+
+    def test_default_palette(self):
+        values = [(None, None)] * 4
+        frame = _y4m.encode_frame(values, Grid(1, 1))
+
+        self.assertEqual(frame, b'FRAME\n' + b'\x10' * 4 + b'\x80' * 8)
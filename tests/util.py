@@ -1,3 +1,8 @@
+import decimal
+
+from mandelbrot import imaginary
+from mandelbrot._mandelbrot import iter_mandelbrot
+
 
 class Stub:
 
@@ -6,3 +11,28 @@ class Stub:
 
     def _add_call(self, name, *args, **kwargs):
         self.calls.append((name, args, kwargs))
+
+
+def exact_count(x, y, maxiter):
+    """Return the escape count of the Fractions (x, y), or -1 if in set.
+
+    It iterates in 50-digit decimal, well past float precision.
+    """
+    with decimal.localcontext() as ctx:
+        ctx.prec = 50
+        cx = decimal.Decimal(x.numerator) / x.denominator
+        cy = decimal.Decimal(y.numerator) / y.denominator
+        zx = zy = decimal.Decimal(0)
+        for i in range(maxiter):
+            zx, zy = zx * zx - zy * zy + cx, 2 * zx * zy + cy
+            if zx * zx + zy * zy > 4:
+                return i
+    return -1
+
+
+def iter_brute(area, grid, maxiter, calls=None):
+    """A plain iter_raster() engine, which logs (area, grid) to "calls"."""
+    if calls is not None:
+        calls.append((area, grid))
+    candidates = imaginary.iter_raster(area, grid)
+    return iter_mandelbrot(candidates, maxiter)